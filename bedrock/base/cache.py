@@ -2,6 +2,9 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
+from collections import OrderedDict
+from threading import Lock
+
 from django.core.cache.backends.locmem import DEFAULT_TIMEOUT, LocMemCache
 
 
@@ -55,3 +58,63 @@ class SimpleDictCache(LocMemCache):
         with self._lock:
             self._cache[key] = new_value
         return new_value
+
+
+class LRUCache:
+    """A bounded, per-process least-recently-used cache.
+
+    Unlike the Django cache backends there is no expiry, no key mangling and
+    no pickling: values are stored as-is and the least recently used entry
+    is dropped once `maxsize` is reached. A `maxsize` of 0 disables storage.
+
+    Hit, miss and eviction counters are kept so that the size can be tuned
+    against real traffic; see `stats()`.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._cache = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._cache)
+
+    def __contains__(self, key):
+        return key in self._cache
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value = self._cache[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._cache[key] = value
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._cache),
+            "maxsize": self.maxsize,
+        }
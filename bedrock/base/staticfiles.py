@@ -0,0 +1,49 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import os
+from functools import lru_cache
+
+from django.conf import settings
+from django.contrib.staticfiles.finders import find, get_finders
+from django.contrib.staticfiles.utils import get_files
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+
+@lru_cache(maxsize=None)
+def get_static_files():
+    """Return the set of paths of all of the files the staticfiles finders can find.
+
+    The paths are relative to the static root, e.g. "img/l10n/fr/firefox/screenshot.png".
+    """
+    static_files = set()
+    for finder in get_finders():
+        for storage in finder.storages.values():
+            # missing directories are skipped, as they are by `find()`
+            if not os.path.isdir(storage.location):
+                continue
+
+            prefix = getattr(storage, "prefix", None) or ""
+            static_files.update(os.path.join(prefix, path) for path in get_files(storage))
+
+    return frozenset(static_files)
+
+
+def static_file_exists(path):
+    """Return True if a static file exists at the path.
+
+    During development the finders are used directly so that new files are
+    picked up without a restart.
+    """
+    if settings.DEBUG:
+        return find(path) is not None
+
+    return path in get_static_files()
+
+
+@receiver(setting_changed)
+def clear_static_files(setting, **kwargs):
+    if setting.startswith("STATICFILES_"):
+        get_static_files.cache_clear()
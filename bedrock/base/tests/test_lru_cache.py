@@ -0,0 +1,42 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+from bedrock.base.cache import LRUCache
+
+
+def test_get_set():
+    cache = LRUCache(2)
+    assert cache.get("dude") is None
+    assert cache.get("dude", "abides") == "abides"
+    cache.set("dude", "lebowski")
+    assert cache.get("dude") == "lebowski"
+    assert cache.stats() == {"hits": 1, "misses": 2, "evictions": 0, "size": 1, "maxsize": 2}
+
+
+def test_evicts_least_recently_used():
+    cache = LRUCache(2)
+    cache.set("dude", 1)
+    cache.set("walter", 2)
+    # touch "dude" so "walter" is the oldest
+    cache.get("dude")
+    cache.set("donny", 3)
+    assert "walter" not in cache
+    assert "dude" in cache
+    assert "donny" in cache
+    assert cache.evictions == 1
+    assert len(cache) == 2
+
+
+def test_zero_size_disables_cache():
+    cache = LRUCache(0)
+    cache.set("dude", 1)
+    assert cache.get("dude") is None
+    assert len(cache) == 0
+
+
+def test_clear():
+    cache = LRUCache(2)
+    cache.set("dude", 1)
+    cache.clear()
+    assert cache.get("dude") is None
@@ -0,0 +1,48 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import Mock, patch
+
+from django.test import TestCase, override_settings
+
+from bedrock.base import staticfiles
+
+
+class TestStaticFileExists(TestCase):
+    def setUp(self):
+        tempdir = TemporaryDirectory()
+        self.addCleanup(tempdir.cleanup)
+        self.static_path = Path(tempdir.name)
+        self.static_path.joinpath("img", "l10n", "fr").mkdir(parents=True)
+        self.static_path.joinpath("img", "l10n", "fr", "dude.png").touch()
+        settings_override = override_settings(STATICFILES_DIRS=[str(self.static_path)])
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def test_static_file_exists(self):
+        assert staticfiles.static_file_exists("img/l10n/fr/dude.png")
+        assert not staticfiles.static_file_exists("img/l10n/de/dude.png")
+        assert not staticfiles.static_file_exists("img/l10n/fr")
+
+    @patch.object(staticfiles, "find")
+    def test_index_used(self, find_mock):
+        assert staticfiles.static_file_exists("img/l10n/fr/dude.png")
+        # new files aren't seen until the index is rebuilt
+        self.static_path.joinpath("img", "l10n", "fr", "walter.png").touch()
+        assert not staticfiles.static_file_exists("img/l10n/fr/walter.png")
+        find_mock.assert_not_called()
+
+    # overriding DEBUG would reset the template engines
+    @patch.object(staticfiles, "settings", Mock(DEBUG=True))
+    def test_debug_uses_finders(self):
+        assert staticfiles.static_file_exists("img/l10n/fr/dude.png")
+        self.static_path.joinpath("img", "l10n", "fr", "walter.png").touch()
+        assert staticfiles.static_file_exists("img/l10n/fr/walter.png")
+
+    def test_missing_and_prefixed_dirs(self):
+        with override_settings(STATICFILES_DIRS=[str(self.static_path.joinpath("missing")), ("media", str(self.static_path))]):
+            assert staticfiles.static_file_exists("media/img/l10n/fr/dude.png")
+            assert not staticfiles.static_file_exists("img/l10n/fr/dude.png")
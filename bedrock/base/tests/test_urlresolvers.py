@@ -11,7 +11,14 @@ from django.urls import re_path
 
 import pytest
 
-from bedrock.base.urlresolvers import Prefixer, find_supported, reverse, split_path
+from bedrock.base.urlresolvers import (
+    Prefixer,
+    _get_language_map,
+    find_supported,
+    negotiation_cache,
+    reverse,
+    split_path,
+)
 
 
 @pytest.mark.parametrize(
@@ -133,6 +140,34 @@ class TestPrefixer(TestCase):
         prefixer = Prefixer(request)
         assert prefixer.get_best_language("de") is None
 
+    @override_settings(LANGUAGE_URL_MAP={"en-us": "en-US", "de": "de"})
+    def test_get_best_language_cached(self):
+        """
+        Should negotiate each Accept-Language value only once
+        """
+        prefixer = Prefixer(self.factory.get("/"))
+        with patch("bedrock.base.urlresolvers.find_supported", wraps=find_supported) as find_supported_mock:
+            assert prefixer.get_best_language("fr, de") == "de"
+            assert prefixer.get_best_language("fr, de") == "de"
+            assert prefixer.get_best_language("fr") is None
+            assert prefixer.get_best_language("fr") is None
+
+        assert find_supported_mock.call_count == 3
+        assert negotiation_cache.get(("fr", None), "missing") is None
+
+    def test_language_map_cleared_with_settings(self):
+        """
+        Should rebuild the language map and negotiation cache when the settings change
+        """
+        with override_settings(LANGUAGE_URL_MAP={"de": "de"}, CANONICAL_LOCALES={}):
+            assert _get_language_map() == {"de": "de"}
+            assert Prefixer(self.factory.get("/")).get_best_language("de") == "de"
+
+        with override_settings(LANGUAGE_URL_MAP={"fr": "fr"}, CANONICAL_LOCALES={}):
+            assert _get_language_map() == {"fr": "fr"}
+            assert ("de", None) not in negotiation_cache
+            assert Prefixer(self.factory.get("/")).get_best_language("de") is None
+
     @override_settings(LANGUAGE_URL_MAP={"en-ar": "en-AR", "en-gb": "en-GB", "en-us": "en-US"}, CANONICAL_LOCALES={"en": "en-US"})
     def test_prefixer_with_non_supported_locale(self):
         """
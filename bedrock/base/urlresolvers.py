@@ -2,17 +2,28 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
+from functools import lru_cache
 from threading import local
 
 from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
 from django.urls import reverse as django_reverse
 from django.utils.encoding import iri_to_uri
 from django.utils.functional import lazy
 from django.utils.translation.trans_real import parse_accept_lang_header
 
+from bedrock.base.cache import LRUCache
+
 # Thread-local storage for URL prefixes. Access with (get|set)_url_prefix.
 _local = local()
 
+# Accept-Language values are very repetitive so the negotiated locale is cached per process.
+# Keys are (Accept-Language header, available translations or None, ...) tuples.
+negotiation_cache = LRUCache(settings.LOCALE_NEGOTIATION_CACHE_SIZE)
+# marks a negotiation that has not been cached yet, since `None` is a valid result
+NOT_CACHED = object()
+
 
 def set_url_prefix(prefix):
     """Set the ``prefix`` for the current thread."""
@@ -46,10 +57,13 @@ def reverse(viewname, urlconf=None, args=None, kwargs=None):
 reverse_lazy = lazy(reverse, str)
 
 
+@lru_cache(maxsize=None)
 def _get_language_map():
     """
     Return a complete dict of language -> URL mappings, including the canonical
     short locale maps (e.g. es -> es-ES and en -> en-US).
+
+    The map is built once per process and must not be modified.
     :return: dict
     """
     LUM = settings.LANGUAGE_URL_MAP
@@ -66,13 +80,21 @@ def _get_language_map():
 FULL_LANGUAGE_MAP = lazy(_get_language_map, dict)()
 
 
+@receiver(setting_changed)
+def clear_language_caches(**kwargs):
+    """Tests override the locale settings, so don't keep results from other settings around."""
+    _get_language_map.cache_clear()
+    negotiation_cache.clear()
+
+
 def find_supported(lang):
+    language_map = _get_language_map()
     lang = lang.lower()
-    if lang in FULL_LANGUAGE_MAP:
-        return FULL_LANGUAGE_MAP[lang]
+    if lang in language_map:
+        return language_map[lang]
     pre = lang.split("-")[0]
-    if pre in FULL_LANGUAGE_MAP:
-        return FULL_LANGUAGE_MAP[pre]
+    if pre in language_map:
+        return language_map[pre]
 
 
 def split_path(path_):
@@ -114,11 +136,18 @@ class Prefixer:
 
     def get_best_language(self, accept_lang):
         """Given an Accept-Language header, return the best-matching language."""
-        ranked = parse_accept_lang_header(accept_lang)
-        for lang, _ in ranked:
-            supported = find_supported(lang)
-            if supported:
-                return supported
+        key = (accept_lang, None)
+        best = negotiation_cache.get(key, NOT_CACHED)
+        if best is NOT_CACHED:
+            best = None
+            for lang, _ in parse_accept_lang_header(accept_lang):
+                best = find_supported(lang)
+                if best:
+                    break
+
+            negotiation_cache.set(key, best)
+
+        return best
 
     def fix(self, path):
         url_parts = [self.request.META["SCRIPT_NAME"]]
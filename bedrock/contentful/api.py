@@ -4,6 +4,7 @@
 
 from copy import deepcopy
 from functools import partialmethod
+from threading import Lock
 from urllib.parse import parse_qs, urlencode, urlparse, urlunparse
 
 from django.conf import settings
@@ -46,6 +47,11 @@ CONTENTFUL_TO_BEDROCK_LOCALE_MAP = {v: k for k, v in BEDROCK_TO_CONTENTFUL_LOCAL
 
 DEFAULT_LOCALE = "en-US"
 
+# how deep Contentful resolves the links of a page
+PAGE_INCLUDE_DEPTH = 10
+# the most entries or assets to ask Contentful for in one request
+PREFETCH_BATCH_SIZE = 25
+
 ASPECT_RATIOS = {
     "1:1": "1-1",
     "3:2": "3-2",
@@ -106,11 +112,175 @@ def get_client(raw_mode=False):
             raw_mode=raw_mode,
             content_type_cache=False,
             timeout_s=settings.CONTENTFUL_API_TIMEOUT,
+            max_rate_limit_retries=settings.CONTENTFUL_API_MAX_RATE_LIMIT_RETRIES,
         )
 
     return client
 
 
+def _linked_resources(entry):
+    """Return the entries and assets linked from `entry`, including itself, and the IDs of
+    the entries and assets embedded in their rich text as a dict by link type."""
+
+    resources = []
+    embedded = {"Entry": set(), "Asset": set()}
+    seen = set()
+    values = [entry]
+    while values:
+        value = values.pop()
+        if isinstance(value, (contentful_api.Entry, contentful_api.Asset)):
+            key = (type(value), value.sys["id"])
+            if key not in seen:
+                seen.add(key)
+                resources.append(value)
+                if isinstance(value, contentful_api.Entry):
+                    values.extend(value.fields().values())
+        elif isinstance(value, dict):
+            link = value.get("sys")
+            if isinstance(link, dict) and link.get("type") == "Link" and link.get("linkType") in embedded:
+                embedded[link["linkType"]].add(link["id"])
+            else:
+                values.extend(value.values())
+        elif isinstance(value, list):
+            values.extend(value)
+
+    return resources, embedded
+
+
+class ContentfulCache:
+    """
+    The entries and assets fetched from Contentful during a sync, by ID and locale.
+
+    One cache is shared by all the pages and locales of a sync, so the entries
+    that many pages use are only fetched once. The entries and assets linked
+    from a fetched entry are cached along with it.
+    """
+
+    def __init__(self, client):
+        self.client = client
+        self.entries = {}
+        self.assets = {}
+        self.api_calls = 0
+        self.hits = 0
+        self._lock = Lock()
+
+    def _count(self, api_calls=0, hits=0):
+        with self._lock:
+            self.api_calls += api_calls
+            self.hits += hits
+
+    def _add(self, entry, locale):
+        """Cache an entry and the entries and assets linked from it.
+
+        Returns the IDs of the entries and assets embedded in their rich text, which
+        Contentful doesn't include in the response, as a dict by link type."""
+
+        resources, embedded = _linked_resources(entry)
+        with self._lock:
+            self.entries[(entry.sys["id"], locale)] = entry
+            for resource in resources:
+                cached = self.entries if isinstance(resource, contentful_api.Entry) else self.assets
+                cached.setdefault((resource.sys["id"], locale), resource)
+
+        return embedded
+
+    def _batches(self, ids, resources, locale):
+        """Split the IDs that aren't cached for `locale` in `resources` into batches to fetch."""
+        with self._lock:
+            cached = {_id for _id, _locale in resources if _locale == locale}
+        ids = sorted(set(ids).difference(cached))
+        for i in range(0, len(ids), PREFETCH_BATCH_SIZE):
+            yield ids[i : i + PREFETCH_BATCH_SIZE]
+
+    def entry(self, entry_id, locale=DEFAULT_LOCALE):
+        entry = self.entries.get((entry_id, locale))
+        if entry is None:
+            self._count(api_calls=1)
+            entry = self.client.entry(entry_id, {"include": PAGE_INCLUDE_DEPTH, "locale": locale})
+            self._add(entry, locale)
+        else:
+            self._count(hits=1)
+
+        return entry
+
+    def asset(self, asset_id, locale=DEFAULT_LOCALE):
+        asset = self.assets.get((asset_id, locale))
+        if asset is None:
+            self._count(api_calls=1)
+            asset = self.client.asset(asset_id, {"locale": locale})
+            with self._lock:
+                self.assets[(asset_id, locale)] = asset
+        else:
+            self._count(hits=1)
+
+        return asset
+
+    def revisions(self, entry):
+        """Return the revision of `entry` and of each entry and asset that it is made from, by ID,
+        including the ones embedded in rich text, which are fetched like the renderers do."""
+
+        revisions = {}
+        queued = set()
+        entries = [entry]
+        while entries:
+            resources, embedded = _linked_resources(entries.pop())
+            for resource in resources:
+                revisions[resource.sys["id"]] = resource.sys.get("revision")
+            for entry_id in embedded["Entry"].difference(revisions, queued):
+                queued.add(entry_id)
+                entries.append(self.entry(entry_id))
+            for asset_id in embedded["Asset"].difference(revisions):
+                revisions[asset_id] = self.asset(asset_id).sys.get("revision")
+
+        return revisions
+
+    def prefetch_entries(self, entry_ids, locale):
+        """Fetch entries in batches, along with the entries and assets embedded in their rich text.
+
+        The embedded ones are fetched in the default locale, like the rich text renderers do."""
+
+        embedded = {"Entry": set(), "Asset": set()}
+        for batch in self._batches(entry_ids, self.entries, locale):
+            self._count(api_calls=1)
+            query = {"sys.id[in]": ",".join(batch), "include": PAGE_INCLUDE_DEPTH, "locale": locale, "limit": len(batch)}
+            for entry in self.client.entries(query):
+                for link_type, ids in self._add(entry, locale).items():
+                    embedded[link_type].update(ids)
+
+        for batch in self._batches(embedded["Entry"], self.entries, DEFAULT_LOCALE):
+            self._count(api_calls=1)
+            query = {"sys.id[in]": ",".join(batch), "include": PAGE_INCLUDE_DEPTH, "locale": DEFAULT_LOCALE, "limit": len(batch)}
+            for entry in self.client.entries(query):
+                self._add(entry, DEFAULT_LOCALE)
+
+        for batch in self._batches(embedded["Asset"], self.assets, DEFAULT_LOCALE):
+            self._count(api_calls=1)
+            for asset in self.client.assets({"sys.id[in]": ",".join(batch), "locale": DEFAULT_LOCALE, "limit": len(batch)}):
+                with self._lock:
+                    self.assets[(asset.sys["id"], DEFAULT_LOCALE)] = asset
+
+
+def _get_cache():
+    """Return the Contentful cache of the sync that the current request is a part of, if any."""
+    return getattr(get_current_request(), "contentful_cache", None)
+
+
+def _get_entry(entry_id):
+    cache = _get_cache()
+    if cache is None:
+        return ContentfulPage.client.entry(entry_id)
+
+    return cache.entry(entry_id)
+
+
+def _get_asset(asset_id):
+    cache = _get_cache()
+    if cache is None:
+        return ContentfulPage.client.asset(asset_id)
+
+    return cache.asset(asset_id)
+
+
 def contentful_locale(locale):
     """Returns the Contentful locale for the Bedrock locale"""
     return BEDROCK_TO_CONTENTFUL_LOCALE_MAP.get(locale, locale)
@@ -337,7 +507,7 @@ class PRenderer(BaseBlockRenderer):
 class InlineEntryRenderer(BaseNodeRenderer):
     def render(self, node):
         entry_id = node["data"]["target"]["sys"]["id"]
-        entry = ContentfulPage.client.entry(entry_id)
+        entry = _get_entry(entry_id)
         content_type = entry.sys["content_type"].id
 
         if content_type == "componentLogo":
@@ -355,7 +525,7 @@ class AssetBlockRenderer(BaseBlockRenderer):
 
     def render(self, node):
         asset_id = node["data"]["target"]["sys"]["id"]
-        asset = ContentfulPage.client.asset(asset_id)
+        asset = _get_asset(asset_id)
         return self.IMAGE_HTML.format(
             src=_get_image_url(asset, 688),
             src_highres=_get_image_url(asset, 1376),
@@ -449,18 +619,25 @@ class ContentfulPage:
         },
     }
 
-    def __init__(self, request, page_id):
+    def __init__(self, request, page_id, default_locale_seo_images=None):
         set_current_request(request)
         self.request = request
         self.page_id = page_id
         self.locale = get_locale(request)
+        # SEO images of the pages in the default locale by Contentful ID. If given,
+        # they're used instead of looking the pages up in the database.
+        self.default_locale_seo_images = default_locale_seo_images
 
     @cached_property
     def page(self):
+        cache = getattr(self.request, "contentful_cache", None)
+        if cache is not None:
+            return cache.entry(self.page_id, self.locale)
+
         return self.client.entry(
             self.page_id,
             {
-                "include": 10,
+                "include": PAGE_INCLUDE_DEPTH,
                 "locale": self.locale,
                 # ie, get ONLY the page for the specificed locale, as long as
                 # the locale doesn't have a fallback configured in Contentful
@@ -482,6 +659,9 @@ class ContentfulPage:
         contentful_id,
         default_locale=DEFAULT_LOCALE,
     ):
+        if self.default_locale_seo_images is not None:
+            return self.default_locale_seo_images.get(contentful_id, "")
+
         try:
             entry = ContentfulEntry.objects.get(
                 contentful_id=contentful_id,
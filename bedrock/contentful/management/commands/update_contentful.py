@@ -3,21 +3,34 @@
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
 import json
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from hashlib import sha256
-from typing import Dict, Tuple, Union
+from time import perf_counter
+from typing import Dict, List, Tuple, Union
 
 from django.conf import settings
 from django.core.management.base import BaseCommand
+from django.db import connections, transaction
 from django.db.models import Q
 from django.test import RequestFactory
 from django.utils.timezone import now as tz_now
 
 import boto3
 import jq
+from contentful.errors import HTTPError
+from crum import set_current_request
 from sentry_sdk import capture_exception
 from sentry_sdk.api import capture_message
 
-from bedrock.contentful.api import CONTENTFUL_TO_BEDROCK_LOCALE_MAP, ContentfulPage
+from bedrock.contentful.api import (
+    CONTENTFUL_TO_BEDROCK_LOCALE_MAP,
+    DEFAULT_LOCALE,
+    PREFETCH_BATCH_SIZE,
+    ContentfulCache,
+    ContentfulPage,
+    contentful_locale,
+)
 from bedrock.contentful.constants import (
     ACTION_ARCHIVE,
     ACTION_AUTO_SAVE,
@@ -30,9 +43,13 @@ from bedrock.contentful.constants import (
     LOCALISATION_COMPLETENESS_CHECK_CONFIG,
     MAX_MESSAGES_PER_QUEUE_POLL,
 )
-from bedrock.contentful.models import ContentfulEntry
+from bedrock.contentful.models import ContentfulEntry, ContentfulSyncState
 from bedrock.utils.management.decorators import alert_sentry_on_exception
 
+# the key in the stored revisions of a page for the version of the code that rendered it,
+# which can't clash with the ID of a Contentful entry or asset
+RENDER_REVISION_KEY = ":render"
+
 
 def data_hash(data: Dict) -> str:
     str_data = json.dumps(data, sort_keys=True)
@@ -42,6 +59,11 @@ def data_hash(data: Dict) -> str:
 @alert_sentry_on_exception
 class Command(BaseCommand):
     rf = RequestFactory()
+    workers = 1
+    force = False
+    full_sync = False
+    # the IDs of the entries and assets changed according to the queue, or None to sync everything
+    changed_ids = None
 
     def add_arguments(self, parser) -> None:
         parser.add_argument(
@@ -60,6 +82,21 @@ class Command(BaseCommand):
             default=False,
             help="Load the data even if nothing new from Contentful.",
         ),
+        parser.add_argument(
+            "--full-sync",
+            action="store_true",
+            dest="full_sync",
+            default=False,
+            help="Sync all the pages from Contentful, not only the ones made from changed entries.",
+        ),
+        parser.add_argument(
+            "-w",
+            "--workers",
+            type=int,
+            dest="workers",
+            default=settings.CONTENTFUL_SYNC_WORKERS,
+            help="Number of requests to make to Contentful at the same time.",
+        ),
 
     def log(self, msg) -> None:
         if not self.quiet:
@@ -68,6 +105,8 @@ class Command(BaseCommand):
     def handle(self, *args, **options):
         self.quiet = options["quiet"]
         self.force = options["force"]
+        self.workers = options.get("workers", settings.CONTENTFUL_SYNC_WORKERS)
+        self.full_sync = options.get("full_sync", False)
         if settings.CONTENTFUL_SPACE_ID and settings.CONTENTFUL_SPACE_KEY:
             if self.force:
                 self.log("Running forced update from Contentful data")
@@ -92,17 +131,28 @@ class Command(BaseCommand):
         deleted_count = -1
         errors_count = -1
 
-        poll_contentful = self.force or self._queue_has_viable_messages()
+        poll_contentful = self.force or self.full_sync or self._queue_has_viable_messages()
 
         if poll_contentful:
-            added_count, updated_count, deleted_count, errors_count = self._refresh_from_contentful()
+            if self.force or self.full_sync:
+                if settings.CONTENTFUL_SYNC_API_DELTAS:
+                    # the next delta sync only needs the changes made from now on
+                    added_count, updated_count, deleted_count, errors_count = self._refresh_all_and_save_sync_token()
+                else:
+                    added_count, updated_count, deleted_count, errors_count = self._refresh_from_contentful()
+            elif settings.CONTENTFUL_SYNC_API_DELTAS:
+                added_count, updated_count, deleted_count, errors_count = self._refresh_from_sync_api()
+            elif self.changed_ids is None:
+                added_count, updated_count, deleted_count, errors_count = self._refresh_from_contentful()
+            else:
+                added_count, updated_count, deleted_count, errors_count = self._refresh_changed_pages(self.changed_ids)
             update_ran = True
 
         return update_ran, added_count, updated_count, deleted_count, errors_count
 
     def _get_message_action(self, msg: str) -> Union[str, None]:
         # Format for these messages is:
-        # ContentManagement.Entry.publish,<currently_irrelevant_string>,<currently_irrelevant_string>
+        # ContentManagement.Entry.publish,<entry_or_asset_id>,<currently_irrelevant_string>
         try:
             label, _, _ = msg.split(",")
             _, _, action = label.split(".")
@@ -112,6 +162,14 @@ class Command(BaseCommand):
             capture_exception(e)
             return None
 
+    def _get_message_resource_id(self, msg: str) -> Union[str, None]:
+        # The second part of the message is the ID of the changed entry or asset
+        try:
+            _, resource_id, _ = msg.split(",")
+        except (AttributeError, ValueError):
+            return None
+        return resource_id.strip() or None
+
     def _purge_queue(self, queue) -> None:
         """Remove all entries in the queue, without inspecting them
 
@@ -142,13 +200,16 @@ class Command(BaseCommand):
     def _queue_has_viable_messages(self) -> bool:
         """
         When pages/entries change, Contentful uses a webhook to push a
-        message into a queue. Here, we get all enqueued messages and if ANY ONE
-        of them has an action of a 'go' type, we count that as enough and
-        we re-sync all of our Contentful content.
+        message into a queue. Here, we get all enqueued messages and collect
+        the IDs of the entries and assets changed by the ones with an action of
+        a 'go' type. Only the pages made from those need to be synced again
+        (see _refresh_changed_pages). Every message is deleted once read.
 
-        If we get a 'go' signal, we explicitly drain the queue rather than waste
-        network I/O on pointless checking. If we don't get a 'go' signal at all,
-        we still effectively have purged the queue, just iteratively.
+        Archiving, unpublishing or deleting content can remove pages, and a
+        'go' message without an ID can't be targeted, so for those we re-sync
+        all of our Contentful content. Then we explicitly drain the queue rather
+        than waste network I/O on pointless checking, and `self.changed_ids`
+        is None.
 
         What action types count as a 'go' signal?
 
@@ -165,6 +226,7 @@ class Command(BaseCommand):
         poll_queue = True
         may_purge_queue = False
         viable_message_found = False
+        self.changed_ids = None
 
         GO_ACTIONS = {
             ACTION_ARCHIVE,
@@ -179,6 +241,12 @@ class Command(BaseCommand):
             ACTION_AUTO_SAVE,
             ACTION_SAVE,
         }
+        # actions that can remove pages, which needs all of the content to be synced
+        FULL_SYNC_ACTIONS = {
+            ACTION_ARCHIVE,
+            ACTION_UNPUBLISH,
+            ACTION_DELETE,
+        }
 
         if settings.APP_NAME != "bedrock-prod":
             # See settings.base.get_app_name()
@@ -200,6 +268,7 @@ class Command(BaseCommand):
             aws_secret_access_key=settings.CONTENTFUL_NOTIFICATION_QUEUE_SECRET_ACCESS_KEY,
         )
         queue = sqs.Queue(settings.CONTENTFUL_NOTIFICATION_QUEUE_URL)
+        changed_ids = set()
 
         while poll_queue:
             msg_batch = queue.receive_messages(
@@ -215,19 +284,26 @@ class Command(BaseCommand):
                 msg_body = sqs_msg.body
                 action = self._get_message_action(msg_body)
                 if action in GO_ACTIONS:
-                    # we've found a viable one, so that's great. Drain down the queue and move on
                     viable_message_found = True
                     self.log(f"Got a viable message: {msg_body}")
-                    may_purge_queue = True
-                    poll_queue = False  # no need to get more messages
-                    break
-                else:
-                    # Explicitly delete the message and move on to the next one.
-                    # Note that we don't purge the entire queue even if all of the
-                    # current messages are inviable, because we don't want the risk
-                    # of a viable message being lost during the purge process.
-                    sqs_msg.delete()
-                    continue
+                    resource_id = self._get_message_resource_id(msg_body)
+                    if action in FULL_SYNC_ACTIONS or resource_id is None:
+                        # we'll sync everything, so that's great. Drain down the queue and move on
+                        changed_ids = None
+                        may_purge_queue = True
+                        poll_queue = False  # no need to get more messages
+                        break
+
+                    changed_ids.add(resource_id)
+
+                # Explicitly delete the message and move on to the next one.
+                # Note that we don't purge the entire queue even if all of the
+                # current messages are inviable, because we don't want the risk
+                # of a viable message being lost during the purge process.
+                sqs_msg.delete()
+
+        if viable_message_found:
+            self.changed_ids = changed_ids
 
         if not viable_message_found:
             self.log("No viable message found in queue")
@@ -237,27 +313,14 @@ class Command(BaseCommand):
 
         return viable_message_found
 
-    def _detect_and_delete_absent_entries(self, contentful_data_attempted_for_sync) -> int:
-        q_obj = Q()
-        for ctype, _contentful_id, _locale in contentful_data_attempted_for_sync:
-            if ctype == CONTENT_TYPE_CONNECT_HOMEPAGE:
-                base_q = Q(contentful_id=_contentful_id)
-            else:
-                base_q = Q(
-                    contentful_id=_contentful_id,
-                    # DANGER: the _locale up till now is a Contentful locale
-                    # not how we express it in Bedrock, so we need to remap it
-                    locale=self._remap_locale_for_bedrock(_locale),
-                )
-            q_obj |= base_q
+    def _delete_entries(self, entries_to_delete) -> int:
+        """Deletes the ContentfulEntry records in the queryset, and returns how many there were"""
+        self.log(f"Entries to be deleted: {entries_to_delete}")
 
-        _entries_to_delete = ContentfulEntry.objects.exclude(q_obj)
-        self.log(f"Entries to be deleted: {_entries_to_delete}")
+        _num_entries_to_delete = entries_to_delete.count()
 
-        _num_entries_to_delete = _entries_to_delete.count()
-
-        res = _entries_to_delete.delete()
-        self.log(f"Deleted by _detect_and_delete_absent_entries: {res}")
+        res = entries_to_delete.delete()
+        self.log(f"Deleted entries: {res}")
 
         # if things aren't right, we don't want to block the rest of the sync
         if res[0] != _num_entries_to_delete:
@@ -267,6 +330,24 @@ class Command(BaseCommand):
             )
         return res[1]["contentful.ContentfulEntry"] if res[0] > 0 else 0
 
+    def _detect_and_delete_absent_entries(self, contentful_data_attempted_for_sync) -> int:
+        synced_ids = set()
+        synced_pages = set()
+        for ctype, _contentful_id, _locale in contentful_data_attempted_for_sync:
+            if ctype == CONTENT_TYPE_CONNECT_HOMEPAGE:
+                synced_ids.add(_contentful_id)
+            else:
+                # DANGER: the _locale up till now is a Contentful locale
+                # not how we express it in Bedrock, so we need to remap it
+                synced_pages.add((_contentful_id, self._remap_locale_for_bedrock(_locale)))
+
+        absent_pks = [
+            pk
+            for pk, contentful_id, locale in ContentfulEntry.objects.values_list("pk", "contentful_id", "locale")
+            if contentful_id not in synced_ids and (contentful_id, locale) not in synced_pages
+        ]
+        return self._delete_entries(ContentfulEntry.objects.filter(pk__in=absent_pks))
+
     def _remap_locale_for_bedrock(self, locale: str) -> str:
         return CONTENTFUL_TO_BEDROCK_LOCALE_MAP.get(locale, locale)
 
@@ -288,6 +369,38 @@ class Command(BaseCommand):
 
         return True
 
+    def _map(self, func, items) -> list:
+        """Return the results of `func` for each of `items`, calling it from a pool of
+        threads if there are several workers. The results are in the order of `items`.
+
+        The size of the pool is the limit of concurrent requests to Contentful, which are
+        all made to the same API host. When its rate limit is hit, the Contentful client
+        waits as long as the API asks before retrying the request."""
+
+        if self.workers > 1 and len(items) > 1:
+
+            def _func(item):
+                try:
+                    return func(item)
+                finally:
+                    # don't leave any database connections opened by the thread behind
+                    connections.close_all()
+
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                return list(executor.map(_func, items))
+
+        return [func(item) for item in items]
+
+    def _get_entries(self, query: Tuple[str, str]) -> list:
+        locale_code, ctype = query
+        return ContentfulPage.client.entries(
+            {
+                "content_type": ctype,
+                "include": 0,
+                "locale": locale_code,
+            }
+        ).items
+
     def _get_content_to_sync(
         self,
         available_locales,
@@ -295,26 +408,131 @@ class Command(BaseCommand):
         """Fetches which content types and ids to query, individually, from the Contentful API"""
         content_to_sync = []
 
-        for locale in available_locales:
-            _locale_code = locale.code
-
-            # TODO: Change to syncing only `page` content types when we're in an all-Compose setup
-            # TODO: treat the connectHomepage differently because its locale is an overloaded name field
-            for ctype in settings.CONTENTFUL_CONTENT_TYPES_TO_SYNC:
-                for entry in ContentfulPage.client.entries(
-                    {
-                        "content_type": ctype,
-                        "include": 0,
-                        "locale": _locale_code,
-                    }
-                ).items:
-                    if not self._page_is_syncable(ctype, entry.sys["id"], _locale_code):
-                        self.log(f"Page {ctype}:{entry.sys['id']} deemed not syncable for {_locale_code}")
-                    else:
-                        content_to_sync.append((ctype, entry.sys["id"], _locale_code))
+        # TODO: Change to syncing only `page` content types when we're in an all-Compose setup
+        # TODO: treat the connectHomepage differently because its locale is an overloaded name field
+        queries = [(locale.code, ctype) for locale in available_locales for ctype in settings.CONTENTFUL_CONTENT_TYPES_TO_SYNC]
+
+        for (_locale_code, ctype), entries in zip(queries, self._map(self._get_entries, queries)):
+            for entry in entries:
+                if not self._page_is_syncable(ctype, entry.sys["id"], _locale_code):
+                    self.log(f"Page {ctype}:{entry.sys['id']} deemed not syncable for {_locale_code}")
+                else:
+                    content_to_sync.append((ctype, entry.sys["id"], _locale_code))
 
         return content_to_sync
 
+    def _fetch_page(
+        self,
+        item: Tuple[str, str, str],
+        default_locale_seo_images: Dict,
+        stored_revisions: Dict,
+    ) -> Tuple[Union[Dict, None], Dict, float, Union[Exception, None]]:
+        """Returns the content of a page, the revisions of the entries and assets it's made from,
+        and how long that took, or the exception raised while getting it.
+
+        Rendering the page is skipped, and the content is None, if none of the revisions moved
+        since they were stored, including the revision of the code that renders it."""
+        ctype, page_id, locale_code = item
+        request = self.rf.get("/")
+        request.locale = locale_code
+        request.contentful_cache = self.cache
+        start = perf_counter()
+        try:
+            page = ContentfulPage(request, page_id, default_locale_seo_images)
+            revisions = self.cache.revisions(page.page)
+            if revisions:
+                revisions = {**revisions, RENDER_REVISION_KEY: settings.GIT_SHA}
+            if revisions and revisions == stored_revisions.get((page_id, self._remap_locale_for_bedrock(locale_code))):
+                return None, revisions, perf_counter() - start, None
+
+            page_data = page.get_content()
+            return page_data, revisions, perf_counter() - start, None
+        except Exception as ex:
+            return None, {}, perf_counter() - start, ex
+        finally:
+            set_current_request(None)
+
+    def _prefetch_pages(self, items: Tuple[str, List[str]]) -> None:
+        """Fetches the pages of a locale, and the entries and assets they embed, in batches"""
+        locale_code, page_ids = items
+        try:
+            self.cache.prefetch_entries(page_ids, locale_code)
+        except Exception as ex:
+            # the pages will be fetched one by one instead
+            self.log(f"Problem prefetching pages for {locale_code} -> {type(ex)}: {ex}")
+            capture_exception(ex)
+
+    def _fetch_pages(self, content_to_sync) -> Dict:
+        """Fetches the content of the pages from the Contentful API, by content type, id and locale.
+
+        Unless forced, pages whose entries and assets have the same revisions as when they were
+        stored are not rendered again. The commit of the code that rendered them, `GIT_SHA`, is
+        part of the revisions, so every page is rendered again after a deploy.
+
+        Pages in other locales can use the SEO image of the page in the default locale, so
+        those are fetched first, and the images are passed on to the other pages instead of
+        being read from the database in the fetching threads."""
+
+        default_locale_seo_images = {
+            contentful_id: data.get("info", {}).get("seo", {}).get("image", "")
+            for contentful_id, data in ContentfulEntry.objects.filter(locale=DEFAULT_LOCALE).values_list("contentful_id", "data")
+        }
+
+        default_locale_items = [item for item in content_to_sync if item[2] == DEFAULT_LOCALE]
+        other_items = [item for item in content_to_sync if item[2] != DEFAULT_LOCALE]
+
+        # all the pages share the entries and assets fetched during the sync
+        self.cache = ContentfulCache(ContentfulPage.client)
+        page_ids_by_locale = {}
+        for _ctype, page_id, locale_code in content_to_sync:
+            page_ids_by_locale.setdefault(locale_code, []).append(page_id)
+
+        # pages are only rendered again if the revisions of their entries and assets moved
+        stored_revisions = {}
+        if not self.force:
+            stored_revisions = {
+                (contentful_id, locale): revisions
+                for contentful_id, locale, revisions in ContentfulEntry.objects.values_list("contentful_id", "locale", "revisions")
+            }
+
+        fetch_page = partial(
+            self._fetch_page,
+            default_locale_seo_images=default_locale_seo_images,
+            stored_revisions=stored_revisions,
+        )
+        self._prefetch_pages((DEFAULT_LOCALE, page_ids_by_locale.pop(DEFAULT_LOCALE, [])))
+        results = dict(zip(default_locale_items, self._map(fetch_page, default_locale_items)))
+        rendered_page_ids = set()
+        for (_ctype, page_id, _locale_code), (page_data, _revisions, _sync_time, _ex) in results.items():
+            if page_data:
+                default_locale_seo_images[page_id] = page_data["info"].get("seo", {}).get("image", "")
+                rendered_page_ids.add(page_id)
+
+        # the other locales of the pages rendered again may have used their SEO image
+        fetch_page = partial(
+            self._fetch_page,
+            default_locale_seo_images=default_locale_seo_images,
+            stored_revisions={key: revisions for key, revisions in stored_revisions.items() if key[0] not in rendered_page_ids},
+        )
+        self._map(self._prefetch_pages, list(page_ids_by_locale.items()))
+        results.update(zip(other_items, self._map(fetch_page, other_items)))
+        self._log_sync_times(results)
+        return results
+
+    def _log_sync_times(self, fetched_pages: Dict) -> None:
+        """Logs how long the pages of each content type took to fetch and render, slowest first"""
+        sync_times = {}
+        for (ctype, _page_id, _locale_code), (page_data, _revisions, sync_time, ex) in fetched_pages.items():
+            total_time, rendered_count, unchanged_count = sync_times.get(ctype, (0, 0, 0))
+            if page_data is None and ex is None:
+                unchanged_count += 1
+            else:
+                rendered_count += 1
+            sync_times[ctype] = (total_time + sync_time, rendered_count, unchanged_count)
+
+        for ctype, (total_time, rendered_count, unchanged_count) in sorted(sync_times.items(), key=lambda item: item[1][0], reverse=True):
+            self.log(f"Sync time for {ctype}: {total_time:.2f}s. Rendered: {rendered_count}. Unchanged: {unchanged_count}.")
+
     def _get_value_from_data(self, data: dict, spec: dict) -> str:
         """Extract a single value from `data` based on the provided `spec`,
         which is written as a jq filter directive.
@@ -384,46 +602,34 @@ class Command(BaseCommand):
             )
         )
 
-    def _refresh_from_contentful(self) -> Tuple[int, int, int, int]:
-        self.log("Pulling from Contentful")
+    def _store_pages(self, content_to_sync, fetched_pages) -> Tuple[int, int, int, set]:
+        """Stores the fetched pages in the database. Returns the numbers of pages added, updated
+        and that failed to sync, and the pages that have no content in their locale"""
         updated_count = 0
         added_count = 0
-        deleted_count = 0
         error_count = 0
         content_missing_localised_version = set()
 
         EMPTY_ENTRY_ATTRIBUTE_STRING = "'Entry' object has no attribute 'content'"
 
-        available_locales = ContentfulPage.client.locales()
-
-        # 1. Build a lookup of pages to sync by type, ID and locale
-        content_to_sync = self._get_content_to_sync(available_locales)
-
-        # 2. Pull down each page and store
-        # TODO: we may (TBC) be able to do a wholesale refactor and get all the locale variations
-        # of a single Page (where entry['myfield'] in a single-locale setup changes to
-        # entry['myfield']['en-US'], entry['myfield']['de'], etc. That might be particularly useful
-        # when we have a lot of locales in play. For now, the heavier-IO approach should be OK.
-
         for ctype, page_id, locale_code in content_to_sync:
-            request = self.rf.get("/")
-            request.locale = locale_code
-            try:
-                page = ContentfulPage(request, page_id)
-                page_data = page.get_content()
-            except AttributeError as ae:
+            page_data, revisions, sync_time, ex = fetched_pages[(ctype, page_id, locale_code)]
+            if page_data is None and ex is None:
+                # none of the entries and assets of the page changed, so it wasn't rendered again
+                continue
+            elif isinstance(ex, AttributeError):
                 # Problem with the page - most likely not-really-a-page-in-this-locale-after-all.
                 # (Contentful seems to send back a Compose `page` in en-US for _any_ other locale,
                 # even if the page has no child entries. This false positive / absent entry is
                 # only apparent when we try to call page.get_content() and find there is none.)
-                if str(ae) == EMPTY_ENTRY_ATTRIBUTE_STRING:
+                if str(ex) == EMPTY_ENTRY_ATTRIBUTE_STRING:
                     self.log(f"No content for {page_id} for {locale_code} - page will be deleted from DB if it exists")
                     # We want to track this explicitly, because we need to do cleanup later on.
                     content_missing_localised_version.add((ctype, page_id, locale_code))
                     continue
                 else:
-                    raise
-            except Exception as ex:
+                    raise ex
+            elif ex:
                 # Problem with the page, load other pages
                 self.log(f"Problem with {ctype}:{page_id} -> {type(ex)}: {ex}")
                 capture_exception(ex)
@@ -458,6 +664,9 @@ class Command(BaseCommand):
                 classification=_info.get("classification", ""),
                 tags=_info.get("tags", []),
                 category=_info.get("category", ""),
+                dependencies=sorted(_id for _id in revisions if _id != RENDER_REVISION_KEY),
+                revisions=revisions,
+                sync_time=sync_time,
             )
 
             try:
@@ -481,24 +690,240 @@ class Command(BaseCommand):
                     obj.last_modified = tz_now()
                     obj.save()
                     updated_count += 1
+                elif obj.revisions != revisions:
+                    # the content is the same, so the page isn't considered modified
+                    obj.dependencies = extra_params["dependencies"]
+                    obj.revisions = revisions
+                    obj.save(update_fields=["dependencies", "revisions"])
 
-        try:
-            # Even if we failed to sync certain entities that are usually syncable, we
-            # should act as if they were synced when we come to look for records to delete.
-            # (If it was just a temporary glitch that caused the exception we would not
-            # want to unncessarily delete a page, even if the failed sync means its content
-            # is potentially stale)
-            # HOWEVER, there are some entities which are just not syncable at all - such as
-            # a Compose `page` which has no entry for a specific locale, and so is skipped
-            # above. For these, we DO want to delete them, so remove them from the list of
-            # synced items
-
-            entries_processed_in_sync = set(content_to_sync).difference(content_missing_localised_version)
-            deleted_count = self._detect_and_delete_absent_entries(entries_processed_in_sync)
-        except Exception as ex:
-            self.log(ex)
-            capture_exception(ex)
+        return added_count, updated_count, error_count, content_missing_localised_version
 
-        self._check_localisation_complete()
+    def _refresh_from_contentful(self) -> Tuple[int, int, int, int]:
+        self.log("Pulling from Contentful")
+        deleted_count = 0
+
+        available_locales = ContentfulPage.client.locales()
+
+        # 1. Build a lookup of pages to sync by type, ID and locale
+        content_to_sync = self._get_content_to_sync(available_locales)
+
+        # 2. Pull down each page
+        # TODO: we may (TBC) be able to do a wholesale refactor and get all the locale variations
+        # of a single Page (where entry['myfield'] in a single-locale setup changes to
+        # entry['myfield']['en-US'], entry['myfield']['de'], etc. That might be particularly useful
+        # when we have a lot of locales in play. For now, the heavier-IO approach should be OK.
+        fetched_pages = self._fetch_pages(content_to_sync)
+        self.log(f"Contentful API calls for entries and assets: {self.cache.api_calls}. Cache hits: {self.cache.hits}.")
+
+        # 3. Store the pages, all at once
+        with transaction.atomic():
+            added_count, updated_count, error_count, content_missing_localised_version = self._store_pages(content_to_sync, fetched_pages)
+
+            try:
+                # Even if we failed to sync certain entities that are usually syncable, we
+                # should act as if they were synced when we come to look for records to delete.
+                # (If it was just a temporary glitch that caused the exception we would not
+                # want to unncessarily delete a page, even if the failed sync means its content
+                # is potentially stale)
+                # HOWEVER, there are some entities which are just not syncable at all - such as
+                # a Compose `page` which has no entry for a specific locale, and so is skipped
+                # above. For these, we DO want to delete them, so remove them from the list of
+                # synced items
+
+                entries_processed_in_sync = set(content_to_sync).difference(content_missing_localised_version)
+                with transaction.atomic():
+                    deleted_count = self._detect_and_delete_absent_entries(entries_processed_in_sync)
+            except Exception as ex:
+                self.log(ex)
+                capture_exception(ex)
+
+            self._check_localisation_complete()
 
         return added_count, updated_count, deleted_count, error_count
+
+    def _has_new_pages(self, entry_ids) -> bool:
+        """Whether any of the entries are pages of a content type we sync"""
+        entry_ids = sorted(entry_ids)
+        for i in range(0, len(entry_ids), PREFETCH_BATCH_SIZE):
+            entries = ContentfulPage.client.entries(
+                {
+                    "sys.id[in]": ",".join(entry_ids[i : i + PREFETCH_BATCH_SIZE]),
+                    "include": 0,
+                }
+            ).items
+            if any(entry.sys["content_type"].id in settings.CONTENTFUL_CONTENT_TYPES_TO_SYNC for entry in entries):
+                return True
+
+        return False
+
+    def _get_changed_content_to_sync(
+        self,
+        changed_ids,
+        deleted_ids=frozenset(),
+        content_types=None,
+    ) -> Union[list, None]:
+        """Finds the pages made from the changed or deleted entries and assets, by content type,
+        id and Contentful locale. Deleted pages are left out.
+
+        New pages are found from `content_types`, the content types of the changed entries by
+        ID, when they are known. Otherwise returns None if there are new pages, as then all
+        the content needs to be synced."""
+        affecting_ids = changed_ids.union(deleted_ids)
+        q_obj = Q(contentful_id__in=affecting_ids)
+        for _id in affecting_ids:
+            # Dependencies are stored in a JSONField, but we can query it as text by quoting them
+            q_obj |= Q(dependencies__contains=f'"{_id}"')
+
+        content_to_sync = set()
+        changed_pages = {}
+        known_ids = set()
+        for ctype, page_id, locale, dependencies in ContentfulEntry.objects.filter(q_obj).values_list(
+            "content_type",
+            "contentful_id",
+            "locale",
+            "dependencies",
+        ):
+            known_ids.update(changed_ids.intersection(dependencies))
+            if page_id in deleted_ids:
+                continue
+            elif page_id in changed_ids:
+                # a changed page may have been published in more locales
+                known_ids.add(page_id)
+                changed_pages[page_id] = ctype
+            elif ctype == CONTENT_TYPE_CONNECT_HOMEPAGE:
+                content_to_sync.add((ctype, page_id, DEFAULT_LOCALE))
+            else:
+                content_to_sync.add((ctype, page_id, contentful_locale(locale)))
+
+        unknown_ids = changed_ids.difference(known_ids)
+        if content_types is not None:
+            for _id in unknown_ids:
+                if content_types.get(_id) in settings.CONTENTFUL_CONTENT_TYPES_TO_SYNC:
+                    changed_pages[_id] = content_types[_id]
+        elif unknown_ids and self._has_new_pages(unknown_ids):
+            return None
+
+        if changed_pages:
+            for locale in ContentfulPage.client.locales():
+                for page_id, ctype in changed_pages.items():
+                    if self._page_is_syncable(ctype, page_id, locale.code):
+                        content_to_sync.add((ctype, page_id, locale.code))
+
+        return sorted(content_to_sync)
+
+    def _refresh_changed_pages(
+        self,
+        changed_ids,
+        deleted_ids=frozenset(),
+        content_types=None,
+    ) -> Tuple[int, int, int, int]:
+        """Syncs only the pages made from the entries and assets that changed in Contentful,
+        and deletes the pages that were deleted there"""
+        self.log(f"Pulling pages made from changed Contentful entries and assets: {', '.join(sorted(changed_ids))}")
+        content_to_sync = self._get_changed_content_to_sync(changed_ids, deleted_ids, content_types)
+        if content_to_sync is None:
+            self.log("New pages to sync found")
+            return self._refresh_from_contentful()
+
+        fetched_pages = self._fetch_pages(content_to_sync)
+        self.log(f"Contentful API calls for entries and assets: {self.cache.api_calls}. Cache hits: {self.cache.hits}.")
+
+        with transaction.atomic():
+            deleted_count = 0
+            if deleted_ids:
+                self.log(f"Deleting pages deleted from Contentful: {', '.join(sorted(deleted_ids))}")
+                deleted_count = self._delete_entries(ContentfulEntry.objects.filter(contentful_id__in=deleted_ids))
+
+            added_count, updated_count, error_count, content_missing_localised_version = self._store_pages(content_to_sync, fetched_pages)
+
+            # Pages can only be removed from a locale by editing them, so only the changed
+            # pages that have no content in their locale any more need deleting
+            for _ctype, page_id, locale_code in sorted(content_missing_localised_version):
+                res = ContentfulEntry.objects.filter(
+                    contentful_id=page_id,
+                    locale=self._remap_locale_for_bedrock(locale_code),
+                ).delete()
+                deleted_count += res[0]
+
+            self._check_localisation_complete()
+
+        return added_count, updated_count, deleted_count, error_count
+
+    def _sync_pages(self, query: Dict):
+        """Yields the pages of a sync with the Contentful Sync API"""
+        sync_page = ContentfulPage.client.sync(query)
+        yield sync_page
+        while sync_page.next_page_url:
+            sync_page = sync_page.next(ContentfulPage.client)
+            yield sync_page
+
+    def _get_initial_sync_token(self) -> str:
+        """Returns the token to get the changes in Contentful from now on"""
+        for sync_page in self._sync_pages({"initial": True}):
+            pass
+        return sync_page.next_sync_token
+
+    def _get_sync_deltas(self, sync_token: str) -> Tuple[list, str]:
+        """Returns the entries and assets changed or deleted in Contentful since the sync of the
+        token, and the token for the next sync"""
+        items = []
+        for sync_page in self._sync_pages({"sync_token": sync_token}):
+            items.extend(sync_page.items)
+        return items, sync_page.next_sync_token
+
+    def _save_sync_token(self, sync_token: str) -> None:
+        ContentfulSyncState.objects.update_or_create(
+            space_id=settings.CONTENTFUL_SPACE_ID,
+            environment=settings.CONTENTFUL_ENVIRONMENT,
+            defaults={
+                "sync_token": sync_token,
+                "last_modified": tz_now(),
+            },
+        )
+
+    def _refresh_all_and_save_sync_token(self) -> Tuple[int, int, int, int]:
+        # the token is taken first, so the changes made during the sync are picked up next time
+        sync_token = self._get_initial_sync_token()
+        counts = self._refresh_from_contentful()
+        self._save_sync_token(sync_token)
+        return counts
+
+    def _refresh_from_sync_api(self) -> Tuple[int, int, int, int]:
+        """Syncs the pages affected by the entries and assets changed or deleted in Contentful
+        since the last sync, according to the Sync API. All of the pages are synced when there
+        is no token from a previous sync, or it can't be used."""
+        sync_state = ContentfulSyncState.objects.filter(
+            space_id=settings.CONTENTFUL_SPACE_ID,
+            environment=settings.CONTENTFUL_ENVIRONMENT,
+        ).first()
+        if sync_state is None:
+            self.log("No Contentful sync token stored")
+            return self._refresh_all_and_save_sync_token()
+
+        try:
+            items, sync_token = self._get_sync_deltas(sync_state.sync_token)
+        except HTTPError as ex:
+            self.log(f"Problem syncing changes from Contentful -> {type(ex)}: {ex}")
+            capture_exception(ex)
+            return self._refresh_all_and_save_sync_token()
+
+        changed_ids = set()
+        deleted_ids = set()
+        content_types = {}
+        for item in items:
+            item_type = item.sys["type"]
+            if item_type in ("DeletedEntry", "DeletedAsset"):
+                deleted_ids.add(item.sys["id"])
+            else:
+                changed_ids.add(item.sys["id"])
+                if item_type == "Entry":
+                    content_types[item.sys["id"]] = item.sys["content_type"].id
+
+        if not changed_ids and not deleted_ids:
+            self.log("No Contentful changes since the last sync")
+            self._save_sync_token(sync_token)
+            return 0, 0, 0, 0
+
+        counts = self._refresh_changed_pages(changed_ids, deleted_ids, content_types)
+        self._save_sync_token(sync_token)
+        return counts
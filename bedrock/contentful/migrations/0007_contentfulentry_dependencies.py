@@ -0,0 +1,25 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+# Generated by Django 3.2.18 on 2026-10-18 19:58
+
+from django.db import migrations
+
+import django_extensions.db.fields.json
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("contentful", "0006_mark-en-us-as-localisation-complete"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="contentfulentry",
+            name="dependencies",
+            field=django_extensions.db.fields.json.JSONField(
+                blank=True, default=list, help_text="The IDs of the Contentful entries and assets that the page is made from"
+            ),
+        ),
+    ]
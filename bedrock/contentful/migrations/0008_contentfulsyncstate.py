@@ -0,0 +1,30 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+# Generated by Django 3.2.18 on 2026-10-18 20:05
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("contentful", "0007_contentfulentry_dependencies"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ContentfulSyncState",
+            fields=[
+                ("id", models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("space_id", models.CharField(max_length=255)),
+                ("environment", models.CharField(max_length=255)),
+                ("sync_token", models.TextField()),
+                ("last_modified", models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                "unique_together": {("space_id", "environment")},
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+# Generated by Django 3.2.18 on 2026-10-18 20:08
+
+from django.db import migrations, models
+
+import django_extensions.db.fields.json
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("contentful", "0008_contentfulsyncstate"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="contentfulentry",
+            name="revisions",
+            field=django_extensions.db.fields.json.JSONField(
+                blank=True, default=dict, help_text="The revision of each of the Contentful entries and assets that the page is made from, by ID"
+            ),
+        ),
+        migrations.AddField(
+            model_name="contentfulentry",
+            name="sync_time",
+            field=models.FloatField(default=0, help_text="How long fetching and rendering the page took, in seconds, the last time it changed"),
+        ),
+    ]
@@ -139,6 +139,20 @@ class ContentfulEntry(models.Model):
         blank=True,
         help_text="Some pages may have tags",
     )
+    dependencies = JSONField(
+        blank=True,
+        default=list,
+        help_text="The IDs of the Contentful entries and assets that the page is made from",
+    )
+    revisions = JSONField(
+        blank=True,
+        default=dict,
+        help_text="The revision of each of the Contentful entries and assets that the page is made from, by ID",
+    )
+    sync_time = models.FloatField(
+        default=0,
+        help_text="How long fetching and rendering the page took, in seconds, the last time it changed",
+    )
 
     objects = ContentfulEntryManager()
 
@@ -175,3 +189,18 @@ class ContentfulEntry(models.Model):
         for _tag in self.tags:
             q_obj |= Q(tags__contains=f'"{_tag}"')
         return _base_qs.filter(q_obj).order_by(order_by).distinct()
+
+
+class ContentfulSyncState(models.Model):
+    """The token to get the changes made in a Contentful space and environment since the last sync"""
+
+    space_id = models.CharField(max_length=255)
+    environment = models.CharField(max_length=255)
+    sync_token = models.TextField()
+    last_modified = models.DateTimeField(default=now)
+
+    class Meta:
+        unique_together = ["space_id", "environment"]
+
+    def __str__(self) -> str:
+        return f"ContentfulSyncState {self.space_id}:{self.environment}"
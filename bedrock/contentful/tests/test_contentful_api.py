@@ -9,12 +9,15 @@ from django.conf import settings
 from django.test import override_settings
 
 import pytest
+from contentful.resource_builder import ResourceBuilder
+from crum import set_current_request
 from rich_text_renderer.block_renderers import ListItemRenderer
 from rich_text_renderer.text_renderers import TextRenderer
 
 from bedrock.contentful.api import (
     DEFAULT_LOCALE,
     AssetBlockRenderer,
+    ContentfulCache,
     ContentfulPage,
     EmphasisRenderer,
     InlineEntryRenderer,
@@ -57,6 +60,7 @@ from bedrock.contentful.models import ContentfulEntry
     CONTENTFUL_ENVIRONMENT="test_environment",
     CONTENTFUL_SPACE_API="https://example.com/test/",
     CONTENTFUL_API_TIMEOUT=987654321,
+    CONTENTFUL_API_MAX_RATE_LIMIT_RETRIES=3,
 )
 @patch("bedrock.contentful.api.contentful_api")
 def test_get_client(mock_contentful_api, raw_mode):
@@ -74,6 +78,7 @@ def test_get_client(mock_contentful_api, raw_mode):
         raw_mode=raw_mode,
         content_type_cache=False,
         timeout_s=987654321,
+        max_rate_limit_retries=3,
     )
 
 
@@ -670,6 +675,151 @@ def test_AssetBlockRenderer(mock_client, mock__get_image_url):
     assert output == expected
 
 
+def _contentful_sys(resource_type, resource_id, locale, content_type=None, revision=1):
+    sys = {
+        "type": resource_type,
+        "id": resource_id,
+        "locale": locale,
+        "revision": revision,
+        "space": {"sys": {"type": "Link", "linkType": "Space", "id": "test_space"}},
+    }
+    if content_type:
+        sys["contentType"] = {"sys": {"type": "Link", "linkType": "ContentType", "id": content_type}}
+    return sys
+
+
+def _contentful_link(link_type, link_id):
+    return {"sys": {"type": "Link", "linkType": link_type, "id": link_id}}
+
+
+def _contentful_array(items, included_entries=(), included_assets=()):
+    return ResourceBuilder(
+        DEFAULT_LOCALE,
+        False,
+        {
+            "sys": {"type": "Array"},
+            "items": list(items),
+            "includes": {"Entry": list(included_entries), "Asset": list(included_assets)},
+        },
+    ).build()
+
+
+def _mock_contentful_entries(query):
+    locale = query["locale"]
+    ids = query["sys.id[in]"].split(",")
+    if ids[0].startswith("page"):
+        # pages with a linked card and a logo embedded in their rich text
+        pages = [
+            {
+                "sys": _contentful_sys("Entry", page_id, locale, "pageVersatile"),
+                "fields": {
+                    "content": [_contentful_link("Entry", "card")],
+                    "body": {
+                        "nodeType": "document",
+                        "data": {},
+                        "content": [
+                            {"nodeType": "embedded-entry-inline", "data": {"target": _contentful_link("Entry", "logo")}, "content": []},
+                            {"nodeType": "embedded-asset-block", "data": {"target": _contentful_link("Asset", "image")}, "content": []},
+                        ],
+                    },
+                },
+            }
+            for page_id in ids
+        ]
+        card = {"sys": _contentful_sys("Entry", "card", locale, "componentLargeCard"), "fields": {"image": _contentful_link("Asset", "card_image")}}
+        card_image = {"sys": _contentful_sys("Asset", "card_image", locale), "fields": {"title": "Card"}}
+        return _contentful_array(pages, [card], [card_image])
+
+    return _contentful_array({"sys": _contentful_sys("Entry", entry_id, locale, "componentLogo"), "fields": {}} for entry_id in ids)
+
+
+def _mock_contentful_assets(query):
+    return _contentful_array(
+        {"sys": _contentful_sys("Asset", asset_id, query["locale"]), "fields": {"title": asset_id}} for asset_id in query["sys.id[in]"].split(",")
+    )
+
+
+@patch("bedrock.contentful.api.PREFETCH_BATCH_SIZE", 2)
+def test_ContentfulCache__prefetch_entries():
+    client = Mock()
+    client.entries.side_effect = _mock_contentful_entries
+    client.assets.side_effect = _mock_contentful_assets
+    cache = ContentfulCache(client)
+
+    cache.prefetch_entries(["page1", "page2", "page3"], "de")
+
+    # two batches of pages, then the embedded entries and assets in the default locale
+    assert client.entries.call_count == 3
+    assert client.entries.call_args_list[0][0][0]["sys.id[in]"] == "page1,page2"
+    assert client.entries.call_args_list[1][0][0]["sys.id[in]"] == "page3"
+    assert client.entries.call_args_list[2][0][0] == {"sys.id[in]": "logo", "include": 10, "locale": DEFAULT_LOCALE, "limit": 1}
+    client.assets.assert_called_once_with({"sys.id[in]": "image", "locale": DEFAULT_LOCALE, "limit": 1})
+    assert cache.api_calls == 4
+
+    # everything the pages need comes from the cache
+    for page_id in ("page1", "page2", "page3"):
+        assert cache.entry(page_id, "de").sys["id"] == page_id
+    assert cache.entry("card", "de").sys["id"] == "card"
+    assert cache.asset("card_image", "de").sys["id"] == "card_image"
+    assert cache.entry("logo").sys["id"] == "logo"
+    assert cache.asset("image").sys["id"] == "image"
+    assert cache.hits == 7
+    assert cache.api_calls == 4
+    client.entry.assert_not_called()
+    client.asset.assert_not_called()
+
+    # only the pages that aren't cached yet are fetched
+    cache.prefetch_entries(["page3", "page4"], "de")
+    assert client.entries.call_args_list[3][0][0]["sys.id[in]"] == "page4"
+
+
+def test_ContentfulCache__revisions():
+    client = Mock()
+    client.entries.side_effect = _mock_contentful_entries
+    client.assets.side_effect = _mock_contentful_assets
+    client.entry.return_value = _contentful_array([{"sys": _contentful_sys("Entry", "page9", "de", "pageVersatile", revision=4), "fields": {}}])[0]
+    cache = ContentfulCache(client)
+    cache.prefetch_entries(["page1"], "de")
+
+    # the linked and embedded entries and assets all come from the cache
+    assert cache.revisions(cache.entry("page1", "de")) == {"page1": 1, "card": 1, "card_image": 1, "logo": 1, "image": 1}
+    assert cache.api_calls == 3
+    assert cache.revisions(cache.entry("page9", "de")) == {"page9": 4}
+
+
+def test_ContentfulCache__entry_and_asset():
+    client = Mock()
+    client.entry.return_value = _contentful_array([{"sys": _contentful_sys("Entry", "cta", "fr", "componentCtaButton"), "fields": {}}])[0]
+    client.asset.return_value = Mock()
+    cache = ContentfulCache(client)
+
+    assert cache.entry("cta", "fr") is cache.entry("cta", "fr")
+    client.entry.assert_called_once_with("cta", {"include": 10, "locale": "fr"})
+    assert cache.asset("image") is cache.asset("image")
+    client.asset.assert_called_once_with("image", {"locale": DEFAULT_LOCALE})
+    assert (cache.api_calls, cache.hits) == (2, 2)
+
+
+@patch("bedrock.contentful.api.ContentfulPage.client")
+def test_renderers_use_request_cache(mock_client, rf):
+    request = rf.get("/")
+    request.contentful_cache = Mock()
+    request.contentful_cache.entry.return_value.sys = {"content_type": Mock(id="somethingElse")}
+    request.contentful_cache.asset.return_value.description = "Dude"
+    request.contentful_cache.asset.return_value.url.return_value = "//example.com/dude.png"
+    set_current_request(request)
+    try:
+        assert InlineEntryRenderer().render({"data": {"target": {"sys": {"id": "entry_id"}}}}) == "somethingElse"
+        assert 'alt="Dude"' in AssetBlockRenderer().render({"data": {"target": {"sys": {"id": "asset_id"}}}})
+    finally:
+        set_current_request(None)
+
+    request.contentful_cache.entry.assert_called_once_with("entry_id")
+    request.contentful_cache.asset.assert_called_once_with("asset_id")
+    mock_client.entry.assert_not_called()
+    mock_client.asset.assert_not_called()
+
+
 def test__render_list():
     assert _render_list("ol", "test content here") == "<ol class='mzp-u-list-styled'>test content here</ol>"
     assert _render_list("ul", "test content here") == "<ul class='mzp-u-list-styled'>test content here</ul>"
@@ -852,6 +1002,15 @@ def test_ContentfulPage___get_image_from_default_locale_seo_object__no_relevant_
     assert basic_contentful_page._get_image_from_default_locale_seo_object("test_id") == ""
 
 
+def test_ContentfulPage___get_image_from_default_locale_seo_object__given_images(
+    basic_contentful_page,
+):
+    # no database access is needed when the images are given
+    basic_contentful_page.default_locale_seo_images = {"test_id": "https://example.com/test.webp"}
+    assert basic_contentful_page._get_image_from_default_locale_seo_object("test_id") == "https://example.com/test.webp"
+    assert basic_contentful_page._get_image_from_default_locale_seo_object("NOT_THE_test_id") == ""
+
+
 @pytest.mark.parametrize(
     "entry_fields, expected",
     (
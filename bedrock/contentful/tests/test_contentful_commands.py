@@ -9,6 +9,7 @@ from django.conf import settings
 from django.test import override_settings
 
 import pytest
+from contentful.errors import BadRequestError
 
 from bedrock.contentful.constants import (
     ACTION_ARCHIVE,
@@ -24,11 +25,14 @@ from bedrock.contentful.constants import (
 )
 from bedrock.contentful.management.commands.update_contentful import (
     MAX_MESSAGES_PER_QUEUE_POLL,
+    RENDER_REVISION_KEY,
     Command as UpdateContentfulCommand,
 )
-from bedrock.contentful.models import ContentfulEntry
+from bedrock.contentful.models import ContentfulEntry, ContentfulSyncState
 from bedrock.contentful.tests.data import resource_center_page_data
 
+FULL_SYNC_ACTIONS = {ACTION_ARCHIVE, ACTION_UNPUBLISH, ACTION_DELETE}
+
 
 @pytest.fixture
 def command_instance():
@@ -249,7 +253,13 @@ def test_update_contentful__queue_has_viable_messages__viable_message_found__dev
     mock_boto_3.resource.return_value = mock_sqs
 
     assert command_instance._queue_has_viable_messages() is True
-    mock_queue.purge.assert_called_once()
+    if FULL_SYNC_ACTIONS.intersection(message_actions_sequence):
+        mock_queue.purge.assert_called_once()
+        assert command_instance.changed_ids is None
+    else:
+        # only the pages made from the changed entry need syncing, and all the messages were read
+        mock_queue.purge.assert_not_called()
+        assert command_instance.changed_ids == {"123abc"}
 
 
 @override_settings(
@@ -295,7 +305,13 @@ def test_update_contentful__queue_has_viable_messages__viable_message_found__pro
     mock_boto_3.resource.return_value = mock_sqs
 
     assert command_instance._queue_has_viable_messages() is True
-    mock_queue.purge.assert_called_once()
+    if FULL_SYNC_ACTIONS.intersection(message_actions_sequence):
+        mock_queue.purge.assert_called_once()
+        assert command_instance.changed_ids is None
+    else:
+        # only the pages made from the changed entry need syncing, and all the messages were read
+        mock_queue.purge.assert_not_called()
+        assert command_instance.changed_ids == {"123abc"}
 
 
 @override_settings(
@@ -413,12 +429,66 @@ def test_update_contentful__iteration_through_message_batch_thresholds(
     # Only the last message in each test case is viable, because
     # ACTION_CREATE should NOT trigger anything in Dev, Stage or Prod
     messages_for_queue = _build_mock_messages(message_actions_sequence)
+    all_messages = [msg for batch in messages_for_queue for msg in batch]
     mock_sqs, mock_queue = _establish_mock_queue(messages_for_queue)
 
     mock_boto_3.resource.return_value = mock_sqs
 
     assert command_instance._queue_has_viable_messages() is True
-    mock_queue.purge.assert_called_once()
+    mock_queue.purge.assert_not_called()
+    assert command_instance.changed_ids == {"123abc"}
+    for msg in all_messages:
+        msg.delete.assert_called_once()
+
+
+@override_settings(
+    CONTENTFUL_NOTIFICATION_QUEUE_ACCESS_KEY_ID="dummy",
+    APP_NAME="bedrock-prod",
+)
+@mock.patch("bedrock.contentful.management.commands.update_contentful.boto3")
+@pytest.mark.parametrize(
+    "message_bodies, expected",
+    (
+        (
+            [
+                f"ContentManagement.Entry.{ACTION_PUBLISH},abc123,abc123",
+                f"ContentManagement.Asset.{ACTION_PUBLISH},def456,def456",
+                f"ContentManagement.Entry.{ACTION_CREATE},ghi789,ghi789",
+                f"ContentManagement.Entry.{ACTION_UNARCHIVE},abc123,abc123",
+            ],
+            {"abc123", "def456"},
+        ),
+        (
+            [
+                f"ContentManagement.Entry.{ACTION_PUBLISH},abc123,abc123",
+                f"ContentManagement.Entry.{ACTION_PUBLISH},,",
+                f"ContentManagement.Entry.{ACTION_PUBLISH},def456,def456",
+            ],
+            None,
+        ),
+    ),
+    ids=(
+        "changed entries and assets",
+        "message without an ID",
+    ),
+)
+def test_update_contentful__queue_has_viable_messages__changed_ids(
+    mock_boto_3,
+    message_bodies,
+    expected,
+    command_instance,
+):
+    messages = []
+    for i, body in enumerate(message_bodies):
+        msg = mock.Mock(name=f"msg-{i}")
+        msg.body = body
+        messages.append(msg)
+    mock_sqs, mock_queue = _establish_mock_queue([messages])
+    mock_boto_3.resource.return_value = mock_sqs
+
+    assert command_instance._queue_has_viable_messages() is True
+    assert command_instance.changed_ids == expected
+    assert mock_queue.purge.call_count == (1 if expected is None else 0)
 
 
 @override_settings(
@@ -439,6 +509,7 @@ def test_update_contentful__queue_has_viable_messages__no_messages(
     mock_queue.purge.assert_not_called()
 
 
+@override_settings(CONTENTFUL_SYNC_API_DELTAS=False)
 @pytest.mark.parametrize(
     "must_force,has_viable_messages,expected",
     (
@@ -462,6 +533,7 @@ def test_update_contentful__refresh(
         name="_queue_has_viable_messages",
         return_value=has_viable_messages,
     )
+    command_instance._refresh_changed_pages = mock.Mock(name="_refresh_changed_pages")
 
     command_instance._refresh_from_contentful = mock.Mock(
         name="_refresh_from_contentful",
@@ -477,6 +549,104 @@ def test_update_contentful__refresh(
 
     retval = command_instance.refresh()
     assert retval == expected
+    command_instance._refresh_changed_pages.assert_not_called()
+
+
+@override_settings(CONTENTFUL_SYNC_API_DELTAS=False)
+@pytest.mark.parametrize(
+    "must_force, full_sync, expected_full_refresh",
+    (
+        (False, False, False),
+        (True, False, True),
+        (False, True, True),
+    ),
+    ids=(
+        "Changed entries in queue",
+        "Forced",
+        "Full sync",
+    ),
+)
+def test_update_contentful__refresh__changed_ids(
+    must_force,
+    full_sync,
+    expected_full_refresh,
+    command_instance,
+):
+    def _queue_has_viable_messages():
+        command_instance.changed_ids = {"abc123"}
+        return True
+
+    command_instance._queue_has_viable_messages = _queue_has_viable_messages
+    command_instance._refresh_from_contentful = mock.Mock(name="_refresh_from_contentful", return_value=(3, 2, 1, 0))
+    command_instance._refresh_changed_pages = mock.Mock(name="_refresh_changed_pages", return_value=(1, 1, 0, 0))
+    command_instance.force = must_force
+    command_instance.full_sync = full_sync
+
+    retval = command_instance.refresh()
+
+    if expected_full_refresh:
+        assert retval == (True, 3, 2, 1, 0)
+        command_instance._refresh_changed_pages.assert_not_called()
+    else:
+        assert retval == (True, 1, 1, 0, 0)
+        command_instance._refresh_changed_pages.assert_called_once_with({"abc123"})
+        command_instance._refresh_from_contentful.assert_not_called()
+
+
+@override_settings(CONTENTFUL_SYNC_API_DELTAS=True)
+@pytest.mark.parametrize(
+    "must_force, full_sync, expected_full_refresh",
+    (
+        (False, False, False),
+        (True, False, True),
+        (False, True, True),
+    ),
+    ids=(
+        "Queue has viable messages",
+        "Forced",
+        "Full sync",
+    ),
+)
+def test_update_contentful__refresh__sync_api(
+    must_force,
+    full_sync,
+    expected_full_refresh,
+    command_instance,
+):
+    command_instance._queue_has_viable_messages = mock.Mock(name="_queue_has_viable_messages", return_value=True)
+    command_instance._refresh_from_contentful = mock.Mock(name="_refresh_from_contentful", return_value=(3, 2, 1, 0))
+    command_instance._refresh_from_sync_api = mock.Mock(name="_refresh_from_sync_api", return_value=(1, 1, 0, 0))
+    command_instance._get_initial_sync_token = mock.Mock(name="_get_initial_sync_token", return_value="new-token")
+    command_instance._save_sync_token = mock.Mock(name="_save_sync_token")
+    command_instance.force = must_force
+    command_instance.full_sync = full_sync
+
+    retval = command_instance.refresh()
+
+    if expected_full_refresh:
+        assert retval == (True, 3, 2, 1, 0)
+        command_instance._refresh_from_sync_api.assert_not_called()
+        # the changes applied by the full sync are not synced again next time
+        command_instance._save_sync_token.assert_called_once_with("new-token")
+    else:
+        # the changes come from the Sync API, whatever the messages were
+        assert retval == (True, 1, 1, 0, 0)
+        command_instance._refresh_from_contentful.assert_not_called()
+
+
+@pytest.mark.django_db
+@override_settings(CONTENTFUL_SYNC_API_DELTAS=True, CONTENTFUL_SPACE_ID="space", CONTENTFUL_ENVIRONMENT="master")
+@mock.patch("bedrock.contentful.management.commands.update_contentful.ContentfulPage")
+def test_update_contentful__refresh__full_sync_saves_sync_token(mock_contentful_page, command_instance):
+    ContentfulSyncState.objects.create(space_id="space", environment="master", sync_token="old-token")
+    mock_contentful_page.client.sync.return_value = _build_mock_sync_pages([], [])
+    command_instance._refresh_from_contentful = mock.Mock(name="_refresh_from_contentful", return_value=(0, 3, 0, 0))
+    command_instance.full_sync = True
+
+    assert command_instance.refresh() == (True, 0, 3, 0, 0)
+
+    mock_contentful_page.client.sync.assert_called_once_with({"initial": True})
+    assert ContentfulSyncState.objects.get().sync_token == "token-1"
 
 
 def _build_mock_entries(mock_entry_data: List[dict]) -> List[mock.Mock]:
@@ -859,3 +1029,424 @@ def test__get_value_from_data__no_false_positives(
 ):
     mocked_jq_all.return_value = jq_all_mocked_output
     assert command_instance._get_value_from_data(data=None, spec=None) == expected
+
+
+def _build_mock_locales(codes: List[str]) -> List[mock.Mock]:
+    locales = []
+    for code in codes:
+        locale = mock.Mock()
+        locale.code = code
+        locales.append(locale)
+    return locales
+
+
+def _mock_page_content(request, page_id, default_locale_seo_images=None):
+    if page_id == "broken":
+        raise ValueError("broken page")
+
+    assert request.contentful_cache is not None
+    seo = {"image": f"https://example.com/{page_id}.webp"}
+    if request.locale != "en-US":
+        seo["image"] = default_locale_seo_images.get(page_id, "")
+
+    page = mock.Mock()
+    page.get_content.return_value = {
+        "page_type": CONTENT_TYPE_PAGE_RESOURCE_CENTER,
+        "info": {"locale": request.locale, "slug": page_id, "seo": seo},
+        "entries": [],
+    }
+    return page
+
+
+@override_settings(CONTENTFUL_CONTENT_TYPES_TO_SYNC=["type_one", "type_two"])
+@mock.patch("bedrock.contentful.management.commands.update_contentful.ContentfulPage")
+def test_update_contentful__get_content_to_sync__concurrent(
+    mock_contentful_page,
+    command_instance,
+):
+    def _entries(query):
+        retval = mock.Mock()
+        retval.items = _build_mock_entries([{"sys": {"id": f"{query['content_type']}-{query['locale']}-{i}"}} for i in range(2)])
+        return retval
+
+    mock_contentful_page.client.entries.side_effect = _entries
+    command_instance.workers = 4
+
+    output = command_instance._get_content_to_sync(_build_mock_locales(["en-US", "de"]))
+
+    # still in the order of the locales and content types
+    assert output == [
+        ("type_one", "type_one-en-US-0", "en-US"),
+        ("type_one", "type_one-en-US-1", "en-US"),
+        ("type_two", "type_two-en-US-0", "en-US"),
+        ("type_two", "type_two-en-US-1", "en-US"),
+        ("type_one", "type_one-de-0", "de"),
+        ("type_one", "type_one-de-1", "de"),
+        ("type_two", "type_two-de-0", "de"),
+        ("type_two", "type_two-de-1", "de"),
+    ]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("workers", (1, 4))
+@mock.patch("bedrock.contentful.management.commands.update_contentful.ContentfulPage")
+def test_update_contentful__fetch_pages(mock_contentful_page, workers, command_instance):
+    ContentfulEntry.objects.create(
+        content_type=CONTENT_TYPE_PAGE_RESOURCE_CENTER,
+        contentful_id="old",
+        locale="en-US",
+        data={"info": {"seo": {"image": "https://example.com/saved.webp"}}},
+    )
+    mock_contentful_page.side_effect = _mock_page_content
+    command_instance.workers = workers
+    content_to_sync = [
+        (CONTENT_TYPE_PAGE_RESOURCE_CENTER, "new", "de"),
+        (CONTENT_TYPE_PAGE_RESOURCE_CENTER, "old", "de"),
+        (CONTENT_TYPE_PAGE_RESOURCE_CENTER, "new", "en-US"),
+        (CONTENT_TYPE_PAGE_RESOURCE_CENTER, "broken", "en-US"),
+    ]
+
+    results = command_instance._fetch_pages(content_to_sync)
+
+    assert set(results) == set(content_to_sync)
+    # the other locales get the SEO images of the pages just fetched in the default locale, or in the database
+    assert results[(CONTENT_TYPE_PAGE_RESOURCE_CENTER, "new", "de")][0]["info"]["seo"]["image"] == "https://example.com/new.webp"
+    assert results[(CONTENT_TYPE_PAGE_RESOURCE_CENTER, "old", "de")][0]["info"]["seo"]["image"] == "https://example.com/saved.webp"
+    page_data, revisions, _sync_time, ex = results[(CONTENT_TYPE_PAGE_RESOURCE_CENTER, "broken", "en-US")]
+    assert page_data is None
+    assert revisions == {}
+    assert str(ex) == "broken page"
+
+
+@pytest.mark.django_db
+@override_settings(CONTENTFUL_CONTENT_TYPES_TO_SYNC=[CONTENT_TYPE_PAGE_RESOURCE_CENTER])
+@mock.patch("bedrock.contentful.management.commands.update_contentful.capture_exception")
+@mock.patch("bedrock.contentful.management.commands.update_contentful.ContentfulPage")
+def test_update_contentful__refresh_from_contentful__concurrent(
+    mock_contentful_page,
+    mock_capture_exception,
+    command_instance,
+):
+    ContentfulEntry.objects.create(
+        content_type=CONTENT_TYPE_PAGE_RESOURCE_CENTER,
+        contentful_id="gone",
+        locale="en-US",
+        data={},
+    )
+    mock_contentful_page.client.locales.return_value = _build_mock_locales(["en-US", "fr"])
+    mock_contentful_page.client.entries.return_value.items = _build_mock_entries([{"sys": {"id": page_id}} for page_id in ("one", "two", "broken")])
+    mock_contentful_page.side_effect = _mock_page_content
+    command_instance.force = False
+    command_instance.workers = 4
+
+    assert command_instance._refresh_from_contentful() == (4, 0, 1, 2)
+    # the pages of each locale were prefetched in one request
+    command_instance.log.assert_any_call("Contentful API calls for entries and assets: 2. Cache hits: 0.")
+
+    assert sorted(ContentfulEntry.objects.values_list("contentful_id", "locale")) == [
+        ("one", "en-US"),
+        ("one", "fr"),
+        ("two", "en-US"),
+        ("two", "fr"),
+    ]
+    assert mock_capture_exception.call_count == 2
+
+
+@pytest.mark.django_db
+@override_settings(CONTENTFUL_CONTENT_TYPES_TO_SYNC=[CONTENT_TYPE_PAGE_RESOURCE_CENTER, CONTENT_TYPE_CONNECT_HOMEPAGE])
+@mock.patch("bedrock.contentful.management.commands.update_contentful.ContentfulPage")
+def test_update_contentful__get_changed_content_to_sync(mock_contentful_page, command_instance):
+    for page_id, locale, dependencies in (
+        ("one", "en-US", ["one", "shared", "image"]),
+        ("one", "de", ["one", "shared"]),
+        ("two", "en-US", ["two", "other"]),
+        ("three", "fr", ["three", "shared-image"]),
+    ):
+        ContentfulEntry.objects.create(
+            content_type=CONTENT_TYPE_PAGE_RESOURCE_CENTER,
+            contentful_id=page_id,
+            locale=locale,
+            data={},
+            dependencies=dependencies,
+        )
+    ContentfulEntry.objects.create(
+        content_type=CONTENT_TYPE_CONNECT_HOMEPAGE,
+        contentful_id="home",
+        locale="de",
+        data={},
+        dependencies=["home", "shared"],
+    )
+    mock_contentful_page.client.locales.return_value = _build_mock_locales(["en-US", "fr"])
+    mock_contentful_page.client.entries.return_value.items = _build_mock_entries(
+        [{"sys": {"id": "new-entry", "content_type": mock.Mock(id="someType")}}]
+    )
+
+    output = command_instance._get_changed_content_to_sync({"shared", "three", "new-entry"})
+
+    assert output == [
+        (CONTENT_TYPE_CONNECT_HOMEPAGE, "home", "en-US"),
+        # the Bedrock locale is mapped back to the Contentful one
+        (CONTENT_TYPE_PAGE_RESOURCE_CENTER, "one", "de-DE"),
+        (CONTENT_TYPE_PAGE_RESOURCE_CENTER, "one", "en-US"),
+        # changed pages are synced in all locales
+        (CONTENT_TYPE_PAGE_RESOURCE_CENTER, "three", "en-US"),
+        (CONTENT_TYPE_PAGE_RESOURCE_CENTER, "three", "fr"),
+    ]
+    # only the unknown ID is looked up
+    mock_contentful_page.client.entries.assert_called_once_with({"sys.id[in]": "new-entry", "include": 0})
+
+    # a new page needs a full sync
+    mock_contentful_page.client.entries.return_value.items = _build_mock_entries(
+        [{"sys": {"id": "new-entry", "content_type": mock.Mock(id=CONTENT_TYPE_PAGE_RESOURCE_CENTER)}}]
+    )
+    assert command_instance._get_changed_content_to_sync({"shared", "new-entry"}) is None
+
+
+@pytest.mark.django_db
+@override_settings(CONTENTFUL_CONTENT_TYPES_TO_SYNC=[CONTENT_TYPE_PAGE_RESOURCE_CENTER])
+@mock.patch("bedrock.contentful.management.commands.update_contentful.ContentfulCache.revisions")
+@mock.patch("bedrock.contentful.management.commands.update_contentful.ContentfulPage")
+def test_update_contentful__refresh_changed_pages(
+    mock_contentful_page,
+    mock_revisions,
+    command_instance,
+):
+    for page_id in ("one", "two", "untouched"):
+        ContentfulEntry.objects.create(
+            content_type=CONTENT_TYPE_PAGE_RESOURCE_CENTER,
+            contentful_id=page_id,
+            locale="en-US",
+            data={"entries": []},
+            dependencies=[page_id, "shared"] if page_id != "untouched" else [page_id],
+        )
+    mock_contentful_page.side_effect = _mock_page_content
+    mock_revisions.return_value = {"page": 1, "shared": 2, "new-image": 1}
+    command_instance.force = False
+
+    assert command_instance._refresh_changed_pages({"shared"}) == (0, 2, 0, 0)
+
+    # only the pages made from the changed entry were fetched
+    assert sorted(call.args[1] for call in mock_contentful_page.call_args_list) == ["one", "two"]
+    mock_contentful_page.client.locales.assert_not_called()
+    assert ContentfulEntry.objects.get(contentful_id="one").dependencies == ["new-image", "page", "shared"]
+    assert ContentfulEntry.objects.get(contentful_id="untouched").dependencies == ["untouched"]
+
+
+def _build_mock_sync_pages(*pages_items) -> mock.Mock:
+    sync_pages = []
+    for i, items in enumerate(pages_items):
+        sync_page = mock.Mock(name=f"sync_page-{i}")
+        sync_page.items = items
+        sync_page.next_page_url = "https://cdn.contentful.com/next-page" if i < len(pages_items) - 1 else ""
+        sync_page.next_sync_token = f"token-{i}"
+        sync_pages.append(sync_page)
+
+    for sync_page, next_sync_page in zip(sync_pages, sync_pages[1:]):
+        sync_page.next.return_value = next_sync_page
+    return sync_pages[0]
+
+
+def _build_mock_sync_item(item_type: str, item_id: str, content_type: str = None) -> mock.Mock:
+    item = mock.Mock(name=f"{item_type}-{item_id}")
+    item.sys = {"type": item_type, "id": item_id}
+    if content_type:
+        item.sys["content_type"] = mock.Mock(id=content_type)
+    return item
+
+
+@pytest.mark.django_db
+@override_settings(CONTENTFUL_SPACE_ID="space", CONTENTFUL_ENVIRONMENT="master")
+@mock.patch("bedrock.contentful.management.commands.update_contentful.ContentfulPage")
+def test_update_contentful__refresh_from_sync_api__no_sync_token(mock_contentful_page, command_instance):
+    mock_contentful_page.client.sync.return_value = _build_mock_sync_pages([], [])
+    command_instance._refresh_from_contentful = mock.Mock(name="_refresh_from_contentful", return_value=(3, 0, 0, 0))
+
+    assert command_instance._refresh_from_sync_api() == (3, 0, 0, 0)
+
+    mock_contentful_page.client.sync.assert_called_once_with({"initial": True})
+    assert ContentfulSyncState.objects.get(space_id="space", environment="master").sync_token == "token-1"
+
+
+@pytest.mark.django_db
+@override_settings(
+    CONTENTFUL_SPACE_ID="space",
+    CONTENTFUL_ENVIRONMENT="master",
+    CONTENTFUL_CONTENT_TYPES_TO_SYNC=[CONTENT_TYPE_PAGE_RESOURCE_CENTER],
+)
+@mock.patch("bedrock.contentful.management.commands.update_contentful.ContentfulPage")
+def test_update_contentful__refresh_from_sync_api(mock_contentful_page, command_instance):
+    ContentfulSyncState.objects.create(space_id="space", environment="master", sync_token="old-token")
+    for page_id, dependencies in (
+        ("one", ["one", "shared"]),
+        ("two", ["two"]),
+        ("gone", ["gone", "shared"]),
+    ):
+        ContentfulEntry.objects.create(
+            content_type=CONTENT_TYPE_PAGE_RESOURCE_CENTER,
+            contentful_id=page_id,
+            locale="en-US",
+            data={"entries": []},
+            dependencies=dependencies,
+        )
+    mock_contentful_page.client.locales.return_value = _build_mock_locales(["en-US"])
+    mock_contentful_page.client.sync.return_value = _build_mock_sync_pages(
+        [
+            _build_mock_sync_item("Entry", "shared", "someType"),
+            _build_mock_sync_item("DeletedEntry", "gone"),
+        ],
+        [
+            _build_mock_sync_item("Entry", "new", CONTENT_TYPE_PAGE_RESOURCE_CENTER),
+            _build_mock_sync_item("Asset", "unused"),
+        ],
+    )
+    mock_contentful_page.side_effect = _mock_page_content
+    command_instance.force = False
+
+    assert command_instance._refresh_from_sync_api() == (1, 1, 1, 0)
+
+    mock_contentful_page.client.sync.assert_called_once_with({"sync_token": "old-token"})
+    # the new page is synced without listing all of the pages
+    assert not any("content_type" in call.args[0] for call in mock_contentful_page.client.entries.call_args_list)
+    assert sorted(call.args[1] for call in mock_contentful_page.call_args_list) == ["new", "one"]
+    assert sorted(ContentfulEntry.objects.values_list("contentful_id", flat=True)) == ["new", "one", "two"]
+    assert ContentfulSyncState.objects.get().sync_token == "token-1"
+
+
+@pytest.mark.django_db
+@override_settings(CONTENTFUL_SPACE_ID="space", CONTENTFUL_ENVIRONMENT="master")
+@mock.patch("bedrock.contentful.management.commands.update_contentful.ContentfulPage")
+def test_update_contentful__refresh_from_sync_api__no_changes(mock_contentful_page, command_instance):
+    ContentfulSyncState.objects.create(space_id="space", environment="master", sync_token="old-token")
+    mock_contentful_page.client.sync.return_value = _build_mock_sync_pages([])
+    command_instance._fetch_pages = mock.Mock(name="_fetch_pages")
+    command_instance._check_localisation_complete = mock.Mock(name="_check_localisation_complete")
+
+    assert command_instance._refresh_from_sync_api() == (0, 0, 0, 0)
+
+    command_instance._fetch_pages.assert_not_called()
+    command_instance._check_localisation_complete.assert_not_called()
+    mock_contentful_page.client.locales.assert_not_called()
+    assert ContentfulSyncState.objects.get().sync_token == "token-0"
+
+
+@pytest.mark.django_db
+@override_settings(CONTENTFUL_SPACE_ID="space", CONTENTFUL_ENVIRONMENT="master")
+@mock.patch("bedrock.contentful.management.commands.update_contentful.capture_exception")
+@mock.patch("bedrock.contentful.management.commands.update_contentful.ContentfulPage")
+def test_update_contentful__refresh_from_sync_api__bad_sync_token(
+    mock_contentful_page,
+    mock_capture_exception,
+    command_instance,
+):
+    ContentfulSyncState.objects.create(space_id="space", environment="master", sync_token="expired-token")
+    error = BadRequestError(mock.Mock(status_code=400, text="", json=mock.Mock(return_value={"message": "Invalid sync token"})))
+    mock_contentful_page.client.sync.side_effect = [error, _build_mock_sync_pages([])]
+    command_instance._refresh_from_contentful = mock.Mock(name="_refresh_from_contentful", return_value=(0, 3, 0, 0))
+
+    assert command_instance._refresh_from_sync_api() == (0, 3, 0, 0)
+
+    mock_contentful_page.client.sync.assert_called_with({"initial": True})
+    mock_capture_exception.assert_called_once_with(error)
+    assert ContentfulSyncState.objects.get().sync_token == "token-0"
+
+
+@pytest.mark.django_db
+@override_settings(GIT_SHA="abc123")
+@pytest.mark.parametrize("force", (False, True))
+@mock.patch("bedrock.contentful.management.commands.update_contentful.ContentfulCache.revisions")
+@mock.patch("bedrock.contentful.management.commands.update_contentful.ContentfulPage")
+def test_update_contentful__fetch_pages__unchanged_revisions(mock_contentful_page, mock_revisions, force, command_instance):
+    for page_id, locale, revisions in (
+        ("same", "en-US", {"same": 1, "image": 1}),
+        ("same", "de", {"same": 1, "image": 1}),
+        ("moved", "en-US", {"moved": 1}),
+        # the page in the default locale moved, and it may have used its SEO image
+        ("moved", "de", {"moved": 2}),
+    ):
+        ContentfulEntry.objects.create(
+            content_type=CONTENT_TYPE_PAGE_RESOURCE_CENTER,
+            contentful_id=page_id,
+            locale=locale,
+            data={"entries": []},
+            data_hash="old",
+            revisions={**revisions, RENDER_REVISION_KEY: "abc123"},
+        )
+    pages = {}
+
+    def _page(request, page_id, default_locale_seo_images=None):
+        page = _mock_page_content(request, page_id, default_locale_seo_images)
+        page.page = page_id
+        pages[(page_id, request.locale)] = page
+        return page
+
+    mock_contentful_page.side_effect = _page
+    mock_revisions.side_effect = lambda page_id: {"same": {"same": 1, "image": 1}, "moved": {"moved": 2}}[page_id]
+    command_instance.force = force
+    content_to_sync = [
+        (CONTENT_TYPE_PAGE_RESOURCE_CENTER, "same", "en-US"),
+        (CONTENT_TYPE_PAGE_RESOURCE_CENTER, "same", "de"),
+        (CONTENT_TYPE_PAGE_RESOURCE_CENTER, "moved", "en-US"),
+        (CONTENT_TYPE_PAGE_RESOURCE_CENTER, "moved", "de"),
+    ]
+
+    results = command_instance._fetch_pages(content_to_sync)
+
+    rendered = {key for key, page in pages.items() if page.get_content.called}
+    if force:
+        assert rendered == {("same", "en-US"), ("same", "de"), ("moved", "en-US"), ("moved", "de")}
+    else:
+        assert rendered == {("moved", "en-US"), ("moved", "de")}
+        assert results[(CONTENT_TYPE_PAGE_RESOURCE_CENTER, "same", "de")][0] is None
+    assert any(
+        call.args[0].startswith(f"Sync time for {CONTENT_TYPE_PAGE_RESOURCE_CENTER}: ") and call.args[0].endswith(f"Unchanged: {0 if force else 2}.")
+        for call in command_instance.log.call_args_list
+    )
+
+    assert command_instance._store_pages(content_to_sync, results) == (0, 4 if force else 2, 0, set())
+    moved = ContentfulEntry.objects.get(contentful_id="moved", locale="en-US")
+    assert moved.revisions == {"moved": 2, RENDER_REVISION_KEY: "abc123"}
+    assert moved.dependencies == ["moved"]
+    assert moved.sync_time > 0
+    same = ContentfulEntry.objects.get(contentful_id="same", locale="en-US")
+    assert (same.data_hash != "old") is force
+
+
+@pytest.mark.django_db
+@override_settings(CONTENTFUL_CONTENT_TYPES_TO_SYNC=[CONTENT_TYPE_PAGE_RESOURCE_CENTER])
+@mock.patch("bedrock.contentful.management.commands.update_contentful.ContentfulCache.revisions")
+@mock.patch("bedrock.contentful.management.commands.update_contentful.ContentfulPage")
+def test_update_contentful__refresh_from_contentful__unchanged_code(mock_contentful_page, mock_revisions, command_instance):
+    """A full sync skips the pages that didn't change, unless the code that renders them did"""
+    ContentfulEntry.objects.create(
+        content_type=CONTENT_TYPE_PAGE_RESOURCE_CENTER,
+        contentful_id="same",
+        locale="en-US",
+        data={"entries": []},
+        data_hash="old",
+        revisions={"same": 1, RENDER_REVISION_KEY: "abc123"},
+    )
+    pages = []
+
+    def _page(request, page_id, default_locale_seo_images=None):
+        page = _mock_page_content(request, page_id, default_locale_seo_images)
+        pages.append(page)
+        return page
+
+    mock_contentful_page.client.locales.return_value = _build_mock_locales(["en-US"])
+    mock_contentful_page.client.entries.return_value.items = _build_mock_entries([{"sys": {"id": "same"}}])
+    mock_contentful_page.side_effect = _page
+    mock_revisions.return_value = {"same": 1}
+    command_instance.force = False
+
+    with override_settings(GIT_SHA="abc123"):
+        assert command_instance._refresh_from_contentful() == (0, 0, 0, 0)
+    pages[0].get_content.assert_not_called()
+    assert ContentfulEntry.objects.get(contentful_id="same").data_hash == "old"
+
+    with override_settings(GIT_SHA="def456"):
+        assert command_instance._refresh_from_contentful() == (0, 1, 0, 0)
+    pages[1].get_content.assert_called_once()
+    entry = ContentfulEntry.objects.get(contentful_id="same")
+    assert entry.data_hash != "old"
+    assert entry.revisions == {"same": 1, RENDER_REVISION_KEY: "def456"}
+    assert entry.dependencies == ["same"]
@@ -14,6 +14,7 @@ from django.conf import settings
 from everett.manager import ListOf
 from product_details import ProductDetails
 
+from bedrock.base.cache import LRUCache
 from bedrock.base.waffle import config
 
 
@@ -21,8 +22,11 @@ from bedrock.base.waffle import config
 class _ProductDetails(ProductDetails):
     bouncer_url = settings.BOUNCER_URL
 
+    def _query_words(self, query):
+        return re.split(r",|,?\s+", query.strip().lower())
+
     def _matches_query(self, info, query):
-        words = re.split(r",|,?\s+", query.strip().lower())
+        words = self._query_words(query)
         return all((word in info["name_en"].lower() or word in info["name_native"].lower()) for word in words)
 
 
@@ -72,8 +76,15 @@ class FirefoxDesktop(_ProductDetails):
         "release": "LATEST_FIREFOX_VERSION",
     }
 
+    # the most build lists with download URLs to keep, see _get_builds_matrix
+    builds_matrix_size = 32
+    # the most download URLs to keep, see get_download_url
+    download_urls_size = 1024
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
+        self._builds_matrix = LRUCache(self.builds_matrix_size)
+        self._download_urls = LRUCache(self.download_urls_size)
 
     def platforms(self, channel="release", classified=False):
         """
@@ -155,34 +166,36 @@ class FirefoxDesktop(_ProductDetails):
                     _builds["Linux 64-bit"] = _builds["Linux"]
                 return version, _builds
 
-    def _get_filtered_builds(self, builds, channel, version=None, query=None):
+    def _get_builds_matrix(self, builds, channel, version):
         """
-        Get a list of builds, sorted by english locale name, for a specific
-        Firefox version.
+        Get the builds with the download URL of every platform, sorted by english
+        locale name, along with a search index of the lowercase locale names.
+
+        These are built once for each builds dict, channel and version, and again
+        when the product-details data is reloaded.
         :param builds: a build dict from the JSON
         :param channel: one of self.version_map.keys().
         :param version: a firefox version. one of self.latest_versions.
-        :param query: a string to match against native or english locale name
-        :return: list
+        :return: tuple of the list of builds and a list of (english name, native name) tuples
         """
-        version = version or self.latest_version(channel)
+        languages = self.languages
+        key = (id(builds), channel, version)
+        cached = self._builds_matrix.get(key)
+        # the data is the same as long as the same objects are returned by product-details
+        if cached and cached[0] is builds and cached[1] is languages:
+            return cached[2], cached[3]
 
         f_builds = []
         for locale, build in builds.items():
-            if locale not in self.languages or not build.get(version):
+            if locale not in languages or not build.get(version):
                 continue
 
             build_info = {
                 "locale": locale,
-                "name_en": self.languages[locale]["English"],
-                "name_native": self.languages[locale]["native"],
+                "name_en": languages[locale]["English"],
+                "name_native": languages[locale]["native"],
                 "platforms": {},
             }
-
-            # only include builds that match a search query
-            if query is not None and not self._matches_query(build_info, query):
-                continue
-
             for platform, label in self.platform_labels.items():
                 build_info["platforms"][platform] = {
                     "download_url": self.get_download_url(channel, version, platform, locale, True, True),
@@ -190,7 +203,29 @@ class FirefoxDesktop(_ProductDetails):
 
             f_builds.append(build_info)
 
-        return sorted(f_builds, key=itemgetter("name_en"))
+        f_builds.sort(key=itemgetter("name_en"))
+        search_index = [(info["name_en"].lower(), info["name_native"].lower()) for info in f_builds]
+        self._builds_matrix.set(key, (builds, languages, f_builds, search_index))
+        return f_builds, search_index
+
+    def _get_filtered_builds(self, builds, channel, version=None, query=None):
+        """
+        Get a list of builds, sorted by english locale name, for a specific
+        Firefox version.
+        :param builds: a build dict from the JSON
+        :param channel: one of self.version_map.keys().
+        :param version: a firefox version. one of self.latest_versions.
+        :param query: a string to match against native or english locale name
+        :return: list
+        """
+        version = version or self.latest_version(channel)
+        f_builds, search_index = self._get_builds_matrix(builds, channel, version)
+        if query is None:
+            return list(f_builds)
+
+        # only include builds that match a search query
+        words = self._query_words(query)
+        return [build_info for build_info, names in zip(f_builds, search_index) if all(word in names[0] or word in names[1] for word in words)]
 
     def get_filtered_full_builds(self, channel, version=None, query=None):
         """
@@ -225,7 +260,8 @@ class FirefoxDesktop(_ProductDetails):
         locale_in_transition=False,
     ):
         """
-        Get direct download url for the product.
+        Get direct download url for the product. The URLs are memoized, except
+        for funnelcake builds.
         :param channel: one of self.version_map.keys().
         :param version: a firefox version. one of self.latest_version.
         :param platform: OS. one of self.platform_labels.keys().
@@ -240,6 +276,35 @@ class FirefoxDesktop(_ProductDetails):
         :param locale_in_transition: Include the locale in the transition URL
         :return: string url
         """
+        # funnelcake builds depend on the config, which can change at any time
+        if funnelcake_id:
+            return self._get_download_url(
+                channel, version, platform, locale, force_direct, force_full_installer, force_funnelcake, funnelcake_id, locale_in_transition
+            )
+
+        # the URLs only depend on the arguments, and the version changes with the product-details data
+        key = (channel, version, platform, locale, force_direct, force_full_installer, force_funnelcake, locale_in_transition)
+        url = self._download_urls.get(key)
+        if url is None:
+            url = self._get_download_url(
+                channel, version, platform, locale, force_direct, force_full_installer, force_funnelcake, None, locale_in_transition
+            )
+            self._download_urls.set(key, url)
+
+        return url
+
+    def _get_download_url(
+        self,
+        channel,
+        version,
+        platform,
+        locale,
+        force_direct,
+        force_full_installer,
+        force_funnelcake,
+        funnelcake_id,
+        locale_in_transition,
+    ):
         # no longer used, but still passed in. leaving here for now
         # as it will likely be used in future.
         # _version = version
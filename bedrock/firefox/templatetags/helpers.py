@@ -9,6 +9,7 @@ import jinja2
 from django_jinja import library
 from markupsafe import Markup
 
+from bedrock.base.cache import LRUCache
 from bedrock.base.urlresolvers import reverse
 from bedrock.firefox.firefox_details import (
     firefox_android,
@@ -17,6 +18,10 @@ from bedrock.firefox.firefox_details import (
 )
 from lib.l10n_utils import get_locale
 
+# the most desktop build lists to keep, see desktop_builds
+DESKTOP_BUILDS_CACHE_SIZE = 256
+_desktop_builds_cache = LRUCache(DESKTOP_BUILDS_CACHE_SIZE)
+
 
 def desktop_builds(
     channel,
@@ -44,6 +49,41 @@ def desktop_builds(
         locale = "en-US"
         version, platforms = firefox_desktop.latest_builds("en-US", channel)
 
+    # funnelcake builds depend on the config, which can change at any time
+    if funnelcake_id:
+        builds.extend(
+            _desktop_builds(
+                channel, version, locale, force_direct, force_full_installer, force_funnelcake, funnelcake_id, locale_in_transition, classified
+            )
+        )
+        return builds
+
+    # the version changes with the product-details data, so it is part of the key
+    key = (channel, version, locale, force_direct, force_full_installer, force_funnelcake, locale_in_transition, classified)
+    cached = _desktop_builds_cache.get(key)
+    if cached is None:
+        cached = _desktop_builds(
+            channel, version, locale, force_direct, force_full_installer, force_funnelcake, False, locale_in_transition, classified
+        )
+        _desktop_builds_cache.set(key, cached)
+
+    # copies, since callers may change the build info
+    builds.extend(dict(build) for build in cached)
+    return builds
+
+
+def _desktop_builds(
+    channel,
+    version,
+    locale,
+    force_direct,
+    force_full_installer,
+    force_funnelcake,
+    funnelcake_id,
+    locale_in_transition,
+    classified,
+):
+    builds = []
     for plat_os, plat_os_pretty in firefox_desktop.platforms(channel, classified):
         os_pretty = plat_os_pretty
 
@@ -233,6 +233,33 @@ class TestFirefoxDesktopBase(TestCase):
             [("product", "firefox-latest-ssl"), ("os", "osx"), ("lang", "pt-BR")],
         )
 
+    def test_get_download_url_memoized(self):
+        """The same download URL should only be built once, except for funnelcake builds."""
+        with patch.object(self.firefox_desktop, "_get_download_url", wraps=self.firefox_desktop._get_download_url) as url_mock:
+            url = self.firefox_desktop.get_download_url("release", "38.0", "win64", "en-US", True)
+            assert self.firefox_desktop.get_download_url("release", "38.0", "win64", "en-US", True) == url
+            assert url_mock.call_count == 1
+
+            self.firefox_desktop.get_download_url("release", "39.0", "win64", "en-US", True)
+            assert url_mock.call_count == 2
+
+            self.firefox_desktop.get_download_url("release", "38.0", "win64", "en-US", funnelcake_id="64")
+            self.firefox_desktop.get_download_url("release", "38.0", "win64", "en-US", funnelcake_id="64")
+            assert url_mock.call_count == 4
+
+    @patch.object(FirefoxDesktop, "download_urls_size", 1)
+    def test_get_download_url_cache_is_bounded(self):
+        """Only the most recently used download URLs should be kept."""
+        firefox_desktop = FirefoxDesktop(json_dir=PROD_DETAILS_DIR)
+        with patch.object(firefox_desktop, "_get_download_url", wraps=firefox_desktop._get_download_url) as url_mock:
+            firefox_desktop.get_download_url("release", "38.0", "win64", "en-US", True)
+            firefox_desktop.get_download_url("release", "39.0", "win64", "en-US", True)
+            assert len(firefox_desktop._download_urls) == 1
+            firefox_desktop.get_download_url("release", "39.0", "win64", "en-US", True)
+            assert url_mock.call_count == 2
+            firefox_desktop.get_download_url("release", "38.0", "win64", "en-US", True)
+            assert url_mock.call_count == 3
+
     def test_get_download_url_esr(self):
         """
         The ESR version should give us a bouncer url. There is no stub for ESR.
@@ -724,6 +751,32 @@ class TestFirefoxDesktopBase(TestCase):
         assert len(builds) == 1
         assert builds[0]["name_en"] == "French"
 
+    def test_filtered_builds_are_reused(self):
+        """The download URLs should only be built once for the same product-details data."""
+        builds = self.firefox_desktop.get_filtered_full_builds("release")
+        with patch.object(self.firefox_desktop, "get_download_url") as url_mock:
+            assert self.firefox_desktop.get_filtered_full_builds("release") == builds
+            assert self.firefox_desktop.get_filtered_full_builds("release", None, "ujara") == [b for b in builds if b["name_en"] == "Gujarati"]
+            url_mock.assert_not_called()
+
+            # the builds are recomputed for different data
+            de_builds = {"de": self.firefox_desktop.firefox_primary_builds["de"]}
+            with patch.object(self.firefox_desktop, "firefox_primary_builds", de_builds):
+                assert [b["locale"] for b in self.firefox_desktop.get_filtered_full_builds("release")] == ["de"]
+
+            assert url_mock.call_count == len(self.firefox_desktop.platform_labels)
+
+    @patch.object(FirefoxDesktop, "builds_matrix_size", 1)
+    def test_filtered_builds_cache_is_bounded(self):
+        """Only the most recently used build lists should be kept."""
+        firefox_desktop = FirefoxDesktop(json_dir=PROD_DETAILS_DIR)
+        firefox_desktop.get_filtered_full_builds("release")
+        firefox_desktop.get_filtered_full_builds("beta")
+        assert len(firefox_desktop._builds_matrix) == 1
+        with patch.object(firefox_desktop, "get_download_url") as url_mock:
+            firefox_desktop.get_filtered_full_builds("beta")
+            url_mock.assert_not_called()
+
     def test_windows64_build(self):
         # Aurora
         builds = self.firefox_desktop.get_filtered_full_builds("alpha")
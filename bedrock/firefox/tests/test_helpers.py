@@ -2,6 +2,7 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
+from unittest.mock import patch
 from urllib.parse import parse_qs, urlparse
 
 from django.conf import settings
@@ -12,6 +13,8 @@ import pytest
 from django_jinja.backend import Jinja2
 from pyquery import PyQuery as pq
 
+from bedrock.base.cache import LRUCache
+from bedrock.firefox.templatetags.helpers import desktop_builds
 from bedrock.mozorg.tests import TestCase
 from lib.l10n_utils.fluent import fluent_l10n
 
@@ -316,6 +319,40 @@ class TestDownloadButtons(TestCase):
         assert pq(list[0]).attr("class") == "os_ios"
 
 
+class TestDesktopBuilds(TestCase):
+    def test_builds_are_reused(self):
+        """The build list should only be built once for the same arguments and version."""
+        builds = desktop_builds("release", None, "de")
+        with patch("bedrock.firefox.templatetags.helpers.firefox_desktop.get_download_url") as url_mock:
+            assert desktop_builds("release", None, "de") == builds
+            url_mock.assert_not_called()
+
+            # funnelcake builds aren't reused
+            desktop_builds("release", None, "de", funnelcake_id="64")
+            url_mock.assert_called()
+
+    def test_builds_cache_is_bounded(self):
+        """Only the most recently used build lists should be kept."""
+        with patch("bedrock.firefox.templatetags.helpers._desktop_builds_cache", LRUCache(1)) as cache:
+            desktop_builds("release", None, "de")
+            builds = desktop_builds("release", None, "fr")
+            assert len(cache) == 1
+            with patch("bedrock.firefox.templatetags.helpers.firefox_desktop.get_download_url") as url_mock:
+                assert desktop_builds("release", None, "fr") == builds
+                url_mock.assert_not_called()
+
+    def test_builds_are_copies(self):
+        """Changing a returned build should not change the next ones."""
+        builds = desktop_builds("release", None, "fr", True)
+        builds[0]["os_pretty"] = "Dude OS"
+        assert desktop_builds("release", None, "fr", True)[0]["os_pretty"] != "Dude OS"
+
+    def test_builds_are_appended(self):
+        builds = desktop_builds("beta", [{"os": "android"}], "en-US")
+        assert builds[0] == {"os": "android"}
+        assert len(builds) == len(desktop_builds("beta", None, "en-US")) + 1
+
+
 class TestDownloadThanksButton(TestCase):
     def get_l10n(self, locale):
         return fluent_l10n([locale, "en"], settings.FLUENT_DEFAULT_FILES)
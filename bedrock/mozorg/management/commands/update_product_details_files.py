@@ -2,6 +2,7 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
+import json
 from datetime import datetime
 
 from django.conf import settings
@@ -10,6 +11,7 @@ from django.db import transaction
 
 from product_details.storage import PDDatabaseStorage, PDFileStorage
 
+from bedrock.mozorg.models import ProductDetailsSnapshot
 from bedrock.utils.git import GitRepo
 from bedrock.utils.management.decorators import alert_sentry_on_exception
 
@@ -57,7 +59,7 @@ class Command(BaseCommand):
         if not options["quiet"]:
             print("Product Details data is valid")
 
-        if not settings.PROD_DETAILS_STORAGE.endswith("PDDatabaseStorage"):
+        if not settings.PROD_DETAILS_STORAGE.endswith(("PDDatabaseStorage", "PDSnapshotStorage")):
             # no need to continue if not using DB backend
             return
 
@@ -80,6 +82,23 @@ class Command(BaseCommand):
 
             self.db_storage.update("/", "", self.last_modified)
             self.db_storage.update("regions/", "", self.last_modified)
+            self.save_snapshot()
+            if not options["quiet"]:
+                print("Saved the product-details snapshot")
+
+    def save_snapshot(self):
+        """Save the parsed data of every file so that processes don't need to parse JSON."""
+        files = {}
+        for filename in self.file_storage.all_json_files():
+            if filename.startswith("l10n/"):
+                continue
+
+            try:
+                files[filename] = json.loads(self.file_storage.content(filename))
+            except ValueError:
+                continue
+
+        ProductDetailsSnapshot.objects.save_snapshot(self.repo.current_hash or self.last_modified, files)
 
     def update_file_data(self):
         self.repo.update()
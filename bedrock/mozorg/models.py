@@ -2,6 +2,8 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
+import pickle
+
 from django.conf import settings
 from django.db import models, transaction
 
@@ -55,3 +57,30 @@ class WebvisionDoc(models.Model):
 
     def __str__(self):
         return self.name
+
+
+class ProductDetailsSnapshotManager(models.Manager):
+    def save_snapshot(self, revision, files):
+        """Replace the snapshot with the parsed data of `files`, a dict of JSON data by file name."""
+        with transaction.atomic(using=self.db):
+            self.all().delete()
+            return self.create(revision=revision, data=pickle.dumps(files, protocol=pickle.HIGHEST_PROTOCOL))
+
+    def current_revision(self):
+        return self.values_list("revision", flat=True).first()
+
+
+class ProductDetailsSnapshot(models.Model):
+    """The parsed data of all of the product-details JSON files at a revision of the repo."""
+
+    revision = models.CharField(max_length=100)
+    data = models.BinaryField()
+
+    objects = ProductDetailsSnapshotManager()
+
+    def __str__(self):
+        return self.revision
+
+    @property
+    def files(self):
+        return pickle.loads(self.data)
@@ -0,0 +1,101 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+from threading import Lock
+from time import monotonic
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import DatabaseError
+from django.dispatch import receiver
+
+from product_details.storage import PDDatabaseStorage
+
+
+class SnapshotCache:
+    """
+    The product-details snapshot for this process.
+
+    The revision in the database is checked at most once every
+    `PROD_DETAILS_SNAPSHOT_CHECK_INTERVAL` seconds, and the snapshot is only
+    loaded again when it changes.
+    """
+
+    def __init__(self):
+        self.lock = Lock()
+        self.reset()
+
+    def reset(self):
+        self.revision = None
+        self.files = None
+        self.checked = None
+
+    def load(self):
+        # the storage is created while the apps are loading, so the model is imported when needed
+        from bedrock.mozorg.models import ProductDetailsSnapshot
+
+        try:
+            snapshot = ProductDetailsSnapshot.objects.first()
+        except DatabaseError:
+            snapshot = None
+
+        if snapshot is None:
+            self.revision = self.files = None
+        else:
+            self.revision = snapshot.revision
+            self.files = snapshot.files
+
+    def get(self):
+        """Return the JSON data of the product-details files by name, or None if there is no snapshot."""
+        from bedrock.mozorg.models import ProductDetailsSnapshot
+
+        now = monotonic()
+        with self.lock:
+            if self.checked is None or now - self.checked >= settings.PROD_DETAILS_SNAPSHOT_CHECK_INTERVAL:
+                self.checked = now
+                try:
+                    revision = ProductDetailsSnapshot.objects.current_revision()
+                except DatabaseError:
+                    revision = None
+
+                if revision is None:
+                    self.revision = self.files = None
+                elif revision != self.revision:
+                    self.load()
+
+            return self.files
+
+
+snapshot = SnapshotCache()
+
+
+def load_product_details_snapshot():
+    """Load the snapshot in this process, e.g. as a worker starts."""
+    return snapshot.get() is not None
+
+
+@receiver(setting_changed)
+def reset_snapshot(setting, **kwargs):
+    if setting.startswith("PROD_DETAILS_"):
+        with snapshot.lock:
+            snapshot.reset()
+
+
+class PDSnapshotStorage(PDDatabaseStorage):
+    """
+    Product-details storage that reads the parsed data from the snapshot saved by
+    `update_product_details_files`, so JSON is never parsed while serving requests.
+
+    Falls back to the files in the database if there is no snapshot, or the file
+    isn't in it, like the `l10n/` files.
+    """
+
+    storage_type = "snapshot"
+
+    def data(self, name):
+        files = snapshot.get()
+        if files is None or name not in files:
+            return super().data(name)
+
+        return files[name]
@@ -11,7 +11,6 @@ from os.path import splitext
 from urllib.parse import quote
 
 from django.conf import settings
-from django.contrib.staticfiles.finders import find as find_static
 from django.template.defaultfilters import slugify as django_slugify
 from django.template.defaulttags import CsrfTokenNode
 from django.template.loader import render_to_string
@@ -22,6 +21,7 @@ import jinja2
 from django_jinja import library
 from markupsafe import Markup
 
+from bedrock.base.staticfiles import static_file_exists
 from bedrock.base.templatetags.helpers import static
 from bedrock.firefox.firefox_details import firefox_ios
 
@@ -34,7 +34,7 @@ def _strip_img_prefix(url):
 
 def _l10n_media_exists(type, locale, url):
     """checks if a localized media file exists for the locale"""
-    return find_static(path.join(type, "l10n", locale, url)) is not None
+    return static_file_exists(path.join(type, "l10n", locale, url))
 
 
 def add_string_to_image_url(url, addition):
@@ -174,7 +174,7 @@ def platform_img(ctx, url, optional_attributes=None):
         if is_l10n:
             image = l10n_img_file_name(ctx, _strip_img_prefix(image))
 
-        if find_static(image):
+        if static_file_exists(image):
             key = "data-src-" + platform
             img_attrs[key] = static(image)
 
@@ -197,7 +197,7 @@ class TestVideoTag(TestCase):
 
 
 @override_settings(STATIC_URL="/media/")
-@patch("bedrock.mozorg.templatetags.misc.find_static", return_value=True)
+@patch("bedrock.mozorg.templatetags.misc.static_file_exists", return_value=True)
 class TestPlatformImg(TestCase):
     rf = RequestFactory()
 
@@ -211,7 +211,7 @@ class TestPlatformImg(TestCase):
         req.locale = "en-US"
         return render(f"{{{{ l10n_img('{url}') }}}}", {"request": req})
 
-    def test_platform_img_no_optional_attributes(self, find_static):
+    def test_platform_img_no_optional_attributes(self, static_file_exists):
         """Should return expected markup without optional attributes"""
         markup = self._render("test.png")
         self.assertIn('data-src-windows="/media/test-windows.png"', markup)
@@ -220,12 +220,12 @@ class TestPlatformImg(TestCase):
         self.assertIn('data-src-windows="/media/img/test-windows.png"', markup)
         self.assertIn('data-src-mac="/media/img/test-mac.png"', markup)
 
-    def test_platform_img_with_optional_attributes(self, find_static):
+    def test_platform_img_with_optional_attributes(self, static_file_exists):
         """Should return expected markup with optional attributes"""
         markup = self._render("test.png", {"data-test-attr": "test"})
         self.assertIn('data-test-attr="test"', markup)
 
-    def test_platform_img_with_high_res(self, find_static):
+    def test_platform_img_with_high_res(self, static_file_exists):
         """Should return expected markup with high resolution image attrs"""
         markup = self._render("test.png", {"high-res": True})
         self.assertIn('data-src-windows-high-res="/media/test-windows-high-res.png"', markup)
@@ -236,7 +236,7 @@ class TestPlatformImg(TestCase):
         self.assertIn('data-src-mac-high-res="/media/img/test-mac-high-res.png"', markup)
         self.assertIn('data-high-res="true"', markup)
 
-    def test_platform_img_with_l10n(self, find_static):
+    def test_platform_img_with_l10n(self, static_file_exists):
         """Should return expected markup with l10n image path"""
         l10n_url_win = self._render_l10n("test-windows.png")
         l10n_url_mac = self._render_l10n("test-mac.png")
@@ -247,7 +247,7 @@ class TestPlatformImg(TestCase):
         self.assertIn('data-src-windows="' + l10n_url_win + '"', markup)
         self.assertIn('data-src-mac="' + l10n_url_mac + '"', markup)
 
-    def test_platform_img_with_l10n_and_optional_attributes(self, find_static):
+    def test_platform_img_with_l10n_and_optional_attributes(self, static_file_exists):
         """
         Should return expected markup with l10n image path and optional
         attributes
@@ -259,7 +259,7 @@ class TestPlatformImg(TestCase):
         self.assertIn('data-src-mac="' + l10n_url_mac + '"', markup)
         self.assertIn('data-test-attr="test"', markup)
 
-    def test_platform_img_with_l10n_and_high_res(self, find_static):
+    def test_platform_img_with_l10n_and_high_res(self, static_file_exists):
         """
         Should return expected markup with l10n image path and high resolution
         attributes
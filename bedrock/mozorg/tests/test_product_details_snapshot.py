@@ -0,0 +1,105 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import json
+import os
+import subprocess
+import sys
+from unittest.mock import patch
+
+from django.conf import settings
+from django.test import override_settings
+
+from product_details.storage import PDFileStorage
+
+from bedrock.mozorg import product_details_snapshot
+from bedrock.mozorg.management.commands import update_product_details_files
+from bedrock.mozorg.models import ProductDetailsSnapshot
+from bedrock.mozorg.tests import TestCase
+
+
+@override_settings(PROD_DETAILS_SNAPSHOT_CHECK_INTERVAL=0)
+class TestPDSnapshotStorage(TestCase):
+    def setUp(self):
+        self.storage = product_details_snapshot.PDSnapshotStorage()
+        product_details_snapshot.snapshot.reset()
+
+    def test_no_snapshot(self):
+        with patch.object(product_details_snapshot.PDDatabaseStorage, "data", return_value={"LATEST": "1.0"}) as data_mock:
+            assert self.storage.data("firefox_versions.json") == {"LATEST": "1.0"}
+
+        data_mock.assert_called_with("firefox_versions.json")
+        assert not product_details_snapshot.load_product_details_snapshot()
+
+    def test_snapshot(self):
+        ProductDetailsSnapshot.objects.save_snapshot("abc", {"firefox_versions.json": {"LATEST": "1.0"}, "regions/en-US.json": {"us": "USA"}})
+        with patch.object(product_details_snapshot.PDDatabaseStorage, "data") as data_mock:
+            assert self.storage.data("firefox_versions.json") == {"LATEST": "1.0"}
+            assert self.storage.data("regions/en-US.json") == {"us": "USA"}
+
+        data_mock.assert_not_called()
+        assert product_details_snapshot.load_product_details_snapshot()
+
+    def test_file_not_in_snapshot(self):
+        ProductDetailsSnapshot.objects.save_snapshot("abc", {"firefox_versions.json": {"LATEST": "1.0"}})
+        with patch.object(product_details_snapshot.PDDatabaseStorage, "data", return_value={"de": {}}) as data_mock:
+            assert self.storage.data("l10n/de.json") == {"de": {}}
+
+        data_mock.assert_called_once_with("l10n/de.json")
+
+    def test_new_snapshot(self):
+        ProductDetailsSnapshot.objects.save_snapshot("abc", {"firefox_versions.json": {"LATEST": "1.0"}})
+        assert self.storage.data("firefox_versions.json") == {"LATEST": "1.0"}
+        ProductDetailsSnapshot.objects.save_snapshot("def", {"firefox_versions.json": {"LATEST": "2.0"}})
+        with override_settings(PROD_DETAILS_SNAPSHOT_CHECK_INTERVAL=300):
+            product_details_snapshot.load_product_details_snapshot()
+            assert self.storage.data("firefox_versions.json") == {"LATEST": "2.0"}
+            # the revision isn't checked again until the interval has passed
+            ProductDetailsSnapshot.objects.save_snapshot("ghi", {"firefox_versions.json": {"LATEST": "3.0"}})
+            assert self.storage.data("firefox_versions.json") == {"LATEST": "2.0"}
+
+        assert self.storage.data("firefox_versions.json") == {"LATEST": "3.0"}
+
+    def test_snapshot_loaded_once_per_revision(self):
+        ProductDetailsSnapshot.objects.save_snapshot("abc", {"firefox_versions.json": {"LATEST": "1.0"}})
+        with patch.object(
+            product_details_snapshot.SnapshotCache, "load", autospec=True, side_effect=product_details_snapshot.SnapshotCache.load
+        ) as load_mock:
+            for _ in range(3):
+                assert self.storage.data("firefox_versions.json") == {"LATEST": "1.0"}
+
+        assert load_mock.call_count == 1
+
+
+def test_django_setup_with_snapshot_storage():
+    # product_details creates its storage while the apps are loading, which the test settings avoid
+    env = dict(
+        os.environ,
+        DJANGO_SETTINGS_MODULE="bedrock.settings",
+        PROD_DETAILS_STORAGE="bedrock.mozorg.product_details_snapshot.PDSnapshotStorage",
+    )
+    script = (
+        "import django; django.setup(); "
+        "from django.conf import settings; from django.utils.module_loading import import_string; "
+        "print(import_string(settings.PROD_DETAILS_STORAGE).storage_type)"
+    )
+    result = subprocess.run([sys.executable, "-c", script], cwd=settings.ROOT_PATH, env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip().endswith("snapshot")
+
+
+class TestSaveSnapshot(TestCase):
+    def test_save_snapshot(self):
+        command = update_product_details_files.Command()
+        command.file_storage = PDFileStorage()
+        with patch.object(command, "repo") as repo_mock:
+            repo_mock.current_hash = "abc123"
+            command.save_snapshot()
+
+        snapshot = ProductDetailsSnapshot.objects.get()
+        assert snapshot.revision == "abc123"
+        files = snapshot.files
+        assert files["firefox_versions.json"] == json.loads(command.file_storage.content("firefox_versions.json"))
+        assert files["regions/en-US.json"] == json.loads(command.file_storage.content("regions/en-US.json"))
+        assert not any(filename.startswith("l10n/") for filename in files)
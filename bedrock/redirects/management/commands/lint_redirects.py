@@ -0,0 +1,358 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import itertools
+import json
+import re
+import sys
+from importlib import import_module
+from importlib.util import module_from_spec, spec_from_file_location
+from time import perf_counter
+from urllib.parse import unquote, urlparse
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory
+
+from bedrock.redirects.util import (
+    LOCALE_RE,
+    LOCALE_SEGMENT_RE,
+    CompiledRedirectResolver,
+    get_resolver,
+    literal_prefix,
+    redirectpatterns,
+)
+
+try:
+    from re import _parser as sre_parse
+except ImportError:
+    import sre_parse
+
+# the largest number of alternative example paths generated for one pattern
+MAX_EXAMPLES = 32
+URL_MAPS_PACKAGE = "_redirect_url_maps"
+# the request line in a common or combined format access log
+ACCESS_LOG_RE = re.compile(r'"[A-Z]+ (?P<path>\S+) HTTP/[\d.]+"')
+CATEGORY_EXAMPLES = {
+    sre_parse.CATEGORY_DIGIT: "0",
+    sre_parse.CATEGORY_NOT_DIGIT: "a",
+    sre_parse.CATEGORY_WORD: "a",
+    sre_parse.CATEGORY_NOT_WORD: "-",
+    sre_parse.CATEGORY_SPACE: " ",
+    sre_parse.CATEGORY_NOT_SPACE: "a",
+}
+
+
+class UnsupportedRegex(Exception):
+    pass
+
+
+def _example_char(items):
+    """Return a character from a parsed character class."""
+    for op, av in items:
+        if op is sre_parse.LITERAL:
+            return chr(av)
+        if op is sre_parse.RANGE:
+            return chr(av[0])
+        if op is sre_parse.CATEGORY and av in CATEGORY_EXAMPLES:
+            return CATEGORY_EXAMPLES[av]
+    raise UnsupportedRegex
+
+
+def _examples(parsed):
+    """Return a list of short strings for a parsed regex, one for each combination of alternatives."""
+    examples = [""]
+    for op, av in parsed:
+        if op is sre_parse.LITERAL:
+            options = [chr(av)]
+        elif op is sre_parse.NOT_LITERAL:
+            options = ["b" if chr(av) == "a" else "a"]
+        elif op is sre_parse.ANY:
+            options = ["a"]
+        elif op is sre_parse.IN:
+            options = [_example_char(av)]
+        elif op is sre_parse.CATEGORY and av in CATEGORY_EXAMPLES:
+            options = [CATEGORY_EXAMPLES[av]]
+        elif op is sre_parse.AT:
+            options = [""]
+        elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT):
+            min_count, _, sub_pattern = av
+            options = [example * min_count for example in _examples(sub_pattern)]
+            if min_count == 0:
+                options = [""]
+        elif op is sre_parse.SUBPATTERN:
+            options = _examples(av[-1])
+        elif op is sre_parse.BRANCH:
+            options = list(itertools.chain.from_iterable(_examples(branch) for branch in av[1]))
+        else:
+            # lookarounds, backreferences, conditionals, ...
+            raise UnsupportedRegex
+
+        examples = [prefix + option for prefix, option in itertools.product(examples, options)][:MAX_EXAMPLES]
+
+    return examples
+
+
+def example_paths(regex):
+    """
+    Return some of the shortest paths that `regex` should match.
+
+    Raises `UnsupportedRegex` for patterns that use constructs that can't be expanded.
+    """
+    try:
+        return _examples(sre_parse.parse(regex))
+    except (re.error, RecursionError):
+        raise UnsupportedRegex
+
+
+def get_url_map_paths():
+    """Return the paths from the URL maps used by the redirect tests in `tests/redirects`."""
+    maps_path = settings.ROOT_PATH.joinpath("tests", "redirects")
+    # load the test package by path since `tests` isn't an importable package name
+    spec = spec_from_file_location(URL_MAPS_PACKAGE, maps_path.joinpath("__init__.py"), submodule_search_locations=[str(maps_path)])
+    package = module_from_spec(spec)
+    sys.modules[URL_MAPS_PACKAGE] = package
+    spec.loader.exec_module(package)
+    paths = []
+    for map_file in sorted(maps_path.glob("map_*.py")):
+        try:
+            module = import_module(f"{URL_MAPS_PACKAGE}.{map_file.stem}")
+        except ImportError as e:
+            raise CommandError(f"Could not import the redirect test URL maps ({e}). Try --access-log instead.")
+
+        for name in ("URLS", "URLS_410"):
+            urls = getattr(module, name, [])
+            paths.extend(url if isinstance(url, str) else url["url"] for url in urls)
+
+    return paths
+
+
+def get_access_log_paths(filename):
+    """Return request paths from an access log, or a file with one path per line."""
+    paths = []
+    with open(filename) as log_file:
+        for line in log_file:
+            match = ACCESS_LOG_RE.search(line)
+            if match:
+                paths.append(match.group("path"))
+            elif line.startswith("/"):
+                paths.append(line.split()[0])
+
+    return paths
+
+
+def percentile(sorted_values, percent):
+    index = round(percent / 100 * (len(sorted_values) - 1))
+    return sorted_values[index]
+
+
+class RedirectsReport:
+    """Offline analysis of a list of redirect patterns."""
+
+    def __init__(self, patterns, locales=None):
+        self.patterns = list(patterns)
+        self.resolver = CompiledRedirectResolver(self.patterns)
+        self.locales = [locale for locale in locales or settings.PROD_LANGUAGES if LOCALE_SEGMENT_RE.fullmatch(f"{locale}/")]
+        self.rf = RequestFactory()
+
+    def describe(self, index):
+        return f"#{index} {self.patterns[index].pattern}"
+
+    def exact_path(self, index):
+        """Return `(path, localized)` if the pattern at `index` only ever matches a single path, else `None`."""
+        regex = str(self.patterns[index].pattern)
+        if regex.startswith(LOCALE_RE):
+            localized = True
+            regex = regex[len(LOCALE_RE) :]
+        elif regex.startswith("^"):
+            localized = False
+            regex = regex[1:]
+        else:
+            return None
+
+        prefix, exact = literal_prefix(regex)
+        return (prefix, localized) if exact else None
+
+    def first_match(self, path):
+        """Return the index of the rule that `path` resolves to, or `None`."""
+        match = self.resolver.match(path)
+        return None if match is None else match[0]
+
+    def matched_by(self, path, index):
+        return self.first_match(path) == index
+
+    def matched_before(self, path, index):
+        first = self.first_match(path)
+        return first is not None and first < index
+
+    def localized_paths(self, path):
+        return [f"{locale}/{path}" for locale in self.locales]
+
+    def shadowed(self):
+        """
+        Return `(index, shadowing_index)` for each rule that an earlier rule always matches first.
+
+        Only rules that match a single literal path (optionally after a locale) can be proven to be
+        fully shadowed. All the locales in `self.locales` are checked for localized rules.
+        """
+        shadowed = []
+        for index in range(len(self.patterns)):
+            exact = self.exact_path(index)
+            if exact is None:
+                continue
+
+            path, localized = exact
+            if not self.matched_before(path, index):
+                continue
+
+            if localized and not all(self.matched_before(lpath, index) for lpath in self.localized_paths(path)):
+                continue
+
+            shadowed.append((index, self.first_match(path)))
+
+        return shadowed
+
+    def unreachable(self):
+        """
+        Return `(index, reason)` for each rule that can't match any request path.
+
+        A rule is unreachable if its regex doesn't compile or none of the shortest paths it
+        describes are actually matched by it, e.g. because of a `^` or `$` in the middle of
+        the pattern after the locale prefix was added.
+        """
+        unreachable = []
+        for index, pattern in enumerate(self.patterns):
+            regex = str(pattern.pattern)
+            try:
+                compiled = re.compile(regex)
+            except re.error as e:
+                unreachable.append((index, f"invalid regex: {e}"))
+                continue
+
+            try:
+                paths = example_paths(regex)
+            except UnsupportedRegex:
+                continue
+
+            if not any(compiled.search(path) for path in paths):
+                unreachable.append((index, "the pattern can never match"))
+
+        return unreachable
+
+    def timings(self, paths, resolver=None, iterations=1):
+        """Return the sorted resolution times in microseconds of `paths` with `resolver`."""
+        resolver = resolver or self.resolver
+        results = []
+        for _ in range(iterations):
+            for path in paths:
+                start = perf_counter()
+                try:
+                    resolver.resolve(path)
+                except Exception:
+                    pass
+                results.append((perf_counter() - start) * 1_000_000)
+
+        return sorted(results)
+
+    def response(self, path, query=None):
+        """Return the response of the rule matching `path`, as the middleware would."""
+        _, sub_match = self.resolver.match(path)
+        request = self.rf.get(f"/{path}", query, HTTP_HOST="www.mozilla.org")
+        return sub_match.func(request, *sub_match.args, **sub_match.kwargs)
+
+    def static_entry(self, index):
+        """Return the static table entry for the rule at `index`, or `None` if it can't be served statically."""
+        exact = self.exact_path(index)
+        if exact is None or not getattr(self.patterns[index].callback, "redirect_static", False):
+            return None
+
+        path, localized = exact
+        if not self.matched_by(path, index):
+            return None
+
+        response = self.response(path)
+        if response is None:
+            return None
+
+        entry = {"path": f"/{path}", "status": response.status_code}
+        if "Cache-Control" in response:
+            entry["cache_control"] = response["Cache-Control"]
+        if "Location" in response:
+            entry["location"] = response["Location"]
+            # whether the request's query string is passed on to the new location
+            entry["preserve_query"] = "dude=abides" in self.response(path, {"dude": "abides"})["Location"]
+
+            localized_paths = self.localized_paths(path)
+            if localized and localized_paths and all(self.matched_by(lpath, index) for lpath in localized_paths):
+                locale = self.locales[0]
+                location = self.response(localized_paths[0])["Location"]
+                entry["localized_location"] = location.replace(f"/{locale}/", "/{locale}/", 1)
+
+        return entry
+
+    def static_table(self):
+        entries = []
+        for index in range(len(self.patterns)):
+            entry = self.static_entry(index)
+            if entry is not None:
+                entries.append(entry)
+
+        return {"locales": self.locales, "redirects": entries}
+
+
+class Command(BaseCommand):
+    help = "Report shadowed and unreachable redirects, time redirect resolution and export the static redirects"
+
+    def add_arguments(self, parser):
+        parser.add_argument("-b", "--benchmark", action="store_true", help="Time the resolution of a corpus of paths.")
+        parser.add_argument("-l", "--access-log", help="Use the paths from this access log for --benchmark instead of the redirect test maps.")
+        parser.add_argument("-i", "--iterations", type=int, default=3, help="Number of times to resolve each path for --benchmark.")
+        parser.add_argument("-e", "--export", help="Write the redirects that can be served statically to this JSON file.")
+        parser.add_argument("-s", "--strict", action="store_true", help="Exit with an error if any shadowed or unreachable redirects are found.")
+
+    def handle(self, *args, **options):
+        report = RedirectsReport(redirectpatterns)
+        self.stdout.write(f"Checking {len(report.patterns)} redirects")
+
+        problems = 0
+        shadowed = report.shadowed()
+        self.stdout.write(f"\nFound {len(shadowed)} shadowed redirect(s)")
+        for index, first in shadowed:
+            self.stdout.write(f"- {report.describe(index)} is always matched by {report.describe(first)}")
+        problems += len(shadowed)
+
+        unreachable = report.unreachable()
+        self.stdout.write(f"\nFound {len(unreachable)} unreachable redirect(s)")
+        for index, reason in unreachable:
+            self.stdout.write(f"- {report.describe(index)}: {reason}")
+        problems += len(unreachable)
+
+        if options["benchmark"]:
+            self.benchmark(report, options)
+
+        if options["export"]:
+            table = report.static_table()
+            with open(options["export"], "w") as export_file:
+                json.dump(table, export_file, indent=2, sort_keys=True)
+            self.stdout.write(f"\nWrote {len(table['redirects'])} static redirect(s) to {options['export']}")
+
+        if problems and options["strict"]:
+            raise CommandError(f"Found {problems} problem(s) with the redirects")
+
+    def benchmark(self, report, options):
+        if options["access_log"]:
+            urls = get_access_log_paths(options["access_log"])
+        else:
+            urls = get_url_map_paths()
+
+        paths = [unquote(urlparse(url).path) for url in urls]
+        if not paths:
+            raise CommandError("No paths found to benchmark")
+
+        self.stdout.write(f"\nResolving {len(paths)} path(s) {options['iterations']} time(s)")
+        for name, resolver in (("compiled", report.resolver), ("linear", get_resolver(report.patterns))):
+            timings = report.timings(paths, resolver, options["iterations"])
+            p50 = percentile(timings, 50)
+            p99 = percentile(timings, 99)
+            self.stdout.write(f"- {name}: p50 {p50:.1f}µs, p99 {p99:.1f}µs")
@@ -2,15 +2,35 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
+from django.conf import settings
 from django.urls import Resolver404
 
-from .util import get_resolver
+import commonware.log
+
+from bedrock.base.cache import LRUCache
+
+from .util import get_compiled_resolver
+
+log = commonware.log.getLogger("redirects.middleware")
+
+# marks a path that has not been resolved yet, since `None` is cached for "no redirect"
+NOT_CACHED = object()
 
 
 class RedirectsMiddleware:
-    def __init__(self, get_response=None, resolver=None):
+    def __init__(self, get_response=None, resolver=None, cache_size=None, stats_interval=None):
         self.get_response = get_response
-        self.resolver = resolver or get_resolver()
+        self.resolver = resolver or get_compiled_resolver()
+        if cache_size is None:
+            cache_size = settings.REDIRECTS_CACHE_SIZE
+        # path_info -> ResolverMatch, or None if no redirect applies.
+        # Only the URL resolution is cached, which depends on nothing but the path. The matched
+        # view is still called for every request, so redirects that decide on request headers
+        # (e.g. `ua_redirector()` or `vary`) keep working.
+        self.cache = LRUCache(cache_size)
+        if stats_interval is None:
+            stats_interval = settings.REDIRECTS_CACHE_STATS_INTERVAL
+        self.stats_interval = stats_interval
 
     def __call__(self, request):
         response = self.process_request(request)
@@ -18,10 +38,25 @@ class RedirectsMiddleware:
             return response
         return self.get_response(request)
 
+    def resolve(self, path):
+        resolver_match = self.cache.get(path, NOT_CACHED)
+        if resolver_match is NOT_CACHED:
+            try:
+                resolver_match = self.resolver.resolve(path)
+            except Resolver404:
+                resolver_match = None
+            self.cache.set(path, resolver_match)
+        self.log_stats()
+        return resolver_match
+
+    def log_stats(self):
+        """Log the cache stats every `stats_interval` lookups."""
+        if self.stats_interval > 0 and (self.cache.hits + self.cache.misses) % self.stats_interval == 0:
+            log.info(f"Redirects cache stats: {self.cache.stats()}")
+
     def process_request(self, request):
-        try:
-            resolver_match = self.resolver.resolve(request.path_info)
-        except Resolver404:
+        resolver_match = self.resolve(request.path_info)
+        if resolver_match is None:
             return None
         callback, callback_args, callback_kwargs = resolver_match
         request.resolver_match = resolver_match
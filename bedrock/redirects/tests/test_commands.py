@@ -0,0 +1,96 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import json
+from io import StringIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from bedrock.redirects.management.commands.lint_redirects import (
+    RedirectsReport,
+    UnsupportedRegex,
+    example_paths,
+    get_access_log_paths,
+)
+from bedrock.redirects.util import gone, no_redirect, redirect, ua_redirector
+
+patterns = [
+    redirect(r"^dude/abides/$", "/walter/"),
+    redirect(r"^dude(/.*)?$", "/donny/", query={}),
+    redirect(r"^dude/rug/$", "/living-room/"),
+    redirect(r"^donny/$", ua_redirector("bowling", "/alley/", "/in-n-out/")),
+    no_redirect(r"^walter/$"),
+    redirect(r"^walter/$", "/shomer-shabbos/"),
+    gone(r"^the/stranger/$"),
+    redirect(r"^bunny/$/toe/", "/nihilists/"),
+]
+
+
+class TestExamplePaths(TestCase):
+    def test_examples(self):
+        assert example_paths(r"^dude/(abides|bowls)/\d+/?$") == ["dude/abides/0", "dude/bowls/0"]
+
+    def test_unsupported(self):
+        with self.assertRaises(UnsupportedRegex):
+            example_paths(r"^dude/(?!walter)")
+
+
+class TestRedirectsReport(TestCase):
+    def setUp(self):
+        self.report = RedirectsReport(patterns, locales=["de", "en-US"])
+
+    def test_shadowed(self):
+        assert self.report.shadowed() == [(2, 1), (5, 4)]
+
+    def test_unreachable(self):
+        assert self.report.unreachable() == [(7, "the pattern can never match")]
+
+    def test_static_table(self):
+        table = self.report.static_table()
+        assert table["locales"] == ["de", "en-US"]
+        assert table["redirects"] == [
+            {
+                "path": "/dude/abides/",
+                "status": 301,
+                "location": "/walter/",
+                "localized_location": "/{locale}/walter/",
+                "preserve_query": True,
+                "cache_control": "max-age=43200",
+            },
+            {"path": "/the/stranger/", "status": 410},
+        ]
+
+    def test_timings(self):
+        timings = self.report.timings(["/dude/abides/", "/dude/", "/jesus/"], iterations=2)
+        assert len(timings) == 6
+        assert timings == sorted(timings)
+
+
+class TestLintRedirectsCommand(TestCase):
+    def test_strict(self):
+        with patch("bedrock.redirects.management.commands.lint_redirects.redirectpatterns", patterns):
+            with self.assertRaises(CommandError):
+                call_command("lint_redirects", strict=True, stdout=StringIO())
+
+    def test_benchmark_and_export(self):
+        with TemporaryDirectory() as tmpdir:
+            log_file = Path(tmpdir, "access.log")
+            log_file.write_text('127.0.0.1 - - [18/Oct/2026:10:00:00 +0000] "GET /dude/abides/?bowl=true HTTP/1.1" 301 0\n/the/stranger/\n')
+            export_file = Path(tmpdir, "redirects.json")
+            out = StringIO()
+            with patch("bedrock.redirects.management.commands.lint_redirects.redirectpatterns", patterns):
+                call_command("lint_redirects", benchmark=True, access_log=str(log_file), export=str(export_file), stdout=out)
+
+            assert get_access_log_paths(log_file) == ["/dude/abides/?bowl=true", "/the/stranger/"]
+            assert len(json.loads(export_file.read_text())["redirects"]) == 2
+
+        output = out.getvalue()
+        assert "Found 2 shadowed redirect(s)" in output
+        assert "Found 1 unreachable redirect(s)" in output
+        assert "Resolving 2 path(s) 3 time(s)" in output
+        assert "Wrote 2 static redirect(s)" in output
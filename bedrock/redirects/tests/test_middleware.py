@@ -2,11 +2,13 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
+from unittest.mock import patch
+
 from django.test import RequestFactory
 
 from bedrock.mozorg.tests import TestCase
 from bedrock.redirects.middleware import RedirectsMiddleware
-from bedrock.redirects.util import get_resolver, redirect
+from bedrock.redirects.util import get_resolver, redirect, ua_redirector
 
 patterns = [
     redirect(r"^dude/already/10th/", "/far/out/"),
@@ -27,3 +29,48 @@ class TestRedirectsMiddleware(TestCase):
     def test_no_redirect_match(self):
         resp = middleware.process_request(self.rf.get("/donnie/out/element/"))
         self.assertIsNone(resp)
+
+
+class TestRedirectsMiddlewareCache(TestCase):
+    def setUp(self):
+        self.rf = RequestFactory()
+
+    def test_caches_resolution(self):
+        middleware = RedirectsMiddleware(resolver=get_resolver(patterns), cache_size=10)
+        for _ in range(2):
+            resp = middleware.process_request(self.rf.get("/walter/prior/restraint/"))
+            self.assertEqual(resp["location"], "/finishes/coffee/")
+            self.assertIsNone(middleware.process_request(self.rf.get("/donnie/out/element/")))
+
+        self.assertEqual(middleware.cache.stats(), {"hits": 2, "misses": 2, "evictions": 0, "size": 2, "maxsize": 10})
+
+    def test_eviction(self):
+        middleware = RedirectsMiddleware(resolver=get_resolver(patterns), cache_size=1)
+        middleware.process_request(self.rf.get("/walter/prior/restraint/"))
+        middleware.process_request(self.rf.get("/donnie/out/element/"))
+        self.assertEqual(middleware.cache.evictions, 1)
+        self.assertNotIn("/walter/prior/restraint/", middleware.cache)
+
+    @patch("bedrock.redirects.middleware.log")
+    def test_logs_stats(self, log_mock):
+        middleware = RedirectsMiddleware(resolver=get_resolver(patterns), cache_size=10, stats_interval=3)
+        for _ in range(2):
+            middleware.process_request(self.rf.get("/walter/prior/restraint/"))
+        log_mock.info.assert_not_called()
+        middleware.process_request(self.rf.get("/donnie/out/element/"))
+        log_mock.info.assert_called_once_with("Redirects cache stats: {'hits': 1, 'misses': 2, 'evictions': 0, 'size': 2, 'maxsize': 10}")
+
+    @patch("bedrock.redirects.middleware.log")
+    def test_stats_logging_disabled(self, log_mock):
+        middleware = RedirectsMiddleware(resolver=get_resolver(patterns), cache_size=10, stats_interval=0)
+        middleware.process_request(self.rf.get("/walter/prior/restraint/"))
+        log_mock.info.assert_not_called()
+
+    def test_header_redirects_are_evaluated_per_request(self):
+        resolver = get_resolver([redirect(r"^the/dude/$", ua_redirector("bowling", "/alley/", "/rug/"))])
+        middleware = RedirectsMiddleware(resolver=resolver, cache_size=10)
+        resp = middleware.process_request(self.rf.get("/the/dude/", HTTP_USER_AGENT="bowling"))
+        self.assertEqual(resp["location"], "/alley/")
+        resp = middleware.process_request(self.rf.get("/the/dude/", HTTP_USER_AGENT="white russian"))
+        self.assertEqual(resp["location"], "/rug/")
+        self.assertEqual(middleware.cache.hits, 1)
@@ -10,9 +10,11 @@ from django.urls import URLPattern
 
 from bedrock.redirects.middleware import RedirectsMiddleware
 from bedrock.redirects.util import (
+    get_compiled_resolver,
     get_resolver,
     header_redirector,
     is_firefox_redirector,
+    literal_prefix,
     no_redirect,
     platform_redirector,
     redirect,
@@ -133,6 +135,76 @@ class TestNoRedirectUrlPattern(TestCase):
         assert resp["Location"] == "/coo/coo/cachoo/"
 
 
+class TestLiteralPrefix(TestCase):
+    def test_exact(self):
+        assert literal_prefix(r"about/manifesto\.html$") == ("about/manifesto.html", True)
+
+    def test_prefix(self):
+        assert literal_prefix(r"firefox/new/(?P<rest>.*)$") == ("firefox/new/", False)
+        assert literal_prefix(r"firefox/new/?$") == ("firefox/new", False)
+        assert literal_prefix(r"firefox/\d+") == ("firefox/", False)
+        assert literal_prefix(r"projects/security") == ("projects/security", False)
+
+    def test_alternation(self):
+        assert literal_prefix(r"firefox/new/$|firefox/all/$") == ("", False)
+        # alternation inside a group only ends the prefix
+        assert literal_prefix(r"firefox/(new|all)/$") == ("firefox/", False)
+        assert literal_prefix(r"firefox/[|]$") == ("firefox/", False)
+
+
+class TestCompiledRedirectResolver(TestCase):
+    def setUp(self):
+        self.rf = RequestFactory()
+
+    def test_first_match_wins(self):
+        """Patterns must be tried in order no matter how they are indexed."""
+        resolver = get_compiled_resolver(
+            [
+                redirect(r"^iam/the/.*/$", "/coo/coo/cachoo/"),
+                redirect(r"^iam/the/walrus/$", "/dammit/donnie/"),
+                redirect(r"^(iam|you)/the/eggman/$", "/goo/goo/gjoob/", locale_prefix=False),
+            ]
+        )
+        middleware = RedirectsMiddleware(resolver=resolver)
+        resp = middleware.process_request(self.rf.get("/iam/the/walrus/"))
+        assert resp["Location"] == "/coo/coo/cachoo/"
+
+        resp = middleware.process_request(self.rf.get("/de/iam/the/walrus/"))
+        assert resp["Location"] == "/de/coo/coo/cachoo/"
+
+        resp = middleware.process_request(self.rf.get("/you/the/eggman/"))
+        assert resp["Location"] == "/goo/goo/gjoob/"
+
+        resp = middleware.process_request(self.rf.get("/de/you/the/eggman/"))
+        self.assertIsNone(resp)
+
+    def test_no_redirect(self):
+        resolver = get_compiled_resolver(
+            [
+                no_redirect(r"^iam/the/walrus/$"),
+                redirect(r"^iam/the/walrus/$", "/coo/coo/cachoo/"),
+            ]
+        )
+        middleware = RedirectsMiddleware(resolver=resolver)
+        self.assertIsNone(middleware.process_request(self.rf.get("/iam/the/walrus/")))
+        self.assertIsNone(middleware.process_request(self.rf.get("/pt-BR/iam/the/walrus/")))
+
+    def test_candidates(self):
+        resolver = get_compiled_resolver(
+            [
+                redirect(r"^iam/the/walrus/$", "/coo/coo/cachoo/"),
+                redirect(r"^iam/the/walrus", "/dammit/donnie/"),
+                redirect(r"^iam/the/walr", "/dammit/donnie/"),
+                redirect(r"^(?P<who>\w+)/the/walrus/$", "/dammit/donnie/"),
+                redirect(r"^iam/the/eggman/$", "/goo/goo/gjoob/"),
+            ]
+        )
+        assert resolver.candidates("iam/the/walrus/") == [0, 1, 2, 3]
+        assert resolver.candidates("en-US/iam/the/walrus/") == [0, 1, 2, 3]
+        assert resolver.candidates("iam/the/eggman/") == [3, 4]
+        assert resolver.candidates("firefox/") == [3]
+
+
 class TestRedirectUrlPattern(TestCase):
     def setUp(self):
         self.rf = RequestFactory()
@@ -11,8 +11,15 @@ from django.http import (
     HttpResponsePermanentRedirect,
     HttpResponseRedirect,
 )
-from django.urls import NoReverseMatch, URLResolver, re_path, reverse
-from django.urls.resolvers import RegexPattern
+from django.urls import (
+    NoReverseMatch,
+    Resolver404,
+    URLPattern,
+    URLResolver,
+    re_path,
+    reverse,
+)
+from django.urls.resolvers import RegexPattern, ResolverMatch
 from django.utils.html import strip_tags
 from django.views.decorators.vary import vary_on_headers
 
@@ -24,6 +31,10 @@ log = commonware.log.getLogger("redirects.util")
 LOCALE_RE = r"^(?P<locale>\w{2,3}(?:-\w{2})?/)?"
 HTTP_RE = re.compile(r"^https?://", re.IGNORECASE)
 PROTOCOL_RELATIVE_RE = re.compile(r"^//+")
+# matches the optional locale segment that LOCALE_RE would capture
+LOCALE_SEGMENT_RE = re.compile(r"\w{2,3}(?:-\w{2})?/")
+REGEX_META_CHARS = frozenset(".^$*+?{}[]()|\\")
+REGEX_QUANTIFIERS = ("*", "+", "?", "{")
 # redirects registry
 redirectpatterns = []
 
@@ -37,6 +48,224 @@ def get_resolver(patterns=None):
     return URLResolver(RegexPattern(r"^/"), patterns)
 
 
+def _has_top_level_alternation(regex):
+    """Return True if `regex` contains a `|` outside of any group or character class."""
+    depth = 0
+    in_class = False
+    i = 0
+    while i < len(regex):
+        char = regex[i]
+        if char == "\\":
+            i += 2
+            continue
+        if in_class:
+            if char == "]":
+                in_class = False
+        elif char == "[":
+            in_class = True
+            # a `]` right after `[` or `[^` is a literal member of the class
+            if regex[i + 1 : i + 2] == "^":
+                i += 1
+            if regex[i + 1 : i + 2] == "]":
+                i += 1
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "|" and depth == 0:
+            return True
+        i += 1
+    return False
+
+
+def literal_prefix(regex):
+    """
+    Return the fixed string that every match of the anchored `regex` must start with.
+
+    The regex should already have its leading `^` removed. Returns a tuple of
+    `(prefix, exact)` where `exact` is True if the regex can only ever match `prefix`
+    itself. The analysis is conservative: anything it doesn't understand ends the prefix.
+    """
+    if _has_top_level_alternation(regex):
+        return "", False
+
+    prefix = []
+    i = 0
+    while i < len(regex):
+        char = regex[i]
+        if char == "\\":
+            escaped = regex[i + 1 : i + 2]
+            # \d, \w, \1, etc. are not literals
+            if not escaped or escaped.isalnum() or escaped == "_":
+                break
+            literal = escaped
+            step = 2
+        elif char in REGEX_META_CHARS:
+            if char == "$" and i == len(regex) - 1:
+                return "".join(prefix), True
+            break
+        else:
+            literal = char
+            step = 1
+
+        # a quantified character is not fixed
+        if regex[i + step : i + step + 1] in REGEX_QUANTIFIERS:
+            break
+
+        prefix.append(literal)
+        i += step
+
+    return "".join(prefix), False
+
+
+class _TrieNode:
+    __slots__ = ("children", "indexes", "partial")
+
+    def __init__(self):
+        # full path segment -> child node
+        self.children = {}
+        # patterns whose literal prefix ends with a `/` at this node
+        self.indexes = []
+        # start of the next path segment -> patterns whose literal prefix ends there
+        self.partial = defaultdict(list)
+
+
+class CompiledRedirectResolver:
+    """
+    Drop-in replacement for the `URLResolver` returned by `get_resolver()`.
+
+    Patterns are indexed once at startup so that a lookup only tries the patterns
+    that could possibly match the path:
+
+    * patterns matching a single literal path go into a hash map,
+    * patterns with a fixed leading path go into a segment trie,
+    * everything else is tried on every lookup.
+
+    Candidates are always tried in their original registration order with the
+    pattern's own `resolve()`, so first-match semantics, captured kwargs and
+    `no_redirect()` short-circuits are exactly those of the linear resolver.
+    """
+
+    def __init__(self, patterns=None):
+        self.url_patterns = list(patterns or redirectpatterns)
+        # each index has a "plain" version for patterns anchored at the start of the path
+        # and a "localized" version for patterns that also accept an optional locale prefix.
+        self.exact = {False: defaultdict(list), True: defaultdict(list)}
+        self.trie = {False: _TrieNode(), True: _TrieNode()}
+        self.dynamic = []
+        for index, pattern in enumerate(self.url_patterns):
+            self._add_pattern(index, pattern)
+
+    def _add_pattern(self, index, pattern):
+        if not (isinstance(pattern, URLPattern) and isinstance(pattern.pattern, RegexPattern)):
+            self.dynamic.append(index)
+            return
+
+        regex = str(pattern.pattern)
+        if regex.startswith(LOCALE_RE):
+            localized = True
+            regex = regex[len(LOCALE_RE) :]
+        elif regex.startswith("^"):
+            localized = False
+            regex = regex[1:]
+        else:
+            self.dynamic.append(index)
+            return
+
+        prefix, exact = literal_prefix(regex)
+        if exact:
+            self.exact[localized][prefix].append(index)
+            return
+
+        if not prefix:
+            self.dynamic.append(index)
+            return
+
+        *segments, partial = prefix.split("/")
+        node = self.trie[localized]
+        for segment in segments:
+            node = node.children.setdefault(segment, _TrieNode())
+        if partial:
+            node.partial[partial].append(index)
+        else:
+            node.indexes.append(index)
+
+    def _walk_trie(self, node, path, candidates):
+        *segments, last_segment = path.split("/")
+        for segment in segments:
+            self._lookup_partial(node, segment, candidates)
+            node = node.children.get(segment)
+            if node is None:
+                return
+            candidates.update(node.indexes)
+        self._lookup_partial(node, last_segment, candidates)
+
+    def _lookup_partial(self, node, segment, candidates):
+        if node.partial:
+            for end in range(1, len(segment) + 1):
+                candidates.update(node.partial.get(segment[:end], ()))
+
+    def _lookup_exact(self, exact, path, candidates):
+        candidates.update(exact.get(path, ()))
+        # `$` also matches just before a trailing newline
+        if path.endswith("\n"):
+            candidates.update(exact.get(path[:-1], ()))
+
+    def candidates(self, path):
+        """Return the indexes of the patterns that could match `path`, in order."""
+        candidates = set(self.dynamic)
+        paths = {False: [path], True: [path]}
+        locale_match = LOCALE_SEGMENT_RE.match(path)
+        if locale_match:
+            paths[True].append(path[locale_match.end() :])
+
+        for localized, localized_paths in paths.items():
+            for lookup_path in localized_paths:
+                self._lookup_exact(self.exact[localized], lookup_path, candidates)
+                self._walk_trie(self.trie[localized], lookup_path, candidates)
+
+        return sorted(candidates)
+
+    def match(self, path):
+        """
+        Return `(index, sub_match)` for the first pattern matching `path`, or `None`.
+
+        `path` is relative to the resolver, i.e. without the leading slash.
+        """
+        for index in self.candidates(path):
+            try:
+                sub_match = self.url_patterns[index].resolve(path)
+            except Resolver404:
+                continue
+            if sub_match:
+                return index, sub_match
+
+        return None
+
+    def resolve(self, path):
+        path = str(path)
+        if not path.startswith("/"):
+            raise Resolver404({"path": path})
+
+        new_path = path[1:]
+        match = self.match(new_path)
+        if match is None:
+            raise Resolver404({"path": new_path})
+
+        sub_match = match[1]
+        return ResolverMatch(
+            sub_match.func,
+            sub_match.args,
+            sub_match.kwargs,
+            sub_match.url_name,
+            route=sub_match.route,
+        )
+
+
+def get_compiled_resolver(patterns=None):
+    return CompiledRedirectResolver(patterns)
+
+
 def header_redirector(header_name, regex, match_dest, nomatch_dest, case_sensitive=False):
     flags = 0 if case_sensitive else re.IGNORECASE
     regex_obj = re.compile(regex, flags)
@@ -260,6 +489,9 @@ def redirect(
     except TypeError:
         log.exception("decorators not iterable or does not contain callable items")
 
+    # whether the response only depends on the matched path, i.e. it could be served from a static table
+    _view.redirect_static = not (callable(to) or vary or decorators or merge_query)
+
     return re_path(pattern, _view, name=name)
 
 
@@ -267,6 +499,9 @@ def gone_view(request, *args, **kwargs):
     return HttpResponseGone()
 
 
+gone_view.redirect_static = True
+
+
 def gone(pattern):
     """Return a url matcher suitable for urlpatterns that returns a 410."""
     return re_path(pattern, gone_view)
@@ -2,6 +2,9 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
+from subprocess import CalledProcessError
+from time import perf_counter
+
 from django.conf import settings
 from django.core.management.base import BaseCommand
 
@@ -10,27 +13,66 @@ from bedrock.utils.git import GitRepo
 from bedrock.utils.management.decorators import alert_sentry_on_exception
 
 
+def release_file_names(filenames):
+    """Return the names of the release files from a list of paths relative to the repo."""
+    return [filename.split("/", 1)[1] for filename in filenames if filename.startswith("releases/") and filename.endswith(".json")]
+
+
 @alert_sentry_on_exception
 class Command(BaseCommand):
     def add_arguments(self, parser):
         parser.add_argument("-q", "--quiet", action="store_true", dest="quiet", default=False, help="If no error occurs, swallow all output."),
-        parser.add_argument("-f", "--force", action="store_true", dest="force", default=False, help="Load the data even if nothing new from git."),
+        parser.add_argument(
+            "-f", "--force", action="store_true", dest="force", default=False, help="Load all of the data even if nothing new from git."
+        ),
 
     def output(self, msg):
         if not self.quiet:
             print(msg)
 
+    def timed(self, phase, func, *args):
+        start = perf_counter()
+        result = func(*args)
+        self.output(f"{phase} took {perf_counter() - start:.2f}s")
+        return result
+
+    def get_changed_files(self, repo):
+        """Return the release files (modified, removed) since the last load, or `None` if everything should be loaded."""
+        db_latest = repo.get_db_latest()
+        if db_latest is None:
+            return None
+
+        # releases loaded before the source file was recorded can't be updated individually
+        if ProductRelease.objects.get_queryset(include_drafts=True).filter(source_file="").exists():
+            return None
+
+        try:
+            modified, removed = repo.diff(db_latest, repo.current_hash)
+        except CalledProcessError:
+            # e.g. the old commit is no longer in the repo
+            return None
+
+        return release_file_names(modified), release_file_names(removed)
+
     def handle(self, *args, **options):
         self.quiet = options["quiet"]
         repo = GitRepo(settings.RELEASE_NOTES_PATH, settings.RELEASE_NOTES_REPO, branch_name=settings.RELEASE_NOTES_BRANCH, name="Release Notes")
         self.output("Updating git repo")
-        self.output(repo.update())
+        self.output(self.timed("Updating the git repo", repo.update))
         if not (options["force"] or repo.has_changes()):
             self.output("No release note updates")
             return
 
-        self.output("Loading releases into database")
-        count = ProductRelease.objects.refresh()
+        changes = None if options["force"] else self.timed("Finding the changed files", self.get_changed_files, repo)
+        if changes is None:
+            self.output("Loading all releases into database")
+            release_objs = self.timed("Parsing the release files", ProductRelease.objects.load_releases)
+            count = self.timed("Rendering and saving the releases", ProductRelease.objects.save_releases, release_objs)
+        else:
+            modified, removed = changes
+            self.output(f"Loading {len(modified)} modified releases and removing {len(removed)} releases")
+            release_objs = self.timed("Parsing the release files", ProductRelease.objects.load_releases, modified)
+            count = self.timed("Rendering and saving the releases", ProductRelease.objects.save_releases, release_objs, modified + removed)
 
         self.output(f"{count} release notes successfully loaded")
 
@@ -0,0 +1,19 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("releasenotes", "0002_auto_20200122_0957"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="productrelease",
+            name="source_file",
+            field=models.CharField(blank=True, db_index=True, max_length=255),
+        ),
+    ]
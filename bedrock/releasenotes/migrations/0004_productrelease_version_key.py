@@ -0,0 +1,31 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+from django.db import migrations, models
+
+from product_details.version_compare import version_int
+
+
+def set_version_keys(apps, schema_editor):
+    ProductRelease = apps.get_model("releasenotes", "ProductRelease")
+    releases = list(ProductRelease.objects.only("id", "version"))
+    for release in releases:
+        release.version_key = version_int(release.version)
+
+    ProductRelease.objects.bulk_update(releases, ["version_key"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("releasenotes", "0003_productrelease_source_file"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="productrelease",
+            name="version_key",
+            field=models.BigIntegerField(db_index=True, default=0),
+        ),
+        migrations.RunPython(set_version_keys, migrations.RunPython.noop),
+    ]
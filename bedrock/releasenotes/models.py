@@ -6,12 +6,16 @@ import codecs
 import json
 import os
 import xml.etree.ElementTree as etree
+from collections import defaultdict
 from glob import glob
 from operator import attrgetter
+from threading import Lock
 
 from django.conf import settings
 from django.core.cache import caches
+from django.core.signals import setting_changed
 from django.db import models, transaction
+from django.dispatch import receiver
 from django.http import Http404
 from django.utils.dateparse import parse_datetime
 from django.utils.functional import cached_property
@@ -21,10 +25,10 @@ import markdown
 from django_extensions.db.fields.json import JSONField
 from markdown.extensions import Extension
 from markdown.inlinepatterns import InlineProcessor
-from product_details.version_compare import Version
+from product_details.version_compare import Version, version_int
 
 from bedrock.base.urlresolvers import reverse
-from bedrock.releasenotes.utils import memoize
+from bedrock.releasenotes.utils import get_release_data_version
 
 
 class StrikethroughInlineProcessor(InlineProcessor):
@@ -40,7 +44,6 @@ class StrikethroughExtension(Extension):
         md.inlinePatterns.register(StrikethroughInlineProcessor(STRIKETHROUGH_PATTERN, md), "del", 175)
 
 
-LONG_RN_CACHE_TIMEOUT = 7200  # 2 hours
 cache = caches["release-notes"]
 markdowner = markdown.Markdown(
     extensions=[
@@ -96,11 +99,23 @@ def process_markdown(value):
     return bleach.clean(rendered_html, tags=ALLOWED_TAGS, attributes=ALLOWED_ATTRS)
 
 
-def process_notes(notes):
-    notes = [Note(d) for d in notes]
+def process_notes(notes, processors=None):
+    notes = [Note(d, processors) for d in notes]
     return [n for n in notes if n.is_public]
 
 
+def render_notes(notes):
+    """Return the notes with the Markdown of each rendered to sanitized HTML."""
+    rendered = []
+    for note in notes:
+        note = dict(note)
+        if note.get("note"):
+            note["note"] = process_markdown(note["note"])
+        rendered.append(note)
+
+    return {"format": "html", "notes": rendered}
+
+
 def process_is_public(is_public):
     if settings.DEV:
         return True
@@ -119,15 +134,20 @@ FIELD_PROCESSORS = {
     "note": process_markdown,
     "fixed_in_release": process_note_release,
 }
+# for notes that were rendered to HTML when they were saved
+RENDERED_FIELD_PROCESSORS = {key: value for key, value in FIELD_PROCESSORS.items() if key != "note"}
 
 
 class RNModel:
-    def __init__(self, data):
+    def __init__(self, data, processors=None):
+        if processors is None:
+            processors = FIELD_PROCESSORS
+
         for key, value in data.items():
             if not hasattr(self, key):
                 continue
-            if key in FIELD_PROCESSORS:
-                value = FIELD_PROCESSORS[key](value)
+            if key in processors:
+                value = processors[key](value)
             setattr(self, key, value)
 
 
@@ -154,13 +174,30 @@ class MarkdownField(models.TextField):
 
 
 class NotesField(JSONField):
-    """Field that returns a list of Note objects instead of dicts"""
+    """Field that returns a list of Note objects instead of dicts
+
+    The Markdown of the notes is rendered to HTML when they're saved so that
+    reading them only needs to load the JSON.
+    """
+
+    def pre_save(self, model_instance, add):
+        value = super().pre_save(model_instance, add)
+        if isinstance(value, list):
+            value = render_notes(value)
+            setattr(model_instance, self.attname, value)
+
+        return value
 
     def from_db_value(self, value, expression, connection):
         if not value:
             return value
 
-        return process_notes(self.to_python(value))
+        value = self.to_python(value)
+        if isinstance(value, dict) and value.get("format") == "html":
+            return process_notes(value["notes"], RENDERED_FIELD_PROCESSORS)
+
+        # saved before the notes were rendered on save
+        return process_notes(value)
 
 
 class ProductReleaseQuerySet(models.QuerySet):
@@ -188,30 +225,59 @@ class ProductReleaseManager(models.Manager):
     def product(self, product_name, channel_name=None, version=None, include_drafts=False):
         return self.get_queryset(include_drafts).product(product_name, channel_name, version)
 
-    def refresh(self):
-        release_objs = []
+    def load_release_file(self, release_file):
+        with codecs.open(release_file, "r", encoding="utf-8") as rel_fh:
+            data = json.load(rel_fh)
+
+        # doing this to simplify queries for Firefox since it is always
+        # looked up with product=Firefox and relies on the version number
+        # and channel to determine ESR.
+        if data["product"] == "Firefox Extended Support Release":
+            data["product"] = "Firefox"
+            data["channel"] = "ESR"
+        # make all releases public on non-production environments
+        if settings.DEV:
+            data["is_public"] = True
+
+        data["source_file"] = os.path.basename(release_file)
+        data["version_key"] = version_int(data["version"])
+        return ProductRelease(**data)
+
+    def load_releases(self, filenames=None):
+        """Return unsaved releases for the given release file names, or for all of the release files."""
         rn_path = os.path.join(settings.RELEASE_NOTES_PATH, "releases")
-        with transaction.atomic(using=self.db):
-            self.get_queryset(include_drafts=True).delete()
-            releases = glob(os.path.join(rn_path, "*.json"))
-            for release_file in releases:
-                with codecs.open(release_file, "r", encoding="utf-8") as rel_fh:
-                    data = json.load(rel_fh)
-                    # doing this to simplify queries for Firefox since it is always
-                    # looked up with product=Firefox and relies on the version number
-                    # and channel to determine ESR.
-                    if data["product"] == "Firefox Extended Support Release":
-                        data["product"] = "Firefox"
-                        data["channel"] = "ESR"
-                    # make all releases public on non-production environments
-                    if settings.DEV:
-                        data["is_public"] = True
-                    release_objs.append(ProductRelease(**data))
+        if filenames is None:
+            release_files = glob(os.path.join(rn_path, "*.json"))
+        else:
+            release_files = [os.path.join(rn_path, filename) for filename in filenames]
+
+        return [self.load_release_file(release_file) for release_file in release_files]
 
+    def save_releases(self, release_objs, replaced_files=None):
+        """Save the releases, replacing the releases loaded from `replaced_files` or all of them if it's `None`."""
+        with transaction.atomic(using=self.db):
+            qs = self.get_queryset(include_drafts=True)
+            if replaced_files is not None:
+                qs = qs.filter(source_file__in=replaced_files)
+            qs.delete()
             self.bulk_create(release_objs)
 
+        release_index.reset()
         return len(release_objs)
 
+    def refresh(self, modified_files=None, removed_files=None):
+        """Load the release files into the database.
+
+        Replaces all of the releases, or only those from the modified and removed
+        release file names if either are given.
+        """
+        if modified_files is None and removed_files is None:
+            return self.save_releases(self.load_releases())
+
+        modified_files = list(modified_files or [])
+        replaced_files = modified_files + list(removed_files or [])
+        return self.save_releases(self.load_releases(modified_files), replaced_files)
+
 
 class ProductRelease(models.Model):
     CHANNELS = ("Nightly", "Aurora", "Beta", "Release", "ESR")
@@ -231,6 +297,10 @@ class ProductRelease(models.Model):
     created = models.DateTimeField()
     modified = models.DateTimeField()
     notes = NotesField(blank=True)
+    # the name of the file in the release notes repo this release was loaded from
+    source_file = models.CharField(max_length=255, blank=True, db_index=True)
+    # the version encoded as an integer by `version_int` so it can be sorted and filtered in SQL
+    version_key = models.BigIntegerField(default=0, db_index=True)
 
     objects = ProductReleaseManager()
 
@@ -240,6 +310,10 @@ class ProductRelease(models.Model):
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        self.version_key = version_int(self.version)
+        super().save(*args, **kwargs)
+
     @cached_property
     def major_version(self):
         return str(self.version_obj.major)
@@ -295,9 +369,10 @@ class ProductRelease(models.Model):
         channel and major version with the highest minor version,
         or None if no such releases exist
         """
-        releases = ProductRelease.objects.product(product, self.channel).filter(version__startswith=f"{self.major_version}.")
+        prefix = f"{self.major_version}."
+        releases = [release for release in get_release_index().releases(product, self.channel) if release.version.startswith(prefix)]
         if releases:
-            return sorted(releases, reverse=True, key=attrgetter("version_obj"))[0]
+            return max(releases, key=attrgetter("version_key"))
 
         return None
 
@@ -310,16 +385,87 @@ class ProductRelease(models.Model):
             return self.equivalent_release_for_product("Firefox")
 
 
-@memoize(LONG_RN_CACHE_TIMEOUT)
+def _index_key(product, channel):
+    product = product.lower()
+    channel = channel.lower()
+    if product == "firefox extended support release":
+        product = "firefox"
+        channel = "esr"
+
+    return product, channel
+
+
+class ReleaseIndex:
+    """All of the releases, loaded from the database and looked up in memory."""
+
+    def __init__(self, releases, version=None):
+        self.version = version
+        self.by_version = {}
+        self.by_channel = defaultdict(list)
+        # releases are ordered newest first
+        for release in releases:
+            key = _index_key(release.product, release.channel)
+            self.by_version.setdefault(key + (release.version,), release)
+            self.by_channel[key].append(release)
+
+    @staticmethod
+    def is_visible(release, include_drafts=False):
+        return include_drafts or settings.DEV or release.is_public
+
+    def get(self, product, channel, version, include_drafts=False):
+        release = self.by_version.get(_index_key(product, channel) + (version,))
+        if release is not None and self.is_visible(release, include_drafts):
+            return release
+
+        return None
+
+    def releases(self, product, channel, include_drafts=False):
+        """Return the releases for a product and channel, newest first."""
+        return [release for release in self.by_channel.get(_index_key(product, channel), []) if self.is_visible(release, include_drafts)]
+
+
+class ReleaseIndexCache:
+    """The `ReleaseIndex` for this process, rebuilt when the release data changes."""
+
+    def __init__(self):
+        self.lock = Lock()
+        self.index = None
+
+    def reset(self):
+        with self.lock:
+            self.index = None
+
+    def get(self):
+        version = get_release_data_version()
+        with self.lock:
+            if self.index is None or self.index.version != version:
+                self.index = ReleaseIndex(ProductRelease.objects.get_queryset(include_drafts=True), version)
+
+            return self.index
+
+
+release_index = ReleaseIndexCache()
+
+
+def get_release_index():
+    return release_index.get()
+
+
+@receiver(setting_changed)
+def reset_release_index(setting, **kwargs):
+    if setting in ("DEV", "RELEASE_NOTES_PATH"):
+        release_index.reset()
+
+
 def get_release(product, version, channel=None, include_drafts=False):
+    index = get_release_index()
     channels = [channel] if channel else ProductRelease.CHANNELS
     if product.lower() == "firefox extended support release":
         channels = ["esr"]
     for channel in channels:
-        try:
-            return ProductRelease.objects.product(product, channel, version, include_drafts).get()
-        except ProductRelease.DoesNotExist:
-            continue
+        release = index.get(product, channel, version, include_drafts)
+        if release is not None:
+            return release
 
     return None
 
@@ -332,9 +478,8 @@ def get_release_or_404(version, product, include_drafts=False):
     return release
 
 
-@memoize(LONG_RN_CACHE_TIMEOUT)
 def get_releases(product, channel, num_results=10):
-    return ProductRelease.objects.product(product, channel)[:num_results]
+    return get_release_index().releases(product, channel)[:num_results]
 
 
 def get_releases_or_404(product, channel, num_results=10):
@@ -345,14 +490,9 @@ def get_releases_or_404(product, channel, num_results=10):
     raise Http404
 
 
-@memoize(LONG_RN_CACHE_TIMEOUT)
 def get_latest_release(product, channel="release"):
-    try:
-        release = ProductRelease.objects.product(product, channel)[0]
-    except IndexError:
-        release = None
-
-    return release
+    releases = get_release_index().releases(product, channel)
+    return releases[0] if releases else None
 
 
 def get_latest_release_or_404(product, channel):
@@ -71,3 +71,30 @@ class TestReleaseMemoizer(TestCase):
         assert counter.call_count == 3
         # version should have been called 4 times
         assert gdv_cache.call_count == 4
+
+
+class TestGetReleaseDataVersion(TestCase):
+    def setUp(self):
+        release_cache.clear()
+
+    @patch.object(utils, "get_data_version")
+    @patch.object(utils, "get_db_file_version", return_value=(1234, 5678))
+    def test_db_file_version(self, file_version_mock, gdv_mock):
+        assert utils.get_release_data_version() == (1234, 5678)
+        gdv_mock.assert_not_called()
+
+    @patch.object(utils, "get_data_version", return_value="dude")
+    @patch.object(utils, "get_db_file_version", return_value=None)
+    def test_git_ref_fallback(self, file_version_mock, gdv_mock):
+        assert utils.get_release_data_version() == "dude"
+        assert utils.get_release_data_version() == "dude"
+        gdv_mock.assert_called_once_with()
+
+    @patch.object(utils, "connections")
+    def test_get_db_file_version(self, connections_mock):
+        connections_mock.__getitem__.return_value.settings_dict = {"ENGINE": "django.db.backends.sqlite3", "NAME": __file__}
+        assert utils.get_db_file_version()
+        connections_mock.__getitem__.return_value.settings_dict = {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"}
+        assert utils.get_db_file_version() is None
+        connections_mock.__getitem__.return_value.settings_dict = {"ENGINE": "django.db.backends.postgresql", "NAME": "bedrock"}
+        assert utils.get_db_file_version() is None
@@ -0,0 +1,69 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+from pathlib import Path
+from subprocess import CalledProcessError
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.test.utils import override_settings
+
+from bedrock.mozorg.tests import TestCase
+from bedrock.releasenotes.models import ProductRelease
+
+RELEASES_PATH = str(Path(__file__).parent)
+GIT_REPO = "bedrock.releasenotes.management.commands.update_release_notes.GitRepo"
+
+
+@override_settings(RELEASE_NOTES_PATH=RELEASES_PATH, DEV=False)
+class TestUpdateReleaseNotes(TestCase):
+    def setUp(self):
+        ProductRelease.objects.refresh()
+        self.all_releases = ProductRelease.objects.get_queryset(include_drafts=True)
+        self.count = self.all_releases.count()
+        patcher = patch(GIT_REPO)
+        self.repo = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+        self.repo.update.return_value = ("abc", "def")
+        self.repo.has_changes.return_value = True
+        self.repo.get_db_latest.return_value = "abc"
+        self.repo.current_hash = "def"
+        self.repo.diff.return_value = (
+            {"releases/firefox-57.0a1-nightly.json", "README.md"},
+            {"releases/firefox-56.0a1-nightly.json"},
+        )
+
+    @patch.object(ProductRelease.objects, "load_releases", wraps=ProductRelease.objects.load_releases)
+    def test_changed_files_only(self, load_mock):
+        call_command("update_release_notes", quiet=True)
+        self.repo.diff.assert_called_with("abc", "def")
+        load_mock.assert_called_with(["firefox-57.0a1-nightly.json"])
+        assert self.all_releases.count() == self.count - 1
+        assert not self.all_releases.filter(version="56.0a1").exists()
+        self.repo.set_db_latest.assert_called_with()
+
+    def test_force(self):
+        self.all_releases.filter(version="57.0a1").delete()
+        call_command("update_release_notes", quiet=True, force=True)
+        self.repo.diff.assert_not_called()
+        assert self.all_releases.count() == self.count
+
+    def test_full_load_when_diff_fails(self):
+        self.repo.diff.side_effect = CalledProcessError(128, "git diff")
+        self.all_releases.filter(version="57.0a1").delete()
+        call_command("update_release_notes", quiet=True)
+        assert self.all_releases.count() == self.count
+
+    def test_full_load_without_source_files(self):
+        self.all_releases.update(source_file="")
+        call_command("update_release_notes", quiet=True)
+        self.repo.diff.assert_not_called()
+        assert self.all_releases.count() == self.count
+        assert not self.all_releases.filter(source_file="").exists()
+
+    def test_no_changes(self):
+        self.repo.has_changes.return_value = False
+        self.all_releases.filter(version="57.0a1").delete()
+        call_command("update_release_notes", quiet=True)
+        assert self.all_releases.count() == self.count - 1
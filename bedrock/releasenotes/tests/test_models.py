@@ -3,11 +3,13 @@
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
 
-from itertools import chain
+import json
+from operator import attrgetter
 from pathlib import Path
 from unittest.mock import call, patch
 
 from django.core.cache import caches
+from django.db import connection
 from django.test.utils import override_settings
 
 import markdown
@@ -90,6 +92,15 @@ class TestReleaseModel(TestCase):
         android = rel.equivalent_release_for_product("Firefox for Android")
         assert android is None
 
+    def test_version_key(self):
+        """Releases should be stored with a version key that sorts like the version."""
+        releases = list(models.ProductRelease.objects.product("firefox", "release").order_by("-version_key"))
+        assert releases
+        assert releases == sorted(releases, key=attrgetter("version_obj"), reverse=True)
+        self._add_in_ff100()
+        latest = models.ProductRelease.objects.order_by("-version_key").first()
+        assert latest.version == "100.0a1"
+
     def test_note_fixed_in_release(self):
         rel = models.get_release("firefox", "55.0a1")
         note = rel.notes[11]
@@ -136,28 +147,25 @@ class TestReleaseModel(TestCase):
         assert len(rel.notes) == 6
 
 
-@patch.object(models.ProductRelease, "objects")
+@patch.object(models, "get_release_index")
 class TestGetRelease(TestCase):
-    def setUp(self):
-        release_cache.clear()
-
-    def test_get_release(self, manager_mock):
-        manager_mock.product().get.return_value = "dude is released"
+    def test_get_release(self, index_mock):
+        index_mock().get.return_value = "dude is released"
         assert models.get_release("Firefox", "57.0") == "dude is released"
-        manager_mock.product.assert_called_with("Firefox", models.ProductRelease.CHANNELS[0], "57.0", False)
+        index_mock().get.assert_called_with("Firefox", models.ProductRelease.CHANNELS[0], "57.0", False)
 
-    def test_get_release_esr(self, manager_mock):
-        manager_mock.product().get.return_value = "dude is released"
+    def test_get_release_esr(self, index_mock):
+        index_mock().get.return_value = "dude is released"
         assert models.get_release("Firefox Extended Support Release", "51.0") == "dude is released"
-        manager_mock.product.assert_called_with("Firefox Extended Support Release", "esr", "51.0", False)
+        index_mock().get.assert_called_with("Firefox Extended Support Release", "esr", "51.0", False)
 
-    def test_get_release_none_match(self, manager_mock):
-        """Make sure the proper exception is raised if no file matches the query"""
-        manager_mock.product().get.side_effect = models.ProductRelease.DoesNotExist
+    def test_get_release_none_match(self, index_mock):
+        """Make sure None is returned if no release matches the query"""
+        index_mock().get.return_value = None
         assert models.get_release("Firefox", "57.0") is None
 
-        expected_calls = chain.from_iterable((call("Firefox", ch, "57.0", False), call().get()) for ch in models.ProductRelease.CHANNELS)
-        manager_mock.product.assert_has_calls(expected_calls)
+        expected_calls = [call("Firefox", ch, "57.0", False) for ch in models.ProductRelease.CHANNELS]
+        index_mock().get.assert_has_calls(expected_calls)
 
 
 @override_settings(RELEASE_NOTES_PATH=RELEASES_PATH, DEV=False)
@@ -192,3 +200,84 @@ class StrikethroughExtensionTestCase(TestCase):
             markdown.markdown("*hello~~test~~*"),
             "<p><em>hello~~test~~</em></p>",
         )
+
+
+@override_settings(RELEASE_NOTES_PATH=RELEASES_PATH, DEV=False)
+class TestNotesField(TestCase):
+    def setUp(self):
+        models.ProductRelease.objects.refresh()
+        release_cache.clear()
+
+    def test_notes_rendered_on_save(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT notes FROM {models.ProductRelease._meta.db_table} WHERE version = %s", ["57.0a1"])
+            data = json.loads(cursor.fetchone()[0])
+        assert data["format"] == "html"
+        assert data["notes"][0]["note"].startswith("<p>Firefox Nightly")
+
+    @patch.object(models, "process_markdown")
+    def test_notes_not_rendered_on_read(self, process_markdown_mock):
+        rel = models.get_release("firefox", "57.0a1")
+        assert rel.notes[0].note.startswith("<p>Firefox Nightly")
+        process_markdown_mock.assert_not_called()
+
+    def test_unrendered_notes(self):
+        """Notes saved as a list of Markdown notes should still be rendered when read"""
+        field = models.ProductRelease._meta.get_field("notes")
+        notes = field.from_db_value(json.dumps([{"id": 1, "note": "**Dude**", "is_public": True}]), None, None)
+        assert notes[0].note == "<p><strong>Dude</strong></p>"
+        assert field.from_db_value("{}", None, None) == []
+
+
+@override_settings(RELEASE_NOTES_PATH=RELEASES_PATH, DEV=False)
+class TestPartialRefresh(TestCase):
+    def setUp(self):
+        models.ProductRelease.objects.refresh()
+        self.all_releases = models.ProductRelease.objects.get_queryset(include_drafts=True)
+
+    def test_source_file(self):
+        rel = self.all_releases.get(version="57.0a1")
+        assert rel.source_file == "firefox-57.0a1-nightly.json"
+
+    def test_refresh_modified_and_removed(self):
+        count = self.all_releases.count()
+        rel = self.all_releases.get(version="57.0a1")
+        loaded = models.ProductRelease.objects.refresh(["firefox-57.0a1-nightly.json"], ["firefox-56.0a1-nightly.json"])
+        assert loaded == 1
+        assert self.all_releases.count() == count - 1
+        assert not self.all_releases.filter(version="56.0a1").exists()
+        new_rel = self.all_releases.get(version="57.0a1")
+        assert new_rel.pk != rel.pk
+        assert new_rel.notes[0].note.startswith("<p>Firefox Nightly")
+
+
+@override_settings(RELEASE_NOTES_PATH=RELEASES_PATH, DEV=False)
+class TestReleaseIndex(TestCase):
+    def setUp(self):
+        models.ProductRelease.objects.refresh()
+
+    def test_index_reused(self):
+        index = models.get_release_index()
+        with self.assertNumQueries(0):
+            assert models.get_release_index() is index
+            rel = models.get_release("firefox", "57.0a1")
+            assert rel.is_latest
+            assert models.get_releases("firefox", "nightly", 2)[0] == rel
+
+    @patch.object(models, "get_release_data_version")
+    def test_index_rebuilt_for_new_data_version(self, version_mock):
+        version_mock.return_value = 1
+        index = models.get_release_index()
+        assert models.get_release_index() is index
+        version_mock.return_value = 2
+        assert models.get_release_index() is not index
+
+    def test_index_reset_on_refresh(self):
+        index = models.get_release_index()
+        models.ProductRelease.objects.refresh()
+        assert models.get_release_index() is not index
+
+    def test_drafts(self):
+        assert models.get_release("firefox for android", "56.0.3") is None
+        assert models.get_release("firefox for android", "56.0.3", include_drafts=True)
+        assert all(rel.is_public for rel in models.get_releases("firefox for android", "release"))
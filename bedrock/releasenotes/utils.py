@@ -2,8 +2,11 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
+import os
+
 from django.conf import settings
 from django.core.cache import caches
+from django.db import connections
 
 from memoize import Memoizer
 
@@ -23,6 +26,42 @@ def get_data_version():
     return git_ref
 
 
+def get_db_file_version():
+    """Return the modification time and size of the SQLite database file.
+
+    This changes whenever a new database is downloaded or the release notes
+    are updated, and is much cheaper to check than a query.
+    Returns None if the database isn't a file.
+    """
+    db_settings = connections["default"].settings_dict
+    if db_settings["ENGINE"] != "django.db.backends.sqlite3":
+        return None
+
+    try:
+        stat = os.stat(db_settings["NAME"])
+    except (OSError, TypeError, ValueError):
+        return None
+
+    return stat.st_mtime_ns, stat.st_size
+
+
+def get_release_data_version():
+    """Return a value that changes when the release notes data changes.
+
+    Falls back to the git ref in the database, checked at most once per
+    release notes cache timeout, if the database isn't a file.
+    """
+    version = get_db_file_version()
+    if version is None:
+        cache = caches["release-notes"]
+        version = cache.get("release-notes:data-version")
+        if version is None:
+            version = get_data_version()
+            cache.set("release-notes:data-version", version)
+
+    return version
+
+
 class ReleaseMemoizer(Memoizer):
     """A memoizer class that uses the git hash as the version"""
 
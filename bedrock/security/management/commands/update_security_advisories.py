@@ -5,15 +5,24 @@
 import glob
 import os
 import re
-import sys
+from concurrent.futures import ProcessPoolExecutor
+from subprocess import CalledProcessError
 
 from django.conf import settings
 from django.core.management.base import CommandError
+from django.db import transaction
 from django.db.models import Count
+from django.utils import timezone
 
 from dateutil.parser import parse as parsedate
 
-from bedrock.security.models import HallOfFamer, MitreCVE, Product, SecurityAdvisory
+from bedrock.security.models import (
+    HallOfFamer,
+    MitreCVE,
+    MitreCVEFeed,
+    Product,
+    SecurityAdvisory,
+)
 from bedrock.security.utils import (
     FILENAME_RE,
     check_hof_data,
@@ -35,6 +44,8 @@ SM_RE = re.compile(r"seamonkey", flags=re.IGNORECASE)
 FNULL = open(os.devnull, "w")
 HOF_FILES = ["client.yml", "web.yml"]
 HOF_DIRECTORY = "bug-bounty-hof"
+# the number of rows to write or delete with each query
+BATCH_SIZE = 500
 
 
 def fix_product_name(name):
@@ -51,19 +62,26 @@ def filter_advisory_filenames(filenames):
     return [os.path.join(ADVISORIES_PATH, fn) for fn in filenames if FILENAME_RE.search(fn)]
 
 
-def delete_files(filenames):
-    ids = get_ids_from_files(filenames)
-    SecurityAdvisory.objects.filter(id__in=ids).delete()
+def filter_hof_filenames(filenames):
+    hof_filenames = [f"{HOF_DIRECTORY}/{fn}" for fn in HOF_FILES]
+    return [os.path.join(ADVISORIES_PATH, fn) for fn in filenames if fn in hof_filenames]
+
 
+def batched(values, batch_size=BATCH_SIZE):
+    values = list(values)
+    for start in range(0, len(values), batch_size):
+        yield values[start : start + batch_size]
 
-def add_or_update_advisory(data, html):
+
+def build_advisory(data, html):
     """
-    Add or update an advisory in the database.
+    Build an unsaved advisory from the data of an advisory file.
 
     :param data: dict of metadata about the advisory
     :param html: HTML content of the advisory
-    :return: SecurityAdvisory
+    :return: tuple of the SecurityAdvisory and a list of the names of the products it's fixed in
     """
+    data = dict(data)
     mfsa_id = data.pop("mfsa_id")
     year, order = [int(x) for x in mfsa_id.split("-")]
     kwargs = {
@@ -79,16 +97,12 @@ def add_or_update_advisory(data, html):
     if datestr:
         dateobj = parsedate(datestr).date()
         kwargs["announced"] = dateobj
-    prodver_objs = []
 
     fixed_in = data.pop("fixed_in")
     if isinstance(fixed_in, str):
         fixed_in = [fixed_in]
 
-    for productname in fixed_in:
-        productname = fix_product_name(productname)
-        productobj, created = Product.objects.get_or_create(name=productname)
-        prodver_objs.append(productobj)
+    product_names = [fix_product_name(productname) for productname in fixed_in]
 
     # discard products. we rely on fixed_in.
     data.pop("products", None)
@@ -96,24 +110,28 @@ def add_or_update_advisory(data, html):
     if data:
         kwargs["extra_data"] = data
 
-    advisory = SecurityAdvisory(**kwargs)
-    advisory.save()
-    advisory.fixed_in.clear()
-    advisory.fixed_in.add(*prodver_objs)
-    return advisory
+    return SecurityAdvisory(**kwargs), product_names
 
 
-def add_hofers(filename, data):
+def build_hofers(filename, data):
+    """Return the unsaved hall of famers from a hall of fame file."""
     check_hof_data(data)
     program = os.path.basename(filename)[:-4]
-    HallOfFamer.objects.filter(program=program).delete()
-    for hofer in data["names"]:
-        HallOfFamer.objects.create(
+    return [
+        HallOfFamer(
             program=program,
             name=hofer["name"],
             date=hofer["date"],
             url=hofer.get("url", ""),
         )
+        for hofer in data["names"]
+    ]
+
+
+def save_hofers(hofers_by_program):
+    for program, hofers in hofers_by_program.items():
+        HallOfFamer.objects.filter(program=program).delete()
+        HallOfFamer.objects.bulk_create(hofers, batch_size=BATCH_SIZE)
 
 
 def parse_cve_id(cve_id):
@@ -121,7 +139,22 @@ def parse_cve_id(cve_id):
     return int(cve_year), int(cve_order)
 
 
-def add_or_update_cve(data):
+def get_cve_ids(data):
+    return {cve_id for cve_id in data.get("advisories", {}) if cve_id.startswith("CVE-")}
+
+
+def merge_cves(cves, data, cve_ids=None):
+    """
+    Merge the CVEs in the data of an advisory file into `cves`.
+
+    :param cves: dict of MitreCVE by id
+    :param data: dict of metadata about the advisory
+    :param cve_ids: the ids of the CVEs to merge, or None for all of them
+    """
+    fixed_in = data["fixed_in"]
+    if isinstance(fixed_in, str):
+        fixed_in = [fixed_in]
+
     for cve_id, advisory in data["advisories"].items():
         if not cve_id.startswith("CVE-"):
             # skip advisories that are not CVE
@@ -131,6 +164,9 @@ def add_or_update_cve(data):
             # skip advisories with `feed: false`
             continue
 
+        if cve_ids is not None and cve_id not in cve_ids:
+            continue
+
         cve_year, cve_order = parse_cve_id(cve_id)
         update_advisory_bugs(advisory)
         cve_title = advisory.get("cve_problemtype", advisory.get("title")) or ""
@@ -144,32 +180,28 @@ def add_or_update_cve(data):
             "description": advisory["description"] or "",
             "bugs": advisory["bugs"],
         }
-        try:
-            cve = MitreCVE.objects.get(id=cve_id)
-        except MitreCVE.DoesNotExist:
-            cve = MitreCVE(**cve_data)
-            cve.products = data["fixed_in"]
-            cve.mfsa_ids.append(data["mfsa_id"])
+        cve = cves.get(cve_id)
+        if cve is None:
+            cve = cves[cve_id] = MitreCVE(**cve_data)
+            cve.products = list(fixed_in)
+            cve.mfsa_ids = [data["mfsa_id"]]
         else:
-            cve.products = list(set(cve.products).union(data["fixed_in"]))
-            cve.mfsa_ids = list(set(cve.mfsa_ids).union([data["mfsa_id"]]))
+            # keep the order so the feed only changes when the data does
+            cve.products = list(dict.fromkeys(cve.products + list(fixed_in)))
+            cve.mfsa_ids = list(dict.fromkeys(cve.mfsa_ids + [data["mfsa_id"]]))
             for prop, value in cve_data.items():
                 if value:
                     setattr(cve, prop, value)
 
-        cve.save()
 
-
-def update_db_from_file(filename):
+def parse_advisory_file(filename):
     """
-    Parse file for YAML and Markdown and update database.
+    Parse an advisory file for YAML and Markdown.
 
     :raises: KeyError or ValueError
-    :param filename: path to markdown file.
-    :return: SecurityAdvisory instance
+    :param filename: path to markdown or YAML file.
+    :return: tuple of the metadata dict and the HTML content
     """
-    if HOF_DIRECTORY in filename:
-        return add_hofers(filename, parse_yml_file_base(filename))
     if filename.endswith(".md"):
         parser = parse_md_file
     elif filename.endswith(".yml"):
@@ -177,10 +209,166 @@ def update_db_from_file(filename):
     else:
         raise RuntimeError(f"Unknown file type {filename}")
 
-    data, html = parser(filename)
-    if "advisories" in data:
-        add_or_update_cve(data)
-    return add_or_update_advisory(data, html)
+    return parser(filename)
+
+
+def parse_file(filename):
+    """
+    Parse a hall of fame or advisory file.
+
+    :param filename: path to the file.
+    :return: tuple of the parsed data, the HTML content of advisories, and an error message if parsing failed
+    """
+    try:
+        if HOF_DIRECTORY in filename:
+            return parse_yml_file_base(filename), None, None
+
+        data, html = parse_advisory_file(filename)
+        # fail here rather than when saving
+        build_advisory(data, html)
+        return data, html, None
+    except Exception as e:
+        return None, None, f"ERROR parsing {filename}: {e}"
+
+
+class AdvisoryImport:
+    """
+    Parse advisory and hall of fame files and save them to the database in bulk.
+
+    Files are parsed with `parse`, in a pool of processes if more than one worker
+    is requested. `save` then writes all of the advisories, their products, CVEs and
+    hall of famers with a few queries in a single transaction.
+    """
+
+    def __init__(self, workers=1):
+        self.workers = workers
+        self.errors = []
+        self.hofers = {}
+        self.advisories = {}
+        # the advisory data used to build the CVEs, by MFSA id
+        self.cve_sources = {}
+
+    def parse_files(self, filenames):
+        """Return the parsed data and HTML of the files that could be parsed by file name."""
+        filenames = list(filenames)
+        if self.workers > 1 and len(filenames) > 1:
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                results = list(executor.map(parse_file, filenames, chunksize=16))
+        else:
+            results = [parse_file(filename) for filename in filenames]
+
+        parsed = {}
+        for filename, (data, html, error) in zip(filenames, results):
+            if error:
+                self.errors.append(error)
+            else:
+                parsed[filename] = data, html
+
+        return parsed
+
+    def parse(self, filenames):
+        """Parse the files to be saved. Returns the number of files that were parsed."""
+        parsed = self.parse_files(filenames)
+        for filename, (data, html) in parsed.items():
+            if html is None:
+                try:
+                    self.hofers[os.path.basename(filename)[:-4]] = build_hofers(filename, data)
+                except Exception as e:
+                    self.errors.append(f"ERROR parsing {filename}: {e}")
+            else:
+                self.advisories[data["mfsa_id"]] = data, html
+                self.cve_sources[data["mfsa_id"]] = data
+
+        return len(parsed)
+
+    def parse_cve_sources(self, filenames):
+        """Parse advisory files only to build the CVEs from."""
+        for data, html in self.parse_files(filenames).values():
+            self.cve_sources[data["mfsa_id"]] = data
+
+    def get_cves(self, cve_ids=None):
+        cves = {}
+        for mfsa_id in sorted(self.cve_sources):
+            data = self.cve_sources[mfsa_id]
+            if "advisories" in data:
+                merge_cves(cves, data, cve_ids)
+
+        return list(cves.values())
+
+    def get_saved_cves(self, cve_ids=None):
+        """Return the CVEs in the database by id."""
+        if cve_ids is None:
+            return MitreCVE.objects.in_bulk()
+
+        saved_cves = {}
+        for batch in batched(cve_ids):
+            saved_cves.update(MitreCVE.objects.in_bulk(batch))
+
+        return saved_cves
+
+    def get_products(self, product_names):
+        """Return the products by name, creating any that don't exist yet."""
+        products = Product.objects.in_bulk(field_name="name")
+        new_products = [Product(name=name) for name in product_names if name not in products]
+        if new_products:
+            for product in new_products:
+                product.set_derived_fields()
+            Product.objects.bulk_create(new_products, batch_size=BATCH_SIZE)
+            products = Product.objects.in_bulk(field_name="name")
+
+        return products
+
+    def save(self, removed_ids=(), cve_ids=None):
+        """
+        Save the parsed files to the database.
+
+        :param removed_ids: the ids of advisories to delete
+        :param cve_ids: the ids of the CVEs to rebuild, or None to rebuild all of them
+        :return: number of advisories saved
+        """
+        advisories = []
+        fixed_in = {}
+        for mfsa_id in sorted(self.advisories):
+            advisory, product_names = build_advisory(*self.advisories[mfsa_id])
+            advisories.append(advisory)
+            fixed_in[mfsa_id] = product_names
+
+        through_model = SecurityAdvisory.fixed_in.through
+        with transaction.atomic():
+            save_hofers(self.hofers)
+
+            for batch in batched(set(removed_ids).union(self.advisories)):
+                SecurityAdvisory.objects.filter(id__in=batch).delete()
+            SecurityAdvisory.objects.bulk_create(advisories, batch_size=BATCH_SIZE)
+            products = self.get_products({name for names in fixed_in.values() for name in names})
+            through_model.objects.bulk_create(
+                [
+                    through_model(securityadvisory_id=mfsa_id, product_id=products[name].pk)
+                    for mfsa_id, names in fixed_in.items()
+                    # the same product can be listed more than once
+                    for name in dict.fromkeys(names)
+                ],
+                batch_size=BATCH_SIZE,
+            )
+
+            cves = self.get_cves(cve_ids)
+            saved_cves = self.get_saved_cves(cve_ids)
+            now = timezone.now()
+            for cve in cves:
+                saved_cve = saved_cves.get(cve.id)
+                if saved_cve and saved_cve.last_modified and saved_cve.feed_entry() == cve.feed_entry():
+                    cve.last_modified = saved_cve.last_modified
+                else:
+                    cve.last_modified = now
+
+            if cve_ids is None:
+                MitreCVE.objects.all().delete()
+            else:
+                for batch in batched(cve_ids):
+                    MitreCVE.objects.filter(id__in=batch).delete()
+            MitreCVE.objects.bulk_create(cves, batch_size=BATCH_SIZE)
+
+        return len(advisories)
 
 
 def get_all_mfsa_files():
@@ -218,6 +406,89 @@ def delete_orphaned_products():
     return num_products
 
 
+def get_mfsa_files(mfsa_ids):
+    """Return the files of the advisories with the given IDs."""
+    filenames = []
+    for mfsa_id in sorted(mfsa_ids):
+        filenames.extend(glob.glob(os.path.join(ADVISORIES_PATH, "announce", "*", f"mfsa{mfsa_id}.*")))
+
+    return filenames
+
+
+def get_changed_files(repo):
+    """Return the files (modified, removed) since the last import, or `None` if every file should be imported."""
+    db_latest = repo.get_db_latest()
+    if db_latest is None:
+        return None
+
+    try:
+        modified, removed = repo.diff(db_latest, repo.current_hash)
+    except CalledProcessError:
+        # e.g. the old commit is not in the (shallow) clone
+        return None
+
+    return sorted(modified), sorted(removed)
+
+
+def update_db_from_all_files(workers=1):
+    """
+    Import every file in the repo, replacing all of the advisories and CVEs.
+
+    Advisories with no file in the repo are deleted, but not those with files that fail to parse.
+
+    :param workers: number of processes to use for parsing files
+
+    :return: tuple of (number of files updated, number of advisories deleted, list of errors)
+    """
+    all_files = get_all_file_names()
+    importer = AdvisoryImport(workers)
+    updates = importer.parse(all_files)
+    removed_ids = get_ids_from_files(get_files_to_delete_from_db(all_files))
+    cve_ids = None
+    if importer.errors:
+        # keep the CVEs that are only listed in the advisories that failed to parse
+        cve_ids = set()
+        for data in importer.cve_sources.values():
+            cve_ids.update(get_cve_ids(data))
+
+    importer.save(removed_ids, cve_ids)
+    return updates, len(removed_ids), importer.errors
+
+
+def update_db_from_changes(modified, removed, workers=1):
+    """
+    Update the database from only the files that changed in the repo.
+
+    The CVEs listed in the changed advisories, or that were listed in them before,
+    are rebuilt from every advisory that lists them.
+
+    :param modified: paths relative to the repo of the new or modified files
+    :param removed: paths relative to the repo of the deleted files
+    :param workers: number of processes to use for parsing files
+    :return: tuple of (number of files updated, number of advisories deleted, list of errors)
+    """
+    importer = AdvisoryImport(workers)
+    updates = importer.parse(filter_hof_filenames(modified) + filter_advisory_filenames(modified))
+
+    # an advisory that changed from .md to .yml is both removed and modified
+    removed_ids = set(get_ids_from_files(removed)) - set(get_ids_from_files(modified))
+    changed_ids = removed_ids.union(importer.advisories)
+    cve_ids = set()
+    for data, html in importer.advisories.values():
+        cve_ids.update(get_cve_ids(data))
+
+    # the advisories other than the changed ones that list the affected CVEs
+    other_ids = set()
+    for cve in MitreCVE.objects.only("id", "mfsa_ids"):
+        if cve.id in cve_ids or changed_ids.intersection(cve.mfsa_ids):
+            cve_ids.add(cve.id)
+            other_ids.update(cve.mfsa_ids)
+
+    importer.parse_cve_sources(get_mfsa_files(other_ids - changed_ids))
+    importer.save(removed_ids, cve_ids)
+    return updates, len(removed_ids), importer.errors
+
+
 @alert_sentry_on_exception
 class Command(CronCommand):
     help = "Refresh database of MoFo Security Advisories."
@@ -245,8 +516,20 @@ class Command(CronCommand):
             default=False,
             help="Clear all security advisory data and load all files",
         )
+        parser.add_argument(
+            "-w",
+            "--workers",
+            type=int,
+            dest="workers",
+            default=1,
+            help="Number of processes to use for parsing files.",
+        )
 
-    def handle_safe(self, quiet, no_git, clear_db, **options):
+    def printout(self, msg, ending=None):
+        if not self.quiet:
+            self.stdout.write(msg, ending=ending)
+
+    def handle_safe(self, quiet, no_git, clear_db, workers=1, **options):
         force = no_git or clear_db
         repo = GitRepo(
             ADVISORIES_PATH,
@@ -254,50 +537,39 @@ class Command(CronCommand):
             branch_name=ADVISORIES_BRANCH,
             name="Security Advisories",
         )
-
-        def printout(msg, ending=None):
-            if not quiet:
-                self.stdout.write(msg, ending=ending)
+        self.quiet = quiet
 
         if clear_db:
-            printout("Clearing all security advisories.")
+            self.printout("Clearing all security advisories.")
             SecurityAdvisory.objects.all().delete()
             Product.objects.all().delete()
             MitreCVE.objects.all().delete()
 
         if not no_git:
-            printout("Updating repository.")
+            self.printout("Updating repository.")
             repo.update()
 
         if not (force or repo.has_changes()):
-            printout("Nothing to update.")
+            self.printout("Nothing to update.")
             return
 
-        errors = []
-        updates = 0
-        all_files = get_all_file_names()
-        for mf in all_files:
-            try:
-                update_db_from_file(mf)
-            except Exception as e:
-                errors.append(f"ERROR parsing {mf}: {e}")
-                if not quiet:
-                    sys.stdout.write("E")
-                    sys.stdout.flush()
-                continue
-            if not quiet:
-                sys.stdout.write(".")
-                sys.stdout.flush()
-            updates += 1
-        printout(f"\nUpdated {updates} files.")
-
-        if not clear_db:
-            deleted_files = get_files_to_delete_from_db(all_files)
-            delete_files(deleted_files)
-            printout(f"Deleted {len(deleted_files)} files.")
-            num_products = delete_orphaned_products()
-            if num_products:
-                printout(f"Deleted {num_products} orphaned products.")
+        changes = None if force else get_changed_files(repo)
+        if changes is None:
+            self.printout("Updating from all files.")
+            updates, num_deleted, errors = update_db_from_all_files(workers)
+        else:
+            modified, removed = changes
+            self.printout(f"Updating from {len(modified)} modified and {len(removed)} deleted files.")
+            updates, num_deleted, errors = update_db_from_changes(modified, removed, workers)
+
+        self.printout(f"Updated {updates} files.")
+        self.printout(f"Deleted {num_deleted} files.")
+        num_products = delete_orphaned_products()
+        if num_products:
+            self.printout(f"Deleted {num_products} orphaned products.")
+
+        feed = MitreCVEFeed.generate(timezone.now())
+        self.printout(f"Saved the CVE feed with ETag {feed.etag}.")
 
         if errors:
             raise CommandError(f"Encountered {len(errors)} errors:\n\n" + "\n==========\n".join(errors))
@@ -0,0 +1,34 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+from django.db import migrations, models
+
+from product_details.version_compare import version_int
+
+
+def set_version_keys(apps, schema_editor):
+    Product = apps.get_model("security", "Product")
+    products = list(Product.objects.all())
+    for product in products:
+        vers = product.name.rsplit(None, 1)[1]
+        if "." not in vers:
+            vers += ".0"
+        product.version_key = version_int(vers)
+
+    Product.objects.bulk_update(products, ["version_key"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("security", "0006_auto_20200122_0957"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="product",
+            name="version_key",
+            field=models.BigIntegerField(db_index=True, default=0),
+        ),
+        migrations.RunPython(set_version_keys, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,30 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+# Generated by Django 3.2.18 on 2026-10-18 19:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("security", "0007_product_version_key"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MitreCVEFeed",
+            fields=[
+                ("id", models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("etag", models.CharField(max_length=32)),
+                ("last_modified", models.DateTimeField()),
+                ("data", models.BinaryField()),
+            ],
+        ),
+        migrations.AddField(
+            model_name="mitrecve",
+            name="last_modified",
+            field=models.DateTimeField(db_index=True, null=True),
+        ),
+    ]
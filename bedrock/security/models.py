@@ -2,13 +2,17 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
+import gzip
+import json
+from hashlib import md5
+
 from django.db import models
 from django.template.defaultfilters import slugify
 from django.utils.functional import total_ordering
 
 from django_extensions.db.fields import ModificationDateTimeField
 from django_extensions.db.fields.json import JSONField
-from product_details.version_compare import Version
+from product_details.version_compare import Version, version_int
 
 from bedrock.base.urlresolvers import reverse
 
@@ -19,6 +23,8 @@ class Product(models.Model):
     slug = models.CharField(max_length=50, db_index=True)
     product = models.CharField(max_length=50)
     product_slug = models.SlugField()
+    # the version encoded as an integer by `version_int` so it can be sorted and filtered in SQL
+    version_key = models.BigIntegerField(default=0, db_index=True)
 
     class Meta:
         ordering = ("slug",)
@@ -53,12 +59,17 @@ class Product(models.Model):
         product, vers = self.name_and_version
         return reverse("security.product-version-advisories", kwargs={"product": product, "version": vers})
 
-    def save(self, force_insert=False, force_update=False, using=None, update_fields=None):
+    def set_derived_fields(self):
+        """Set the fields computed from the name, which `save()` does but `bulk_create()` doesn't."""
         # do not use self.name_tuple because don't want ".0" on versions.
         product, vers = self.name_and_version
         self.product = product
         self.product_slug = slugify(product)
         self.slug = f"{self.product_slug}-{vers}"
+        self.version_key = version_int(self.version)
+
+    def save(self, force_insert=False, force_update=False, using=None, update_fields=None):
+        self.set_derived_fields()
         super().save(force_insert, force_update, using, update_fields)
 
 
@@ -143,6 +154,8 @@ class MitreCVE(models.Model):
     products = JSONField(default="[]")
     mfsa_ids = JSONField(default="[]")
     bugs = JSONField(default="[]")
+    # when the feed entry last changed
+    last_modified = models.DateTimeField(null=True, db_index=True)
 
     class Meta:
         ordering = ("-year", "-order")
@@ -201,7 +214,7 @@ class MitreCVE(models.Model):
         return product_data
 
     def get_reference_data(self):
-        reference_data = [{"url": f"https://www.mozilla.org/security/advisories/mfsa{mfsa_id}/"} for mfsa_id in set(self.mfsa_ids)]
+        reference_data = [{"url": f"https://www.mozilla.org/security/advisories/mfsa{mfsa_id}/"} for mfsa_id in dict.fromkeys(self.mfsa_ids)]
         reference_data.extend([{"url": bug["url"]} for bug in self.bugs])
         return reference_data
 
@@ -254,3 +267,29 @@ class MitreCVE(models.Model):
                 ]
             },
         }
+
+
+class MitreCVEFeed(models.Model):
+    """The MITRE format feed of every CVE, serialized when the advisories are updated."""
+
+    etag = models.CharField(max_length=32)
+    last_modified = models.DateTimeField()
+    # the gzip compressed JSON of the feed
+    data = models.BinaryField()
+
+    @classmethod
+    def generate(cls, last_modified):
+        """Serialize the feed of all of the CVEs, replacing the previous one."""
+        feed = json.dumps([cve.feed_entry() for cve in MitreCVE.objects.all()]).encode("utf-8")
+        etag = md5(feed).hexdigest()
+        current = cls.objects.only("etag").first()
+        if current and current.etag == etag:
+            return current
+
+        cls.objects.all().delete()
+        # mtime=0 so that the compressed data only changes with the feed
+        return cls.objects.create(etag=etag, last_modified=last_modified, data=gzip.compress(feed, mtime=0))
+
+    @property
+    def json(self):
+        return gzip.decompress(self.data)
@@ -3,13 +3,17 @@
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
 import os.path
-from unittest.mock import patch
+from subprocess import CalledProcessError
+from tempfile import TemporaryDirectory
+from unittest.mock import Mock, patch
 
 from django.conf import settings
 
+from product_details.version_compare import version_int
+
 from bedrock.mozorg.tests import TestCase
 from bedrock.security.management.commands import update_security_advisories
-from bedrock.security.models import Product
+from bedrock.security.models import HallOfFamer, MitreCVE, Product, SecurityAdvisory
 
 
 def test_fix_product_name():
@@ -51,17 +55,25 @@ def test_get_ids_from_files():
     assert update_security_advisories.get_ids_from_files(filenames) == good_ids
 
 
+MFSA_YML = """
+announced: December 25, 2015
+title: The Dude is insecure
+impact: High
+fixed_in:
+- Firefox 43.0.1
+advisories: {}
+"""
+
+
 def make_mfsa(mfsa_id):
-    update_security_advisories.add_or_update_advisory(
-        {
-            "mfsa_id": mfsa_id,
-            "title": "The Dude is insecure",
-            "impact": "High",
-            "announced": "December 25, 2015",
-            "fixed_in": ["Firefox 43.0.1"],
-        },
-        "The Dude minds, man!",
-    )
+    with TemporaryDirectory() as path:
+        filename = os.path.join(path, f"mfsa{mfsa_id}.yml")
+        with open(filename, "w") as fh:
+            fh.write(MFSA_YML)
+
+        importer = update_security_advisories.AdvisoryImport()
+        assert importer.parse([filename]) == 1
+        importer.save()
 
 
 class TestDBActions(TestCase):
@@ -80,19 +92,157 @@ class TestDBActions(TestCase):
         assert update_security_advisories.delete_orphaned_products() == 2
         assert Product.objects.get().name == "Firefox 43.0.1"
 
-    @patch.object(update_security_advisories, "get_all_file_names")
-    @patch.object(update_security_advisories, "delete_files")
-    @patch.object(update_security_advisories, "update_db_from_file")
+
+def test_get_changed_files():
+    repo = Mock(current_hash="def456")
+    repo.get_db_latest.return_value = "abc123"
+    repo.diff.return_value = {"b.md", "a.md"}, {"c.md"}
+    assert update_security_advisories.get_changed_files(repo) == (["a.md", "b.md"], ["c.md"])
+    repo.diff.assert_called_with("abc123", "def456")
+
+    repo.diff.side_effect = CalledProcessError(128, "git diff")
+    assert update_security_advisories.get_changed_files(repo) is None
+
+    repo.get_db_latest.return_value = None
+    assert update_security_advisories.get_changed_files(repo) is None
+
+
+ADVISORY_YML = """
+announced: December 25, 2016
+title: Security vulnerabilities fixed in {product}
+impact: high
+fixed_in:
+- {product}
+advisories:
+  {cve_id}:
+    title: The Dude is insecure
+    impact: high
+    reporter: Walter
+    description: Bad things.
+    bugs:
+      - url: 1234
+"""
+
+
+class TestUpdateFromChanges(TestCase):
+    def setUp(self):
+        tempdir = TemporaryDirectory()
+        self.addCleanup(tempdir.cleanup)
+        self.path = tempdir.name
+        patcher = patch.object(update_security_advisories, "ADVISORIES_PATH", self.path)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def write_advisory(self, mfsa_id, product, cve_id="CVE-2016-1000"):
+        filename = f"announce/2016/mfsa{mfsa_id}.yml"
+        os.makedirs(os.path.join(self.path, "announce", "2016"), exist_ok=True)
+        with open(os.path.join(self.path, filename), "w") as fh:
+            fh.write(ADVISORY_YML.format(product=product, cve_id=cve_id))
+
+        return filename
+
+    def write_hofers(self, program, count=100):
+        os.makedirs(os.path.join(self.path, "bug-bounty-hof"), exist_ok=True)
+        with open(os.path.join(self.path, "bug-bounty-hof", f"{program}.yml"), "w") as fh:
+            fh.write("names:\n")
+            for i in range(count):
+                fh.write(f"- name: The Dude {i}\n  date: 2016-12-25\n")
+
+    def update_all(self, filenames):
+        importer = update_security_advisories.AdvisoryImport()
+        importer.parse([os.path.join(self.path, filename) for filename in filenames])
+        importer.save()
+
+    def test_modified_advisory(self):
+        files = [self.write_advisory("2016-01", "Firefox 50"), self.write_advisory("2016-02", "Firefox ESR 45.6")]
+        self.update_all(files)
+        cve = MitreCVE.objects.get(id="CVE-2016-1000")
+        assert set(cve.products) == {"Firefox 50", "Firefox ESR 45.6"}
+        assert set(cve.mfsa_ids) == {"2016-01", "2016-02"}
+
+        files[0] = self.write_advisory("2016-01", "Firefox 50.1")
+        assert update_security_advisories.update_db_from_changes([files[0]], []) == (1, 0, [])
+        cve = MitreCVE.objects.get(id="CVE-2016-1000")
+        # the products of the unchanged advisory are kept and the old products of the changed one are not
+        assert set(cve.products) == {"Firefox 50.1", "Firefox ESR 45.6"}
+        assert set(cve.mfsa_ids) == {"2016-01", "2016-02"}
+        assert [p.name for p in SecurityAdvisory.objects.get(id="2016-01").fixed_in.all()] == ["Firefox 50.1"]
+
+    def test_removed_advisory(self):
+        files = [self.write_advisory("2016-01", "Firefox 50"), self.write_advisory("2016-02", "Firefox 51", cve_id="CVE-2016-1001")]
+        self.update_all(files)
+        os.remove(os.path.join(self.path, files[1]))
+        assert update_security_advisories.update_db_from_changes([], [files[1]]) == (0, 1, [])
+        assert list(SecurityAdvisory.objects.values_list("id", flat=True)) == ["2016-01"]
+        assert list(MitreCVE.objects.values_list("id", flat=True)) == ["CVE-2016-1000"]
+
+    def test_renamed_advisory(self):
+        """An advisory that changed from .md to .yml should be updated, not deleted."""
+        self.update_all([self.write_advisory("2016-01", "Firefox 50")])
+        filename = self.write_advisory("2016-01", "Firefox 50.1")
+        assert update_security_advisories.update_db_from_changes([filename], [filename.replace(".yml", ".md")]) == (1, 0, [])
+        assert SecurityAdvisory.objects.get().id == "2016-01"
+
     @patch.object(update_security_advisories, "GitRepo")
-    def test_file_name_extension_change(self, git_mock, udbff_mock, df_mock, gafn_mock):
+    def test_file_name_extension_change(self, git_mock):
         """
         An MFSA file can now be either .md or .yml. Make sure this is an update, not a delete.
         """
         make_mfsa("2016-42")
         make_mfsa("2016-43")
-        all_files = [os.path.join(update_security_advisories.ADVISORIES_PATH, "mfsa2016-42.yml")]
-        gafn_mock.return_value = all_files
+        self.write_advisory("2016-42", "Firefox 50")
+        self.write_hofers("client")
+        self.write_hofers("web", 101)
         git_mock().has_changes.return_value = True
+        git_mock().get_db_latest.return_value = None
         update_security_advisories.Command().handle_safe(quiet=True, no_git=False, clear_db=False)
-        udbff_mock.assert_called_with(update_security_advisories.filter_advisory_filenames(all_files)[0])
-        df_mock.assert_called_with(["mfsa2016-43.md"])
+        advisory = SecurityAdvisory.objects.get()
+        assert advisory.id == "2016-42"
+        assert advisory.title == "Security vulnerabilities fixed in Firefox 50"
+        assert [p.name for p in advisory.fixed_in.all()] == ["Firefox 50"]
+        assert MitreCVE.objects.get().mfsa_ids == ["2016-42"]
+        assert HallOfFamer.objects.filter(program="client").count() == 100
+        assert HallOfFamer.objects.filter(program="web").count() == 101
+        git_mock().set_db_latest.assert_called_with()
+
+    def test_parse_files_in_process_pool(self):
+        files = [self.write_advisory(f"2016-0{i}", f"Firefox 5{i}") for i in range(1, 4)]
+        files = [os.path.join(self.path, filename) for filename in files]
+        files.append(os.path.join(self.path, "announce/2016/mfsa2016-99.yml"))
+        importer = update_security_advisories.AdvisoryImport(workers=2)
+        parsed = importer.parse_files(files)
+        assert parsed == update_security_advisories.AdvisoryImport().parse_files(files)
+        assert list(parsed) == files[:3]
+        assert len(importer.errors) == 1
+
+    def test_bulk_created_products(self):
+        importer = update_security_advisories.AdvisoryImport()
+        importer.parse([os.path.join(self.path, self.write_advisory("2016-01", "Firefox ESR 45.6.0"))])
+        assert importer.save() == 1
+        product = Product.objects.get()
+        assert product.name == "Firefox ESR 45.6"
+        assert product.slug == "firefox-esr-45.6"
+        assert product.version_key == version_int("45.6")
+
+    def test_cve_last_modified(self):
+        """CVEs should only be marked as modified when their feed entry changes."""
+        files = [self.write_advisory("2016-01", "Firefox 50"), self.write_advisory("2016-02", "Firefox 51", cve_id="CVE-2016-1001")]
+        update_security_advisories.update_db_from_changes(files, [])
+        last_modified = dict(MitreCVE.objects.values_list("id", "last_modified"))
+        assert None not in last_modified.values()
+
+        self.write_advisory("2016-02", "Firefox 51.0.1", cve_id="CVE-2016-1001")
+        update_security_advisories.update_db_from_all_files()
+        new_last_modified = dict(MitreCVE.objects.values_list("id", "last_modified"))
+        assert new_last_modified["CVE-2016-1000"] == last_modified["CVE-2016-1000"]
+        assert new_last_modified["CVE-2016-1001"] > last_modified["CVE-2016-1001"]
+
+    def test_parse_error(self):
+        self.update_all([self.write_advisory("2016-01", "Firefox 50")])
+        with open(os.path.join(self.path, "announce/2016/mfsa2016-01.yml"), "w") as fh:
+            fh.write("title: [")
+
+        updates, deleted, errors = update_security_advisories.update_db_from_changes(["announce/2016/mfsa2016-01.yml"], [])
+        assert (updates, deleted, len(errors)) == (0, 0, 1)
+        assert SecurityAdvisory.objects.get().id == "2016-01"
+        assert MitreCVE.objects.get().id == "CVE-2016-1000"
@@ -19,6 +19,13 @@ class TestProduct(TestCase):
         pvs = [pv2, pv0, pv3, pv1, pv4, pv5]
         self.assertListEqual([pv0, pv5, pv1, pv2, pv3, pv4], sorted(pvs))
 
+    def test_version_key_ordering(self):
+        """Ordering by version_key in the database should match the version ordering."""
+        names = ["Firefox 24.0.1", "Firefox 24.0", "Firefox 4.0b10", "Firefox 23.0", "Firefox 25", "Firefox 4.0", "Firefox 22"]
+        pvs = [Product.objects.create(name=name) for name in names]
+        self.assertListEqual(list(Product.objects.order_by("-version_key")), sorted(pvs, reverse=True))
+        self.assertEqual(Product.objects.get(name="Firefox 25").version_key, Product.objects.create(name="Firefox 25.0").version_key)
+
     def test_product_version_slug(self):
         """Slug should include the version."""
         pv0 = Product.objects.create(name="Firefox 24.0.1")
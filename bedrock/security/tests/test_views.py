@@ -2,13 +2,25 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
+import gzip
+import json
+from datetime import datetime
 from unittest.mock import patch
 
+from django.test import RequestFactory
+from django.urls import reverse
+from django.utils.timezone import utc
+
 from product_details.version_compare import Version
 
 from bedrock.mozorg.tests import TestCase
-from bedrock.security.models import Product
-from bedrock.security.views import ProductVersionView, ProductView, product_is_obsolete
+from bedrock.security.models import MitreCVE, MitreCVEFeed, Product
+from bedrock.security.views import (
+    ProductVersionView,
+    ProductView,
+    accepts_gzip,
+    product_is_obsolete,
+)
 
 
 def test_product_is_obsolete():
@@ -48,22 +60,22 @@ class TestViews(TestCase):
         pview = ProductView()
         pview.kwargs = {"slug": "firefox"}
         with patch.dict(pview.minimum_versions, {"firefox": Version("4.2")}):
-            self.assertListEqual(pview.get_queryset(), [self.pvs[5], self.pvs[4], self.pvs[3]])
+            self.assertListEqual(list(pview.get_queryset()), [self.pvs[5], self.pvs[4], self.pvs[3]])
 
         with patch.dict(pview.minimum_versions, {"firefox": Version("22.0")}):
-            self.assertListEqual(pview.get_queryset(), [self.pvs[5]])
+            self.assertListEqual(list(pview.get_queryset()), [self.pvs[5]])
 
     def test_product_version_view_filter_major(self):
         """Given a major version should return all minor versions."""
         pview = ProductVersionView()
         pview.kwargs = {"product": "firefox", "version": "4"}
-        self.assertListEqual(pview.get_queryset(), [self.pvs[4], self.pvs[3], self.pvs[2], self.pvs[1]])
+        self.assertListEqual(list(pview.get_queryset()), [self.pvs[4], self.pvs[3], self.pvs[2], self.pvs[1]])
 
     def test_product_version_view_filter_minor(self):
         """Given a minor version should return all point versions."""
         pview = ProductVersionView()
         pview.kwargs = {"product": "firefox", "version": "4.2"}
-        self.assertListEqual(pview.get_queryset(), [self.pvs[4], self.pvs[3]])
+        self.assertListEqual(list(pview.get_queryset()), [self.pvs[4], self.pvs[3]])
 
 
 class TestKVRedirects(TestCase):
@@ -111,3 +123,88 @@ class TestOldAdvisories(TestCase):
         self._test_redirect("/security/announce/2005/mfsa2005-40.html", "/security/advisories/mfsa2005-40/")
         self._test_redirect("/security/advisories/2008/mfsa2008-47.html", "/security/advisories/mfsa2008-47/")
         self._test_redirect("/security/advisories/mfsa2008-66/mfsa2008-37.html", "/security/advisories/mfsa2008-37/")
+
+
+class TestMitreCVEFeed(TestCase):
+    def setUp(self):
+        self.url = reverse("security.advisories.cve_feed")
+        for order, last_modified in ((1, datetime(2018, 1, 1, tzinfo=utc)), (2, datetime(2018, 6, 1, tzinfo=utc))):
+            MitreCVE.objects.create(
+                id=f"CVE-2018-{order}",
+                year=2018,
+                order=order,
+                title="A Testing Problem",
+                description="There was a problem.",
+                products=["Firefox 60"],
+                mfsa_ids=["2018-11"],
+                last_modified=last_modified,
+            )
+
+    def get_ids(self, resp):
+        return [entry["CVE_data_meta"]["ID"] for entry in json.loads(resp.content)]
+
+    def test_no_saved_feed(self):
+        resp = self.client.get(self.url)
+        assert resp.status_code == 200
+        assert self.get_ids(resp) == ["CVE-2018-2", "CVE-2018-1"]
+
+    def test_saved_feed(self):
+        feed = MitreCVEFeed.generate(datetime(2018, 6, 2, tzinfo=utc))
+        # the CVEs changing doesn't change the feed until it is generated again
+        MitreCVE.objects.all().delete()
+        resp = self.client.get(self.url)
+        assert resp.status_code == 200
+        assert resp["ETag"] == f'"{feed.etag}"'
+        assert resp["Last-Modified"] == "Sat, 02 Jun 2018 00:00:00 GMT"
+        assert "Content-Encoding" not in resp
+        assert self.get_ids(resp) == ["CVE-2018-2", "CVE-2018-1"]
+
+        resp = self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip, deflate")
+        assert resp["Content-Encoding"] == "gzip"
+        assert resp["ETag"] == f'"{feed.etag}-gzip"'
+        assert "Accept-Encoding" in resp["Vary"]
+        assert gzip.decompress(resp.content) == feed.json
+
+        resp = self.client.get(self.url, HTTP_IF_NONE_MATCH=f'"{feed.etag}"')
+        assert resp.status_code == 304
+        assert "Accept-Encoding" in resp["Vary"]
+
+        # the ETag of one encoding doesn't match the other
+        resp = self.client.get(self.url, HTTP_IF_NONE_MATCH=f'"{feed.etag}"', HTTP_ACCEPT_ENCODING="gzip")
+        assert resp.status_code == 200
+        resp = self.client.get(self.url, HTTP_IF_NONE_MATCH=f'"{feed.etag}-gzip"', HTTP_ACCEPT_ENCODING="gzip")
+        assert resp.status_code == 304
+
+    def test_accepts_gzip(self):
+        for accept_encoding, expected in (
+            ("", False),
+            ("gzip", True),
+            ("deflate, gzip;q=0.5", True),
+            ("gzip;q=0", False),
+            ("gzip; q=0.0, deflate", False),
+            ("*", True),
+            ("*;q=0", False),
+            ("gzip;q=0, *", False),
+            ("identity", False),
+        ):
+            request = RequestFactory().get(self.url, HTTP_ACCEPT_ENCODING=accept_encoding)
+            assert accepts_gzip(request) is expected, accept_encoding
+
+    def test_generate_unchanged(self):
+        feed = MitreCVEFeed.generate(datetime(2018, 6, 2, tzinfo=utc))
+        assert MitreCVEFeed.generate(datetime(2018, 6, 3, tzinfo=utc)).pk == feed.pk
+        MitreCVE.objects.filter(order=1).delete()
+        new_feed = MitreCVEFeed.generate(datetime(2018, 6, 3, tzinfo=utc))
+        assert new_feed.etag != feed.etag
+        assert list(MitreCVEFeed.objects.all()) == [new_feed]
+
+    def test_since(self):
+        MitreCVEFeed.generate(datetime(2018, 6, 2, tzinfo=utc))
+        resp = self.client.get(self.url, {"since": "2018-03-01"})
+        assert self.get_ids(resp) == ["CVE-2018-2"]
+        resp = self.client.get(self.url, {"since": "2017-12-31T23:00:00+00:00"})
+        assert self.get_ids(resp) == ["CVE-2018-2", "CVE-2018-1"]
+        resp = self.client.get(self.url, {"since": "2018-06-01T00:00:00"})
+        assert self.get_ids(resp) == []
+        resp = self.client.get(self.url, {"since": "last week"})
+        assert resp.status_code == 400
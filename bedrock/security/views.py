@@ -2,27 +2,121 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.
 import re
+from datetime import datetime, time
 
 from django.db.models import Q
+from django.http import HttpResponse, HttpResponseBadRequest, JsonResponse
 from django.urls import NoReverseMatch
+from django.utils.dateparse import parse_date, parse_datetime
 from django.utils.decorators import method_decorator
-from django.views.decorators.http import require_safe
+from django.utils.timezone import is_naive, make_aware, utc
+from django.views.decorators.http import condition, require_safe
+from django.views.decorators.vary import vary_on_headers
 from django.views.generic import DetailView, ListView, RedirectView
 
-from jsonview.decorators import json_view
 from product_details import product_details
-from product_details.version_compare import Version
+from product_details.version_compare import Version, version_int
 
 from bedrock.base.urlresolvers import reverse
 from bedrock.mozorg.decorators import cache_control_expires
-from bedrock.security.models import HallOfFamer, MitreCVE, Product, SecurityAdvisory
+from bedrock.security.models import (
+    HallOfFamer,
+    MitreCVE,
+    MitreCVEFeed,
+    Product,
+    SecurityAdvisory,
+)
 from lib.l10n_utils import LangFilesMixin, RequireSafeMixin
 
 
-@json_view
+def parse_since(value):
+    """Return an aware datetime for a `since` date or datetime query parameter, or None if it's invalid."""
+    try:
+        since = parse_datetime(value)
+        if since is None:
+            since_date = parse_date(value)
+            if since_date is None:
+                return None
+            since = datetime.combine(since_date, time())
+    except ValueError:
+        return None
+
+    return make_aware(since, utc) if is_naive(since) else since
+
+
+def get_cve_feed(request):
+    """Return the saved feed for the request, with the data loaded only when it's accessed."""
+    if not hasattr(request, "cve_feed"):
+        request.cve_feed = MitreCVEFeed.objects.defer("data").first()
+
+    return request.cve_feed
+
+
+def accepts_gzip(request):
+    """Return whether the Accept-Encoding header of the request allows a gzip response."""
+    qvalues = {}
+    for coding in request.headers.get("Accept-Encoding", "").split(","):
+        name, *params = (part.strip() for part in coding.split(";"))
+        qvalue = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    qvalue = float(value)
+                except ValueError:
+                    qvalue = 0.0
+        qvalues[name.lower()] = qvalue
+
+    if "gzip" in qvalues:
+        return qvalues["gzip"] > 0
+    return qvalues.get("*", 0) > 0
+
+
+def cve_feed_etag(request):
+    feed = None if "since" in request.GET else get_cve_feed(request)
+    if not feed:
+        return None
+
+    # each encoding of the feed is a different representation, so it needs its own ETag
+    return f"{feed.etag}-gzip" if accepts_gzip(request) else feed.etag
+
+
+def cve_feed_last_modified(request):
+    feed = None if "since" in request.GET else get_cve_feed(request)
+    return feed.last_modified if feed else None
+
+
 @require_safe
+@vary_on_headers("Accept-Encoding")
+@condition(etag_func=cve_feed_etag, last_modified_func=cve_feed_last_modified)
 def mitre_cve_feed(request):
-    return [cve.feed_entry() for cve in MitreCVE.objects.all()]
+    """
+    Return the MITRE format feed of the CVEs.
+
+    The feed saved by `update_security_advisories` is served as is, compressed if
+    the client accepts it. `?since=<ISO date or datetime>` returns only the CVEs
+    that changed after then.
+    """
+    if "since" in request.GET:
+        since = parse_since(request.GET["since"])
+        if since is None:
+            return HttpResponseBadRequest("Invalid since parameter")
+
+        cves = MitreCVE.objects.filter(last_modified__gt=since)
+        return JsonResponse([cve.feed_entry() for cve in cves], safe=False)
+
+    feed = get_cve_feed(request)
+    if feed is None:
+        # the advisories haven't been updated since the feed was added
+        return JsonResponse([cve.feed_entry() for cve in MitreCVE.objects.all()], safe=False)
+
+    if accepts_gzip(request):
+        response = HttpResponse(bytes(feed.data), content_type="application/json")
+        response["Content-Encoding"] = "gzip"
+    else:
+        response = HttpResponse(feed.json, content_type="application/json")
+
+    return response
 
 
 def product_is_obsolete(prod_name, version):
@@ -104,8 +198,8 @@ class ProductView(LangFilesMixin, RequireSafeMixin, ListView):
         versions = Product.objects.filter(product_slug=product_slug)
         min_version = self.minimum_versions.get(product_slug)
         if min_version:
-            versions = [vers for vers in versions if vers.version >= min_version]
-        return sorted(versions, reverse=True)
+            versions = versions.filter(version_key__gte=version_int(min_version))
+        return versions.order_by("-version_key")
 
     def get_context_data(self, **kwargs):
         cxt = super().get_context_data(**kwargs)
@@ -128,8 +222,7 @@ class ProductVersionView(LangFilesMixin, RequireSafeMixin, ListView):
                 # stip trailing .0 as products are stored without them
                 slug = slug[:-2]
             qfilter |= Q(slug__exact=slug)
-        versions = Product.objects.filter(qfilter)
-        return sorted(versions, reverse=True)
+        return Product.objects.filter(qfilter).order_by("-version_key")
 
     def get_context_data(self, **kwargs):
         cxt = super().get_context_data(**kwargs)
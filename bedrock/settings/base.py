@@ -123,11 +123,16 @@ LANGUAGE_CODE = "en-US"
 # Languages using BiDi (right-to-left) layout. Overrides/extends Django default.
 LANGUAGES_BIDI = ["ar", "ar-dz", "fa", "he", "skr", "ur"]
 
+# number of Accept-Language header values per process for which the negotiated locale is cached
+LOCALE_NEGOTIATION_CACHE_SIZE = config("LOCALE_NEGOTIATION_CACHE_SIZE", default="5000", parser=int)
+
 # Tells the product_details module where to find our local JSON files.
 # This ultimately controls how LANGUAGES are constructed.
 PROD_DETAILS_CACHE_NAME = "product-details"
 PROD_DETAILS_CACHE_TIMEOUT = 60 * 15  # 15 min
-PROD_DETAILS_STORAGE = config("PROD_DETAILS_STORAGE", default="product_details.storage.PDDatabaseStorage")
+PROD_DETAILS_STORAGE = config("PROD_DETAILS_STORAGE", default="bedrock.mozorg.product_details_snapshot.PDSnapshotStorage")
+# how often each process checks for a new snapshot of the product-details data with PDSnapshotStorage
+PROD_DETAILS_SNAPSHOT_CHECK_INTERVAL = config("PROD_DETAILS_SNAPSHOT_CHECK_INTERVAL", default="30", parser=int)
 # path into which to clone the p-d json repo
 PROD_DETAILS_JSON_REPO_PATH = config("PROD_DETAILS_JSON_REPO_PATH", default=data_path("product_details_json"))
 PROD_DETAILS_JSON_REPO_URI = config("PROD_DETAILS_JSON_REPO_URI", default="https://github.com/mozilla-releng/product-details.git")
@@ -261,6 +266,11 @@ FLUENT_L10N_TEAM_REPO_BRANCH = config("FLUENT_L10N_TEAM_REPO_BRANCH", default="m
 FLUENT_L10N_TEAM_REPO_PATH = DATA_PATH / "l10n-team"
 # 10 seconds during dev and 10 min in prod
 FLUENT_CACHE_TIMEOUT = config("FLUENT_CACHE_TIMEOUT", default="10" if DEBUG else "600", parser=int)
+# written by `l10n_update` so that all processes drop their cached Fluent data after an update
+FLUENT_REVISION_FILE = DATA_PATH / "fluent-revision.txt"
+FLUENT_REVISION_CHECK_INTERVAL = config("FLUENT_REVISION_CHECK_INTERVAL", default="30", parser=int)
+# all of the parsed .ftl files from the Fluent repos, also written by `l10n_update`
+FLUENT_SNAPSHOT_FILE = DATA_PATH / "fluent-snapshot.pickle"
 # Order matters. first string found wins.
 FLUENT_PATHS = [
     # local FTL files
@@ -541,12 +551,19 @@ HOSTNAME = platform.node()
 # Prefer APP_NAME from env, but fall back to hostname parsing. TODO: remove get_app_name() usage once fully redundant
 APP_NAME = config("APP_NAME", default=get_app_name(HOSTNAME))
 CLUSTER_NAME = config("CLUSTER_NAME", default="")
+# the commit of the deployed code, also used to render Contentful pages again after a deploy
+GIT_SHA = config("GIT_SHA", default="")
 ENABLE_HOSTNAME_MIDDLEWARE = config("ENABLE_HOSTNAME_MIDDLEWARE", default=str(bool(APP_NAME)), parser=bool)
 ENABLE_VARY_NOCACHE_MIDDLEWARE = config("ENABLE_VARY_NOCACHE_MIDDLEWARE", default="false", parser=bool)
 # set this to enable basic auth for the entire site
 # e.g. BASIC_AUTH_CREDS="thedude:thewalrus"
 BASIC_AUTH_CREDS = config("BASIC_AUTH_CREDS", default="")
 
+# number of paths per process for which RedirectsMiddleware remembers the URL resolution
+REDIRECTS_CACHE_SIZE = config("REDIRECTS_CACHE_SIZE", default="10000", parser=int)
+# log the hits, misses and evictions of that cache every so many lookups, to help tune its size. 0 to disable.
+REDIRECTS_CACHE_STATS_INTERVAL = config("REDIRECTS_CACHE_STATS_INTERVAL", default="100000", parser=int)
+
 MIDDLEWARE = [
     "allow_cidr.middleware.AllowCIDRMiddleware",
     "django.middleware.security.SecurityMiddleware",
@@ -1006,6 +1023,13 @@ CONTENTFUL_SPACE_KEY = config("CONTENTFUL_SPACE_KEY", raise_error=False)
 CONTENTFUL_ENVIRONMENT = config("CONTENTFUL_ENVIRONMENT", default="master")
 CONTENTFUL_SPACE_API = ("preview" if DEV else "cdn") + ".contentful.com"
 CONTENTFUL_API_TIMEOUT = config("CONTENTFUL_API_TIMEOUT", default="5", parser=int)
+# how many times to wait and retry a request to Contentful when its rate limit is hit
+CONTENTFUL_API_MAX_RATE_LIMIT_RETRIES = config("CONTENTFUL_API_MAX_RATE_LIMIT_RETRIES", default="5", parser=int)
+# how many pages to fetch from Contentful at the same time in update_contentful
+CONTENTFUL_SYNC_WORKERS = config("CONTENTFUL_SYNC_WORKERS", default="8", parser=int)
+# whether update_contentful only syncs the pages changed since its last run, according to the Sync API.
+# The Preview API used in DEV only supports initial syncs.
+CONTENTFUL_SYNC_API_DELTAS = config("CONTENTFUL_SYNC_API_DELTAS", default=str(not DEV), parser=bool)
 CONTENTFUL_CONTENT_TYPES_TO_SYNC = config(
     "CONTENTFUL_CONTENT_TYPES_TO_SYNC",
     default=CONTENTFUL_DEFAULT_CONTENT_TYPES,
@@ -1151,7 +1175,7 @@ def before_send(event, hint):
 if SENTRY_DSN:
     sentry_sdk.init(
         dsn=SENTRY_DSN,
-        release=config("GIT_SHA", default=""),
+        release=GIT_SHA,
         server_name=".".join(x for x in [APP_NAME, CLUSTER_NAME] if x),
         integrations=[DjangoIntegration()],
         before_send=before_send,
@@ -34,7 +34,12 @@ python manage.py update_security_advisories --quiet || failure_detected=true
 python manage.py update_wordpress --quiet || failure_detected=true
 python manage.py update_release_notes --quiet || failure_detected=true
 python manage.py update_content_cards --quiet || failure_detected=true
-python manage.py update_contentful --quiet || failure_detected=true
+if [[ "$ALL" == true ]]; then
+    # regularly re-sync all of the pages, not only the ones made from changed entries
+    python manage.py update_contentful --quiet --full-sync || failure_detected=true
+else
+    python manage.py update_contentful --quiet || failure_detected=true
+fi
 python manage.py update_externalfiles --quiet || failure_detected=true
 python manage.py update_newsletter_data --quiet || failure_detected=true
 python manage.py update_www_config --quiet || failure_detected=true
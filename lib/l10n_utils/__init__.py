@@ -13,7 +13,12 @@ from django.views.generic import TemplateView
 
 from product_details import product_details
 
-from bedrock.base.urlresolvers import _get_language_map, split_path
+from bedrock.base.urlresolvers import (
+    NOT_CACHED,
+    _get_language_map,
+    negotiation_cache,
+    split_path,
+)
 
 from .fluent import fluent_l10n, get_active_locales as ftl_active_locales
 
@@ -55,7 +60,7 @@ def redirect_to_best_locale(request, translations):
     # Strict only for the root URL.
     strict = request.path_info == "/" and request.headers.get("Accept-Language") is None
     # Note that translations is list of locale strings (eg ["en-GB", "ru", "fr"])
-    locale = get_best_translation(translations, get_accept_languages(request), strict)
+    locale = get_best_translation_for_header(translations, request.headers.get("Accept-Language", ""), strict)
     if locale:
         return redirect_to_locale(request, locale)
     return locale_selection(request, translations)
@@ -149,7 +154,8 @@ def render(request, template, context=None, ftl_files=None, activation_files=Non
                 translations.update(ftl_active_locales(af))
             translations = sorted(translations)  # `sorted` returns a list.
         elif l10n:
-            translations = l10n.active_locales
+            # copy the cached list since it may be extended below
+            translations = list(l10n.active_locales)
 
         # if `add_active_locales` is given then add it to the translations for the template
         if "add_active_locales" in context:
@@ -201,6 +207,22 @@ def get_accept_languages(request):
     return [lang for lang, rank in ranked]
 
 
+def get_best_translation_for_header(translations, accept_lang, strict=False):
+    """
+    Return `get_best_translation()` for the raw value of an Accept-Language header.
+
+    The result is cached per process for each header value and set of translations.
+    """
+    key = (accept_lang, tuple(translations), strict)
+    locale = negotiation_cache.get(key, NOT_CACHED)
+    if locale is NOT_CACHED:
+        accept_languages = [lang for lang, rank in parse_accept_lang_header(accept_lang)]
+        locale = get_best_translation(translations, accept_languages, strict)
+        negotiation_cache.set(key, locale)
+
+    return locale
+
+
 def get_best_translation(translations, accept_languages, strict=False):
     """
     Return the best translation available comparing the accept languages against available translations.
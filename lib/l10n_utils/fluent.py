@@ -3,12 +3,18 @@
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
 import json
+import os
+import pickle
 import re
+from copy import deepcopy
 from functools import wraps
 from hashlib import md5
+from threading import Lock
 
 from django.conf import settings
 from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.dispatch import receiver
 from django.utils.encoding import force_bytes
 from django.utils.functional import cached_property, lazy
 
@@ -21,6 +27,7 @@ __all__ = [
     "fluent_l10n",
     "ftl",
     "ftl_file_is_active",
+    "ftl_find_messages",
     "ftl_has_messages",
     "ftl_lazy",
     "get_metadata_file_path",
@@ -30,6 +37,7 @@ __all__ = [
 cache = caches["fluent"]
 REQUIRED_RE = re.compile(r"^required\b", re.MULTILINE | re.IGNORECASE)
 TERM_RE = re.compile(r"\{\s*-[a-z-]+\s*\}")
+REVISION_CACHE_KEY = "fluent:revision"
 
 
 class FluentL10n(FluentLocalization):
@@ -44,7 +52,7 @@ class FluentL10n(FluentLocalization):
         for bundle in self._bundles():
             messages.update(bundle._messages.keys())
 
-        return list(messages)
+        return frozenset(messages)
 
     @cached_property
     def _localized_message_ids(self):
@@ -52,7 +60,7 @@ class FluentL10n(FluentLocalization):
         for bundle in self._localized_bundles():
             messages.update(bundle._messages.keys())
 
-        return list(messages)
+        return frozenset(messages)
 
     @cached_property
     def required_message_ids(self):
@@ -98,6 +106,15 @@ class FluentL10n(FluentLocalization):
 
         return message_id in self._localized_message_ids
 
+    def find_messages(self, message_ids):
+        """Return the set of the given message IDs that are translated in the current locale."""
+        message_ids = frozenset(message_ids)
+        # assume English locales have the messages
+        if self.locales[0].startswith("en-"):
+            return message_ids
+
+        return message_ids & self._localized_message_ids
+
 
 class FluentResourceLoader:
     """A resource loader that will add english brand terms to every bundle"""
@@ -115,12 +132,159 @@ def _cache_key(*args, **kwargs):
     return md5(force_bytes(key)).hexdigest()
 
 
+def get_fluent_revision():
+    """Return the revision of the Fluent files written by `l10n_update`, or an empty string.
+
+    The revision file is read at most once every `settings.FLUENT_REVISION_CHECK_INTERVAL`
+    seconds so that every process notices an update soon after it happens.
+    """
+    revision = cache.get(REVISION_CACHE_KEY)
+    if revision is None:
+        try:
+            revision = settings.FLUENT_REVISION_FILE.read_text().strip()
+        except OSError:
+            revision = ""
+
+        cache.set(REVISION_CACHE_KEY, revision, settings.FLUENT_REVISION_CHECK_INTERVAL)
+
+    return revision
+
+
+def write_fluent_revision(revision):
+    """Record a new revision of the Fluent files and invalidate this process's cache."""
+    settings.FLUENT_REVISION_FILE.parent.mkdir(parents=True, exist_ok=True)
+    settings.FLUENT_REVISION_FILE.write_text(revision)
+    cache.clear()
+
+
+class FluentSnapshot:
+    """The parsed resources from the Fluent repos, as written by `write_fluent_snapshot`.
+
+    The snapshot file is only read again when the Fluent revision changes, and the
+    resources for a locale are unpickled the first time they're used.
+    """
+
+    def __init__(self):
+        self.lock = Lock()
+        self.reset()
+
+    def reset(self):
+        self.revision = None
+        self.roots = {}
+        self.locales = {}
+
+    def load(self, revision):
+        self.reset()
+        try:
+            with settings.FLUENT_SNAPSHOT_FILE.open("rb") as snapshot_file:
+                data = pickle.load(snapshot_file)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            data = {}
+
+        if data.get("revision") == revision:
+            self.roots = data["roots"]
+
+        self.revision = revision
+
+    def resources(self, root, locale):
+        """Return a dict of resource ID to parsed resource for a locale in a Fluent path.
+
+        Returns `None` if the snapshot doesn't include the Fluent path, in which case
+        the files must be loaded from disk.
+        """
+        revision = get_fluent_revision()
+        root = str(root)
+        with self.lock:
+            if revision != self.revision:
+                self.load(revision)
+
+            if root not in self.roots:
+                return None
+
+            key = (root, locale)
+            if key not in self.locales:
+                pickled = self.roots[root].get(locale)
+                self.locales[key] = {} if pickled is None else pickle.loads(pickled)
+
+            return self.locales[key]
+
+
+snapshot = FluentSnapshot()
+
+
+def load_fluent_snapshot():
+    """Load the snapshot for the current Fluent revision, e.g. when a web worker starts."""
+    with snapshot.lock:
+        snapshot.load(get_fluent_revision())
+
+
+def write_fluent_snapshot(revision):
+    """Parse every .ftl file in the Fluent repos and write them to `settings.FLUENT_SNAPSHOT_FILE`.
+
+    The files in `settings.FLUENT_LOCAL_PATH` are part of bedrock rather than a Fluent repo,
+    so they're not versioned by the revision and are always loaded from disk.
+    """
+    roots = {}
+    for root in settings.FLUENT_PATHS:
+        if root == settings.FLUENT_LOCAL_PATH or not root.is_dir():
+            continue
+
+        locales = {}
+        for locale_path in sorted(root.iterdir()):
+            if not locale_path.is_dir() or locale_path.name in settings.IGNORE_LANG_DIRS:
+                continue
+
+            resources = {}
+            for path in sorted(locale_path.rglob("*.ftl")):
+                with path.open(encoding="utf-8") as ftl_file:
+                    resources[path.relative_to(locale_path).as_posix()] = FluentResource(ftl_file.read())
+
+            locales[locale_path.name] = pickle.dumps(resources, pickle.HIGHEST_PROTOCOL)
+
+        roots[str(root)] = locales
+
+    snapshot_file = settings.FLUENT_SNAPSHOT_FILE
+    snapshot_file.parent.mkdir(parents=True, exist_ok=True)
+    temp_file = snapshot_file.with_name(f"{snapshot_file.name}.tmp")
+    with temp_file.open("wb") as f:
+        pickle.dump({"revision": revision, "roots": roots}, f, pickle.HIGHEST_PROTOCOL)
+
+    # replace the old snapshot in one step so that no process can read a partial file
+    os.replace(temp_file, snapshot_file)
+    with snapshot.lock:
+        snapshot.reset()
+
+    return sum(len(locales) for locales in roots.values())
+
+
+def fluent_snapshot_is_current(revision):
+    try:
+        with settings.FLUENT_SNAPSHOT_FILE.open("rb") as snapshot_file:
+            return pickle.load(snapshot_file).get("revision") == revision
+    except (OSError, EOFError, pickle.UnpicklingError):
+        return False
+
+
+@receiver(setting_changed)
+def clear_fluent_cache(setting, **kwargs):
+    if setting.startswith("FLUENT_") or setting in ("DEV", "IS_POCKET_MODE"):
+        cache.clear()
+        with snapshot.lock:
+            snapshot.reset()
+        with metadata_index.lock:
+            metadata_index.reset()
+
+
 def memoize(f):
-    """Decorator to cache the results of expensive functions"""
+    """Decorator to cache the results of expensive functions
+
+    The current Fluent revision is part of the key so that a new revision
+    of the Fluent files doesn't use stale results.
+    """
 
     @wraps(f)
     def inner(*args, **kwargs):
-        key = _cache_key(f.__name__, *args, **kwargs)
+        key = _cache_key(f.__name__, get_fluent_revision(), *args, **kwargs)
         value = cache.get(key)
         if value is None:
             value = f(*args, **kwargs)
@@ -157,7 +321,13 @@ def l10nize(f):
 @memoize
 def load_fluent_resources(root, locale, resource_ids):
     resources = []
+    snapshot_resources = snapshot.resources(root, locale)
     for resource_id in resource_ids:
+        if snapshot_resources is not None:
+            if resource_id in snapshot_resources:
+                resources.append(snapshot_resources[resource_id])
+            continue
+
         path = root.joinpath(locale, resource_id)
         if not path.is_file():
             continue
@@ -180,8 +350,7 @@ def get_metadata_file_path(ftl_file):
     return settings.FLUENT_REPO_PATH.joinpath("metadata", ftl_file).with_suffix(".json")
 
 
-def get_metadata(ftl_file):
-    path = get_metadata_file_path(ftl_file)
+def read_metadata_file(path):
     try:
         with path.open() as mdf:
             return json.load(mdf)
@@ -189,6 +358,46 @@ def get_metadata(ftl_file):
         return {}
 
 
+class MetadataIndex:
+    """The metadata of every file in the Fluent repo, by metadata file path.
+
+    This is held in the process rather than in the Fluent cache, which expires, so
+    the metadata files are only read again when the Fluent revision changes.
+    """
+
+    def __init__(self):
+        self.lock = Lock()
+        self.reset()
+
+    def reset(self):
+        self.revision = None
+        self.index = None
+
+    def get(self):
+        revision = get_fluent_revision()
+        with self.lock:
+            if self.index is None or revision != self.revision:
+                metadata_path = settings.FLUENT_REPO_PATH.joinpath("metadata")
+                self.index = {str(path): read_metadata_file(path) for path in metadata_path.rglob("*.json")}
+                self.revision = revision
+
+            return self.index
+
+
+metadata_index = MetadataIndex()
+
+
+def get_metadata_index():
+    """Return a dict of metadata file path to metadata for every file in the Fluent repo."""
+    return metadata_index.get()
+
+
+def get_metadata(ftl_file):
+    metadata = get_metadata_index().get(str(get_metadata_file_path(ftl_file)), {})
+    # callers are free to modify the returned dict
+    return deepcopy(metadata)
+
+
 def write_metadata(ftl_file, data):
     metadata_path = get_metadata_file_path(ftl_file)
     if not metadata_path.exists():
@@ -197,6 +406,8 @@ def write_metadata(ftl_file, data):
     with metadata_path.open("w") as mdf:
         json.dump(data, mdf, indent=2, sort_keys=True)
 
+    get_metadata_index()[str(metadata_path)] = deepcopy(data)
+
 
 @memoize
 def get_active_locales(ftl_files, force=False):
@@ -244,12 +455,31 @@ def fluent_l10n(locales, files):
 
     # file IDs may not have file extension
     files = [f"{f}.ftl" if not f.endswith(".ftl") else f for f in files]
-    return FluentL10n(locales, files, FluentResourceLoader)
+    return get_fluent_l10n(tuple(locales), tuple(files))
+
+
+@memoize
+def get_fluent_l10n(locales, files):
+    """Return a `FluentL10n` object that can be shared between requests and threads.
+
+    The bundles are loaded up front because `FluentLocalization` loads them from
+    a generator that can't be used by more than one thread at a time.
+    """
+    l10n = FluentL10n(list(locales), list(files), FluentResourceLoader)
+    list(l10n._bundles())
+    return l10n
 
 
 def ftl_has_messages(l10n, *message_ids, require_all=True):
-    test = all if require_all else any
-    return test([l10n.has_message(mid) for mid in message_ids])
+    found = l10n.find_messages(message_ids)
+    if require_all:
+        return len(found) == len(frozenset(message_ids))
+
+    return bool(found)
+
+
+def ftl_find_messages(l10n, *message_ids):
+    return l10n.find_messages(message_ids)
 
 
 def translate(l10n, message_id, fallback=None, **kwargs):
@@ -7,6 +7,12 @@ from django.conf import settings
 from django.core.management.base import BaseCommand
 
 from bedrock.utils.git import GitRepo
+from lib.l10n_utils.fluent import (
+    fluent_snapshot_is_current,
+    get_fluent_revision,
+    write_fluent_revision,
+    write_fluent_snapshot,
+)
 
 # This config is used to ensure that l10n_update.py can pull from both, separate,
 # L10N repos for Mozorg and for Pocket and update the appropriate dirs
@@ -40,6 +46,7 @@ class Command(BaseCommand):
         self.update_fluent_files(options["clean"])
 
     def update_fluent_files(self, clean=False):
+        hashes = []
         for site, params in FLUENT_L10N_UPDATE_PARAMS.items():
             repo = GitRepo(**params)
             if clean:
@@ -48,4 +55,15 @@ class Command(BaseCommand):
                 repo.update()
 
             repo.update()
+            hashes.append(repo.current_hash)
             self.stdout.write(f"Updated .ftl files for {site}")
+
+        revision = ":".join(hashes)
+        # write the snapshot first so that it's ready when processes see the new revision
+        if not fluent_snapshot_is_current(revision):
+            locale_count = write_fluent_snapshot(revision)
+            self.stdout.write(f"Wrote the Fluent snapshot for {locale_count} locale directories")
+
+        if revision != get_fluent_revision():
+            write_fluent_revision(revision)
+            self.stdout.write(f"Fluent files are now at revision {revision}")
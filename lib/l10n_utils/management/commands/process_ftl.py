@@ -3,6 +3,9 @@
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
 import shutil
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from hashlib import md5
 from subprocess import CalledProcessError
 
 from django.conf import settings
@@ -10,7 +13,13 @@ from django.core.management.base import CommandError
 
 from fluent.syntax.parser import FluentParser, ParseError
 
-from lib.l10n_utils.fluent import fluent_l10n, get_metadata, write_metadata
+from lib.l10n_utils.fluent import (
+    fluent_l10n,
+    get_fluent_revision,
+    get_metadata,
+    write_fluent_snapshot,
+    write_metadata,
+)
 
 from ._ftl_repo_base import FTLRepoCommand
 
@@ -32,20 +41,74 @@ class NoisyFluentParser(FluentParser):
         return entry
 
 
+def file_hash(filepath):
+    return md5(filepath.read_bytes()).hexdigest()
+
+
+def ftl_file_parses(filepath):
+    """Return True if the .ftl file has no syntax errors."""
+    with filepath.open() as ftl:
+        try:
+            NoisyFluentParser().parse(ftl.read())
+        except ParseError:
+            return False
+
+        return True
+
+
+def calculate_activation(ftl_file, locales=None):
+    """Activate the locales that have translated enough of an .ftl file.
+
+    Only the given locales are checked, or all of the translations of the file if
+    `locales` is `None`. Returns the list of newly activated locales.
+    """
+    metadata = get_metadata(ftl_file)
+    active_locales = metadata.get("active_locales", [])
+    inactive_locales = metadata.get("inactive_locales", [])
+    percent_required = metadata.get("percent_required", settings.FLUENT_DEFAULT_PERCENT_REQUIRED)
+    if locales is None:
+        translations = settings.FLUENT_REPO_PATH.glob(f"*/{ftl_file}")
+        locales = {str(x.relative_to(settings.FLUENT_REPO_PATH)).split("/", 1)[0] for x in translations}
+
+    locales_to_check = set(locales).difference(["en"], active_locales, inactive_locales)
+    new_activations = []
+    for locale in sorted(locales_to_check):
+        l10n = fluent_l10n([locale, "en"], [ftl_file])
+        if not l10n.has_required_messages:
+            continue
+
+        percent_trans = l10n.percent_translated
+        if percent_trans < percent_required:
+            continue
+
+        new_activations.append(locale)
+
+    if new_activations:
+        active_locales.extend(new_activations)
+        metadata["active_locales"] = sorted(active_locales)
+        write_metadata(ftl_file, metadata)
+
+    return new_activations
+
+
 class Command(FTLRepoCommand):
     help = "Processes .ftl files from l10n team for use in bedrock"
-    parser = None
+    workers = 1
 
     def add_arguments(self, parser):
         super().add_arguments(parser)
         parser.add_argument("--push", action="store_true", dest="push", default=False, help="Push the changes to the MEAO Fluent files repo.")
+        parser.add_argument(
+            "-w", "--workers", type=int, dest="workers", default=1, help="Number of processes to use for linting files and calculating activation."
+        )
 
     def handle(self, *args, **options):
         super().handle(*args, **options)
-        self.parser = NoisyFluentParser()
+        self.workers = options["workers"]
         self.update_fluent_files()
         self.update_l10n_team_files()
         no_errors = self.copy_ftl_files()
+        self.update_snapshot()
         self.set_activation()
         self.copy_configs()
         if options["push"]:
@@ -105,18 +168,33 @@ class Command(FTLRepoCommand):
 
         self.stdout.write(f"\nCopied {count} .toml files")
 
+    def map(self, func, *iterables):
+        """Call `func` for each item, in a pool of processes if more than one worker was requested."""
+        if self.workers > 1:
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                return list(executor.map(func, *iterables, chunksize=16))
+
+        return list(map(func, *iterables))
+
+    def ftl_file_changed(self, filepath):
+        """Return True if the file differs from the copy in the MEAO Fluent files repo."""
+        to_filepath = self.meao_repo.path.joinpath(filepath.relative_to(self.l10n_repo.path))
+        return not to_filepath.is_file() or file_hash(filepath) != file_hash(to_filepath)
+
     def copy_ftl_files(self):
         count = 0
         errors = []
-        for filepath in self.l10n_repo.path.rglob("*.ftl"):
-            if not self.lint_ftl_file(filepath):
+        # files that are the same as the copies have already been checked
+        filepaths = [filepath for filepath in self.l10n_repo.path.rglob("*.ftl") if self.ftl_file_changed(filepath)]
+        for filepath, parses in zip(filepaths, self.map(ftl_file_parses, filepaths)):
+            if not parses:
                 errors.append(filepath.relative_to(self.l10n_repo.path))
                 continue
 
             self._copy_file(filepath)
             count += 1
 
-        self.stdout.write(f"\nCopied {count} .ftl files")
+        self.stdout.write(f"\nCopied {count} changed .ftl files")
         if errors:
             self.stdout.write("The following files had parse errors and were not copied:")
             for fpath in errors:
@@ -125,50 +203,28 @@ class Command(FTLRepoCommand):
 
         return True
 
-    def lint_ftl_file(self, filepath):
-        with filepath.open() as ftl:
-            try:
-                self.parser.parse(ftl.read())
-            except ParseError:
-                return False
+    def update_snapshot(self):
+        """Rewrite the Fluent snapshot, if there is one, so that it includes the copied files."""
+        if not settings.FLUENT_SNAPSHOT_FILE.exists():
+            return
 
-            return True
+        locale_count = write_fluent_snapshot(get_fluent_revision())
+        self.stdout.write(f"Wrote the Fluent snapshot for {locale_count} locale directories")
 
     def set_activation(self):
-        updated_ftl = set()
+        updated_ftl = defaultdict(set)
         modified, _ = self.meao_repo.modified_files()
         for fname in modified:
             if not fname.endswith(".ftl"):
                 continue
 
             locale, ftl_name = fname.split("/", 1)
-            updated_ftl.add(ftl_name)
-
-        for ftl_name in updated_ftl:
-            self.calculate_activation(ftl_name)
-
-    def calculate_activation(self, ftl_file):
-        translations = self.meao_repo.path.glob(f"*/{ftl_file}")
-        metadata = get_metadata(ftl_file)
-        active_locales = metadata.get("active_locales", [])
-        inactive_locales = metadata.get("inactive_locales", [])
-        percent_required = metadata.get("percent_required", settings.FLUENT_DEFAULT_PERCENT_REQUIRED)
-        all_locales = {str(x.relative_to(self.meao_repo.path)).split("/", 1)[0] for x in translations}
-        locales_to_check = all_locales.difference(["en"], active_locales, inactive_locales)
-        new_activations = []
-        for locale in locales_to_check:
-            l10n = fluent_l10n([locale, "en"], [ftl_file])
-            if not l10n.has_required_messages:
-                continue
-
-            percent_trans = l10n.percent_translated
-            if percent_trans < percent_required:
-                continue
-
-            new_activations.append(locale)
-
-        if new_activations:
-            active_locales.extend(new_activations)
-            metadata["active_locales"] = sorted(active_locales)
-            write_metadata(ftl_file, metadata)
-            self.stdout.write(f"Activated {len(new_activations)} new locales for {ftl_file}")
+            updated_ftl[ftl_name].add(locale)
+
+        # a change to the English file can affect every locale, otherwise
+        # only the locales with a changed file need to be checked again
+        ftl_names = sorted(updated_ftl)
+        locales = [None if "en" in updated_ftl[ftl_name] else updated_ftl[ftl_name] for ftl_name in ftl_names]
+        for ftl_name, new_activations in zip(ftl_names, self.map(calculate_activation, ftl_names, locales)):
+            if new_activations:
+                self.stdout.write(f"Activated {len(new_activations)} new locales for {ftl_name}")
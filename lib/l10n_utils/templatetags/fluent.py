@@ -67,6 +67,19 @@ def ftl_has_messages(ctx, *message_ids, require_all=True):
     return fluent.ftl_has_messages(ctx["fluent_l10n"], *message_ids, require_all=require_all)
 
 
+@library.global_function
+@jinja2.pass_context
+def ftl_find_messages(ctx, *message_ids):
+    """Return the set of message IDs that the current translation has.
+
+    Usage example::
+
+        {% set translated = ftl_find_messages('title-new', 'desc-new') %}
+        {% if 'title-new' in translated %}...{% endif %}
+    """
+    return fluent.ftl_find_messages(ctx["fluent_l10n"], *message_ids)
+
+
 @library.global_function
 def ftl_file_is_active(ftl_file):
     return fluent.ftl_file_is_active(ftl_file)
@@ -277,3 +277,18 @@ def test_get_best_translation(translations, accept_languages, expected):
 def test_get_best_translation__strict(translations, accept_languages, expected):
     # Strict is used for the root path, to return the list of localized home pages for bots.
     assert l10n_utils.get_best_translation(translations, accept_languages, strict=True) == expected
+
+
+@override_settings(LANGUAGE_URL_MAP={"de": "de", "en-us": "en-US", "fr": "fr"}, CANONICAL_LOCALES={"en": "en-US"})
+def test_get_best_translation_for_header():
+    with patch.object(l10n_utils, "get_best_translation", wraps=l10n_utils.get_best_translation) as gbt_mock:
+        assert l10n_utils.get_best_translation_for_header(["de", "en-US"], "es,de;q=0.7") == "de"
+        assert l10n_utils.get_best_translation_for_header(["de", "en-US"], "es,de;q=0.7") == "de"
+        assert l10n_utils.get_best_translation_for_header(["fr", "en-US"], "es,de;q=0.7") == "en-US"
+        assert l10n_utils.get_best_translation_for_header(["fr", "en-US"], "es,de;q=0.7", strict=True) is None
+
+    assert gbt_mock.call_args_list == [
+        call(["de", "en-US"], ["es", "de"], False),
+        call(["fr", "en-US"], ["es", "de"], False),
+        call(["fr", "en-US"], ["es", "de"], True),
+    ]
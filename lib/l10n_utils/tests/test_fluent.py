@@ -3,6 +3,7 @@
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
 from pathlib import Path
+from tempfile import TemporaryDirectory
 from unittest.mock import patch
 
 from django.conf import settings
@@ -95,6 +96,13 @@ class TestFluentTranslationUtils(TestCase):
         assert fluent.ftl_has_messages(l10n, "fluent-title", "brand-new-string", require_all=False)
         assert not fluent.ftl_has_messages(l10n, "brand-new-string", require_all=False)
 
+    def test_find_messages(self):
+        l10n = get_l10n()
+        assert fluent.ftl_find_messages(l10n, "fluent-title", "fluent-page-desc", "brand-new-string") == {"fluent-title", "fluent-page-desc"}
+        assert fluent.ftl_find_messages(l10n, "brand-new-string") == set()
+        l10n = get_l10n(["en-US", "en"])
+        assert fluent.ftl_find_messages(l10n, "fluent-title", "brand-new-string") == {"fluent-title", "brand-new-string"}
+
     @override_settings(DEV=True)
     @patch.object(fluent, "get_metadata")
     def test_get_active_locales(self, meta_mock):
@@ -155,3 +163,130 @@ class TestFluentViewTranslationUtils(TestCase):
         """Should use activated locale if not provided"""
         translation.activate("fr")
         assert fluent.ftl("fluent-title") == "Title in French"
+
+
+@override_settings(FLUENT_PATHS=[L10N_PATH], FLUENT_LOCAL_PATH=L10N_PATH)
+class TestFluentL10nCache(TestCase):
+    def setUp(self):
+        fluent.cache.clear()
+
+    def test_same_object_returned(self):
+        l10n = get_l10n()
+        assert get_l10n() is l10n
+        assert fluent.fluent_l10n(["de", "en"], ["mozorg/fluent.ftl", "brands.ftl"]) is l10n
+        assert get_l10n(["fr", "en"]) is not l10n
+
+    def test_bundles_loaded(self):
+        l10n = get_l10n()
+        assert len(l10n._bundle_cache) == 2
+
+    def test_new_revision(self):
+        l10n = get_l10n()
+        assert l10n.percent_translated == 80.0
+        with patch.object(fluent, "get_fluent_revision", return_value="abc:def"):
+            new_l10n = get_l10n()
+            assert new_l10n is not l10n
+            assert get_l10n() is new_l10n
+
+    def test_write_revision(self):
+        with TemporaryDirectory() as tempdir:
+            revision_file = Path(tempdir, "fluent-revision.txt")
+            with override_settings(FLUENT_REVISION_FILE=revision_file):
+                assert fluent.get_fluent_revision() == ""
+                l10n = get_l10n()
+                fluent.write_fluent_revision("abc:def")
+                assert revision_file.read_text() == "abc:def"
+                assert fluent.get_fluent_revision() == "abc:def"
+                assert get_l10n() is not l10n
+
+
+@override_settings(FLUENT_PATHS=[L10N_PATH])
+class TestFluentSnapshot(TestCase):
+    def setUp(self):
+        tempdir = TemporaryDirectory()
+        self.addCleanup(tempdir.cleanup)
+        self.tempdir = Path(tempdir.name)
+        settings_override = override_settings(
+            FLUENT_REVISION_FILE=self.tempdir.joinpath("fluent-revision.txt"),
+            FLUENT_SNAPSHOT_FILE=self.tempdir.joinpath("fluent-snapshot.pickle"),
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def loaded_test_files(self, load_mock):
+        return [call for call in load_mock.call_args_list if L10N_PATH in call.args[0].parents]
+
+    def test_write_snapshot(self):
+        assert fluent.write_fluent_snapshot("abc") == 4
+        assert fluent.fluent_snapshot_is_current("abc")
+        assert not fluent.fluent_snapshot_is_current("def")
+        fluent.write_fluent_revision("abc")
+        resources = fluent.snapshot.resources(L10N_PATH, "de")
+        assert list(resources) == ["mozorg/fluent.ftl"]
+        assert fluent.snapshot.resources(L10N_PATH, "xx") == {}
+        assert fluent.snapshot.resources(settings.FLUENT_LOCAL_PATH, "de") is None
+
+    @patch.object(fluent, "load_fluent_file", wraps=fluent.load_fluent_file)
+    def test_resources_from_snapshot(self, load_mock):
+        fluent.write_fluent_snapshot("abc")
+        fluent.write_fluent_revision("abc")
+        l10n = get_l10n()
+        assert fluent.translate(l10n, "fluent-title") == "Title in German"
+        assert fluent.translate(l10n, "brand-new-string") == "New string not yet available in all languages"
+        assert not self.loaded_test_files(load_mock)
+
+    @patch.object(fluent, "load_fluent_file", wraps=fluent.load_fluent_file)
+    def test_old_snapshot_not_used(self, load_mock):
+        fluent.write_fluent_snapshot("abc")
+        fluent.write_fluent_revision("def")
+        l10n = get_l10n()
+        assert fluent.translate(l10n, "fluent-title") == "Title in German"
+        assert self.loaded_test_files(load_mock)
+
+
+class TestMetadataIndex(TestCase):
+    def setUp(self):
+        tempdir = TemporaryDirectory()
+        self.addCleanup(tempdir.cleanup)
+        settings_override = override_settings(FLUENT_REPO_PATH=Path(tempdir.name))
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def test_metadata_read_once(self):
+        fluent.write_metadata("the/dude.ftl", {"active_locales": ["de", "fr"]})
+        fluent.metadata_index.reset()
+        with patch.object(fluent, "read_metadata_file", wraps=fluent.read_metadata_file) as read_mock:
+            assert fluent.get_metadata("the/dude.ftl") == {"active_locales": ["de", "fr"]}
+            assert fluent.get_metadata("the/dude") == {"active_locales": ["de", "fr"]}
+            assert fluent.get_metadata("the/walter") == {}
+            assert read_mock.call_count == 1
+
+    def test_metadata_not_read_when_cache_expires(self):
+        fluent.write_metadata("the/dude.ftl", {"active_locales": ["de", "fr"]})
+        fluent.cache.clear()
+        with patch.object(fluent, "read_metadata_file", wraps=fluent.read_metadata_file) as read_mock:
+            assert fluent.get_metadata("the/dude.ftl") == {"active_locales": ["de", "fr"]}
+            read_mock.assert_not_called()
+
+    def test_metadata_read_again_for_new_revision(self):
+        fluent.write_metadata("the/dude.ftl", {"active_locales": ["de", "fr"]})
+        with TemporaryDirectory() as data_path, override_settings(FLUENT_REVISION_FILE=Path(data_path, "fluent-revision.txt")):
+            old_index = fluent.get_metadata_index()
+            fluent.write_fluent_revision("abc")
+            with patch.object(fluent, "read_metadata_file", wraps=fluent.read_metadata_file) as read_mock:
+                assert fluent.get_metadata("the/dude.ftl") == {"active_locales": ["de", "fr"]}
+                assert read_mock.call_count == 1
+            assert fluent.get_metadata_index() is not old_index
+
+    def test_write_metadata_updates_index(self):
+        assert fluent.get_metadata("the/dude") == {}
+        fluent.write_metadata("the/dude", {"active_locales": ["de"]})
+        metadata = fluent.get_metadata("the/dude")
+        assert metadata == {"active_locales": ["de"]}
+        metadata["active_locales"].append("fr")
+        assert fluent.get_metadata("the/dude") == {"active_locales": ["de"]}
+
+    @override_settings(DEV=False)
+    def test_active_locales(self):
+        fluent.write_metadata("the/dude", {"active_locales": ["de", "fr", "it"], "inactive_locales": ["it"]})
+        assert fluent.get_active_locales("the/dude") == ["de", "en-US", "fr"]
@@ -0,0 +1,66 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import shutil
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import Mock
+
+from django.test import TestCase, override_settings
+
+from lib.l10n_utils import fluent
+from lib.l10n_utils.management.commands import process_ftl
+
+L10N_PATH = Path(__file__).with_name("test_files").joinpath("l10n")
+
+
+class TestProcessFTL(TestCase):
+    def setUp(self):
+        tempdir = TemporaryDirectory()
+        self.addCleanup(tempdir.cleanup)
+        self.l10n_path = Path(tempdir.name, "l10n-team")
+        self.repo_path = Path(tempdir.name, "www-l10n")
+        shutil.copytree(L10N_PATH, self.l10n_path)
+        shutil.copytree(L10N_PATH, self.repo_path)
+        settings_override = override_settings(FLUENT_REPO_PATH=self.repo_path, FLUENT_PATHS=[self.repo_path], FLUENT_LOCAL_PATH=self.repo_path)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.command = process_ftl.Command()
+        self.command.l10n_repo = Mock(path=self.l10n_path)
+        self.command.meao_repo = Mock(path=self.repo_path)
+
+    def test_ftl_file_parses(self):
+        assert process_ftl.ftl_file_parses(self.l10n_path.joinpath("de", "mozorg", "fluent.ftl"))
+        bad_file = self.l10n_path.joinpath("de", "mozorg", "bad.ftl")
+        bad_file.write_text("bad-message = {")
+        assert not process_ftl.ftl_file_parses(bad_file)
+
+    def test_ftl_file_changed(self):
+        filepath = self.l10n_path.joinpath("de", "mozorg", "fluent.ftl")
+        assert not self.command.ftl_file_changed(filepath)
+        filepath.write_text("fluent-title = Neuer Titel\n")
+        assert self.command.ftl_file_changed(filepath)
+        self.repo_path.joinpath("de", "mozorg", "fluent.ftl").unlink()
+        assert self.command.ftl_file_changed(filepath)
+
+    def test_copy_only_changed_files(self):
+        self.command.stdout = Mock()
+        self.l10n_path.joinpath("fr", "mozorg", "fluent.ftl").write_text("fluent-title = Nouveau titre\n")
+        self.l10n_path.joinpath("de", "mozorg", "bad.ftl").write_text("bad-message = {")
+        assert not self.command.copy_ftl_files()
+        assert self.repo_path.joinpath("fr", "mozorg", "fluent.ftl").read_text() == "fluent-title = Nouveau titre\n"
+        assert not self.repo_path.joinpath("de", "mozorg", "bad.ftl").exists()
+        self.command.stdout.write.assert_any_call("\nCopied 1 changed .ftl files")
+
+    def test_calculate_activation(self):
+        assert process_ftl.calculate_activation("mozorg/fluent.ftl", ["fr"]) == []
+        assert process_ftl.calculate_activation("mozorg/fluent.ftl") == ["de"]
+        assert fluent.get_metadata("mozorg/fluent.ftl")["active_locales"] == ["de"]
+        # already active
+        assert process_ftl.calculate_activation("mozorg/fluent.ftl") == []
+
+    def test_map_with_workers(self):
+        filepaths = [self.l10n_path.joinpath("de", "mozorg", "fluent.ftl"), self.l10n_path.joinpath("fr", "mozorg", "fluent.ftl")]
+        self.command.workers = 2
+        assert self.command.map(process_ftl.ftl_file_parses, filepaths) == [True, True]
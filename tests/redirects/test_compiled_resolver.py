@@ -0,0 +1,46 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Test that the compiled redirect resolver matches exactly like the linear one."""
+from urllib.parse import unquote, urlparse
+
+from django.urls import Resolver404
+
+import pytest
+
+from bedrock.redirects.util import get_compiled_resolver, get_resolver
+
+from .map_301 import URLS as REDIRECT_URLS
+from .map_410 import URLS_410
+from .map_globalconf import URLS as GLOBAL_URLS
+from .map_htaccess import URLS as HTA_URLS
+from .map_locales import URLS as LOCALE_URLS
+
+
+def get_paths():
+    urls = [url["url"] for url in [*REDIRECT_URLS, *GLOBAL_URLS, *HTA_URLS, *LOCALE_URLS]]
+    urls.extend(URLS_410)
+    # the same URLs with an explicit or extra locale, plus some that should not redirect
+    urls.extend([f"/de{url}" for url in urls if url.startswith("/")])
+    urls.extend(["/", "/en-US/", "/en-US/firefox/new/", "/en-US/abck", "/firefox//all/", "/about/drivers\n"])
+    return sorted({unquote(urlparse(url).path) for url in urls})
+
+
+def resolve(resolver, path):
+    try:
+        match = resolver.resolve(path)
+    except Resolver404:
+        return None
+    return match.func, match.args, match.kwargs
+
+
+@pytest.fixture(scope="module")
+def resolvers():
+    return get_resolver(), get_compiled_resolver()
+
+
+@pytest.mark.parametrize("path", get_paths())
+def test_compiled_resolver_parity(path, resolvers):
+    linear, compiled = resolvers
+    assert resolve(compiled, path) == resolve(linear, path)
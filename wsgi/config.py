@@ -23,3 +23,15 @@ worker_tmp_dir = "/dev/shm"
 # Called just after a worker has been forked.
 def post_fork(server, worker):
     server.log.info("Worker spawned (pid: %s)", worker.pid)
+
+
+# Called just after a worker has initialized the application.
+def post_worker_init(worker):
+    from bedrock.base.staticfiles import get_static_files
+    from bedrock.mozorg.product_details_snapshot import load_product_details_snapshot
+    from lib.l10n_utils.fluent import get_metadata_index, load_fluent_snapshot
+
+    load_fluent_snapshot()
+    load_product_details_snapshot()
+    get_metadata_index()
+    get_static_files()